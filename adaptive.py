@@ -0,0 +1,125 @@
+import numpy as np
+
+from engine import ZODIAC, HOUSES, HOUR_LORDS
+from candidates import mask_bits
+
+# ---------------------------
+# Adaptive question ordering
+# ---------------------------
+# Candidates are the (slot, ASC) cells still possible. Every question marks
+# the cells it describes; a "No" removes them. The next question is the one
+# whose cell set best halves the remaining weight (max binary entropy), and
+# asking stops once all remaining cells sit in a single slot.
+#
+# Questions:  ("asc", asc)  ("hl_asc", hl, asc)  ("pair", sat, chi)
+#
+# Unlike the fixed flow, an hour-lord × ASC "No" removes that combination,
+# and a slot with no ASC left is no longer alive.
+
+
+def cells(candidates):
+    """Per-cell arrays (slot, hl, asc, pair code) for alive slots."""
+    slots = candidates.slots
+    alive = np.nonzero(slots["alive"])[0]
+    bits = mask_bits(slots["asc"][alive])
+    row, asc = np.nonzero(bits)
+    slot = alive[row]
+    return {
+        "slot": slot,
+        "hl": slots["hl"][slot],
+        "asc": asc,
+        "pair": slots["sat_start"][slot].astype(np.int16) * 12 + slots["chi_start"][slot],
+    }
+
+
+def is_resolved(candidates):
+    return len(np.unique(cells(candidates)["slot"])) <= 1
+
+
+def _pool(c):
+    # every question that touches at least one remaining cell
+    questions = []
+    members = []
+    for a in np.unique(c["asc"]):
+        questions.append(("asc", ZODIAC[a]))
+        members.append(c["asc"] == a)
+    for code in np.unique(c["hl"].astype(np.int16) * 12 + c["asc"]):
+        hl, a = divmod(int(code), 12)
+        questions.append(("hl_asc", HOUR_LORDS[hl], ZODIAC[a]))
+        members.append((c["hl"] == hl) & (c["asc"] == a))
+    for code in np.unique(c["pair"]):
+        s, ch = divmod(int(code), 12)
+        questions.append(("pair", HOUSES[s], HOUSES[ch]))
+        members.append(c["pair"] == code)
+    return questions, np.array(members, dtype=bool).reshape(len(questions), -1)
+
+
+def expected_gain(members, weights=None):
+    """Binary entropy (bits) of each question's split of the cell weight."""
+    if weights is None:
+        weights = np.ones(members.shape[1])
+    total = weights.sum()
+    if total <= 0:
+        return np.zeros(len(members))
+    p = np.clip((members * weights).sum(axis=1) / total, 1e-12, 1 - 1e-12)
+    gain = -(p * np.log2(p) + (1 - p) * np.log2(1 - p))
+    # a question covering every cell (or none) cannot split anything
+    return np.where((p > 1e-9) & (p < 1 - 1e-9), gain, 0.0)
+
+
+def next_question(candidates, asked=()):
+    """Best remaining question, or ``None`` once the window is resolved."""
+    if is_resolved(candidates):
+        return None
+    c = cells(candidates)
+    questions, members = _pool(c)
+    if not questions:
+        return None
+    gain = expected_gain(members)
+    for i, q in enumerate(questions):
+        if q in asked:
+            gain[i] = 0.0
+    best = int(np.argmax(gain))
+    return questions[best] if gain[best] > 0 else None
+
+
+def apply_answer(candidates, question, value):
+    """Apply one adaptive answer in place ("No" removes the described cells)."""
+    if value != "No":
+        return
+    slots = candidates.slots
+    kind = question[0]
+    if kind == "asc":
+        slots["asc"] &= np.uint16(~(1 << ZODIAC.index(question[1])) & 0xFFF)
+    elif kind == "hl_asc":
+        hit = slots["hl"] == HOUR_LORDS.index(question[1])
+        slots["asc"][hit] &= np.uint16(~(1 << ZODIAC.index(question[2])) & 0xFFF)
+    elif kind == "pair":
+        code = HOUSES.index(question[1]) * 12 + HOUSES.index(question[2])
+        slots["alive"] &= candidates.pair_codes() != code
+    else:
+        raise ValueError(f"Unknown question kind: {kind}")
+    slots["alive"] &= slots["asc"] != 0
+
+
+def record_answer(state, candidates, question, value):
+    """Mirror an adaptive answer into the app's answer dicts (same keys)."""
+    kind = question[0]
+    if kind == "asc":
+        state["asc_answers"][ZODIAC.index(question[1])] = value
+    elif kind == "hl_asc":
+        hl, asc = HOUR_LORDS.index(question[1]), ZODIAC.index(question[2])
+        slots = candidates.slots
+        hit = slots["alive"] & (slots["hl"] == hl) & (slots["asc"] >> asc & 1 == 1)
+        for slot_id in np.nonzero(hit)[0]:
+            state["hl_asc_answers"][(int(slot_id), asc)] = value
+    elif kind == "pair":
+        state["pair_answers"][(HOUSES.index(question[1]), HOUSES.index(question[2]))] = value
+
+
+def completed_pair_answers(candidates, pair_answers):
+    """Pairs never asked in adaptive mode count as "Maybe" for Step 7."""
+    answers = dict(pair_answers)
+    for pair in candidates.unique_pairs():
+        answers.setdefault(pair, "Maybe")
+    return answers
@@ -0,0 +1,318 @@
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import re
+import secrets
+import time
+import urllib.parse
+
+from engine import ZODIAC, HOUSES, HOUR_LORDS, BirthWindowSession
+from question_store import mars_questions, hourlord_question, saturn_question, chiron_question
+
+# ---------------------------
+# Local JSON API (asyncio, no Streamlit)
+# ---------------------------
+# The wizard flow over plain HTTP/1.1 + JSON for our own front-end. One
+# event loop serves every connection (keep-alive); each request is a few
+# engine calls on an in-memory BirthWindowSession, so handlers run inline.
+#
+#   POST   /sessions                              {"mars", "time1", "time2", "start": {hl, asc, sat, chi}}
+#   GET    /sessions/<id>                         slots + answers so far
+#   DELETE /sessions/<id>
+#   POST   /sessions/<id>/transitions             {"time", "hl", "asc", "sat", "chi"}
+#   DELETE /sessions/<id>/transitions/<i>
+#   GET    /sessions/<id>/questions/<kind>        kind = asc | hl_asc | pair, with texts
+#   POST   /sessions/<id>/answers                 {"kind", "key", "value"}
+#   GET    /sessions/<id>/result
+#
+# Keys: asc "Leo"; hl_asc {"slot": 2, "asc": "Leo"}; pair {"sat": "2", "chi": "4"}.
+# Errors are {"error": "..."} with 400 / 404 / 405; anything unexpected is
+# logged with its traceback and answered with 500.
+#
+#   python api.py [--host 127.0.0.1] [--port 8765]
+
+HOST = os.environ.get("BTF_API_HOST", "127.0.0.1")
+PORT = int(os.environ.get("BTF_API_PORT", "8765"))
+SESSION_TTL = float(os.environ.get("BTF_API_SESSION_TTL", "3600"))
+MAX_BODY = 64 * 1024
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+log = logging.getLogger("btf.api")
+
+
+class NotFound(Exception):
+    pass
+
+
+_sessions = {}    # id -> [BirthWindowSession, last used]
+
+
+def _time(value):
+    try:
+        h, m = str(value).split(":")
+        return datetime.time(int(h), int(m))
+    except ValueError:
+        raise ValueError(f"Bad time: {value!r} (expected HH:MM)")
+
+
+def _require(body, *names):
+    """Values of the fields ``names`` (all required) from a JSON object."""
+    if not isinstance(body, dict):
+        raise ValueError("Expected a JSON object.")
+    missing = [name for name in names if name not in body]
+    if missing:
+        raise ValueError(f"Missing field: {', '.join(missing)}")
+    return [body[name] for name in names]
+
+
+def _one_of(value, names, what):
+    if value not in names:
+        raise ValueError(f"Unknown {what}: {value!r}")
+    return value
+
+
+def _slot_fields(d):
+    hl, asc, sat, chi = _require(d, "hl", "asc", "sat", "chi")
+    return (
+        _one_of(hl, HOUR_LORDS, "hour lord"), _one_of(asc, ZODIAC, "sign"),
+        _one_of(sat, HOUSES, "Saturn house"), _one_of(chi, HOUSES, "Chiron house"),
+    )
+
+
+def _session(sid):
+    entry = _sessions.get(sid)
+    if entry is None:
+        raise NotFound(f"Unknown session: {sid}")
+    entry[1] = time.monotonic()
+    return entry[0]
+
+
+def _slot_json(slot):
+    d = slot.to_dict()
+    d["start_time"] = d["start_time"].strftime("%H:%M")
+    return d
+
+
+def _state(sid, session):
+    return {
+        "session": sid,
+        "mars": session.mars,
+        "time1": session.time1.strftime("%H:%M"),
+        "time2": session.time2.strftime("%H:%M"),
+        "slots": [_slot_json(s) for s in session.hour_slots],
+        "answers": {
+            "asc": {ZODIAC[a]: v for a, v in session.asc_answers.items()},
+            "hl_asc": [{"slot": i, "asc": ZODIAC[a], "value": v} for (i, a), v in session.hl_asc_answers.items()],
+            "pair": [{"sat": HOUSES[s], "chi": HOUSES[c], "value": v} for (s, c), v in session.pair_answers.items()],
+        },
+    }
+
+
+# ---------------------------
+# Handlers
+# ---------------------------
+def create_session(body):
+    mars, start = _require(body, "mars", "start")
+    _one_of(mars, ZODIAC, "Mars sign")
+    hl, asc, sat, chi = _slot_fields(start)
+    session = BirthWindowSession(
+        mars, _time(body.get("time1", "00:00")), _time(body.get("time2", "23:59"))
+    )
+    session.start(hl, asc, sat, chi, None, None, None)
+    sid = secrets.token_urlsafe(12)
+    _sessions[sid] = [session, time.monotonic()]
+    return 201, _state(sid, session)
+
+
+def get_session(body, sid):
+    return 200, _state(sid, _session(sid))
+
+
+def delete_session(body, sid):
+    _session(sid)
+    del _sessions[sid]
+    return 200, {"session": sid, "deleted": True}
+
+
+def add_transition(body, sid):
+    session = _session(sid)
+    (when,) = _require(body, "time")
+    session.add_transition(_time(when), *_slot_fields(body))
+    return 201, _state(sid, session)
+
+
+def remove_transition(body, sid, index):
+    session = _session(sid)
+    session.remove(int(index))
+    return 200, _state(sid, session)
+
+
+def questions(body, sid, kind):
+    session = _session(sid)
+    keys = session.questions(kind)
+    if kind == "asc":
+        texts = mars_questions(session.mars)
+        items = [{"key": asc, "text": texts[asc]} for asc in keys]
+    elif kind == "hl_asc":
+        items = []
+        for slot_id, asc in keys:
+            hl = HOUR_LORDS[session.hour_slots[slot_id].hl]
+            items.append({"key": {"slot": slot_id, "asc": asc}, "hour_lord": hl,
+                          "text": hourlord_question(hl, asc)})
+    else:
+        items = [
+            {"key": {"sat": sat, "chi": chi}, "saturn": saturn_question(sat), "chiron": chiron_question(chi)}
+            for sat, chi in keys
+        ]
+    return 200, {"kind": kind, "questions": items}
+
+
+def answer(body, sid):
+    session = _session(sid)
+    kind, raw_key, value = _require(body, "kind", "key", "value")
+    if kind == "asc":
+        key = _one_of(raw_key, ZODIAC, "sign")
+    elif kind == "hl_asc":
+        slot_id, asc = _require(raw_key, "slot", "asc")
+        if not isinstance(slot_id, int) or not 0 <= slot_id < len(session.hour_slots):
+            raise ValueError(f"Unknown slot: {slot_id!r}")
+        key = (slot_id, _one_of(asc, ZODIAC, "sign"))
+    elif kind == "pair":
+        sat, chi = _require(raw_key, "sat", "chi")
+        key = (_one_of(sat, HOUSES, "Saturn house"), _one_of(chi, HOUSES, "Chiron house"))
+    else:
+        raise ValueError(f"Unknown question kind: {kind!r}")
+    session.answer(kind, key, value)
+    return 200, {"kind": kind, "key": raw_key, "value": value}
+
+
+def result(body, sid):
+    result = _session(sid).result()
+    result["alive_slots"] = [
+        dict(s, start_time=s["start_time"].strftime("%H:%M")) for s in result["alive_slots"]
+    ]
+    return 200, result
+
+
+ROUTES = [
+    ("POST", r"/sessions", create_session),
+    ("GET", r"/sessions/(?P<sid>[\w-]+)", get_session),
+    ("DELETE", r"/sessions/(?P<sid>[\w-]+)", delete_session),
+    ("POST", r"/sessions/(?P<sid>[\w-]+)/transitions", add_transition),
+    ("DELETE", r"/sessions/(?P<sid>[\w-]+)/transitions/(?P<index>\d+)", remove_transition),
+    ("GET", r"/sessions/(?P<sid>[\w-]+)/questions/(?P<kind>asc|hl_asc|pair)", questions),
+    ("POST", r"/sessions/(?P<sid>[\w-]+)/answers", answer),
+    ("GET", r"/sessions/(?P<sid>[\w-]+)/result", result),
+]
+ROUTES = [(method, re.compile(pattern + r"/?\Z"), handler) for method, pattern, handler in ROUTES]
+
+
+def dispatch(method, target, raw_body):
+    path = urllib.parse.urlsplit(target).path
+    allowed = False
+    for route_method, pattern, handler in ROUTES:
+        m = pattern.match(path)
+        if not m:
+            continue
+        allowed = True
+        if route_method != method:
+            continue
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+            if not isinstance(body, dict):
+                raise ValueError("Request body must be a JSON object.")
+            return handler(body, **m.groupdict())
+        except NotFound as e:
+            return 404, {"error": str(e)}
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except Exception:
+            log.exception("%s %s failed", method, path)
+            return 500, {"error": "Internal server error."}
+    if allowed:
+        return 405, {"error": f"{method} not allowed on {path}"}
+    return 404, {"error": f"No route for {path}"}
+
+
+# ---------------------------
+# HTTP/1.1 over asyncio streams
+# ---------------------------
+async def handle_connection(reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length") or 0)
+            if length > MAX_BODY:
+                status, payload = 413, {"error": "Request body too large."}
+                keep_alive = False
+            else:
+                body = await reader.readexactly(length) if length else b""
+                status, payload = dispatch(method, target, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def expire_sessions(interval=60.0):
+    while True:
+        await asyncio.sleep(interval)
+        cutoff = time.monotonic() - SESSION_TTL
+        for sid in [sid for sid, (_, used) in _sessions.items() if used < cutoff]:
+            del _sessions[sid]
+
+
+async def serve(host=HOST, port=PORT, ready=None):
+    server = await asyncio.start_server(handle_connection, host, port)
+    sweeper = asyncio.create_task(expire_sessions())
+    if ready is not None:
+        ready(server)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        sweeper.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local JSON API for the narrowing flow.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args(argv)
+    print(f"listening on http://{args.host}:{args.port}", flush=True)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,62 @@
 import streamlit as st
 import datetime
-import pandas as pd
+import functools
+import os
+from streamlit.errors import StreamlitAPIException
+
+from engine import (
+    ZODIAC, HOUSES, HOUR_LORDS, HOUSE_SYSTEMS,
+    SlotIndex, new_slot, add_transition, undo_transition,
+    hl_asc_key, pair_key,
+)
+import metrics
+import snapshots
+import state_store
+
+# Heavy modules (NumPy via candidates/timeline, question banks, export) are
+# imported inside the step that first needs them, so a cold worker only pays
+# for Streamlit and the pure-Python engine until Step 3 is done.
+
+# Answer blocks in Steps 4–6 run as fragments: a click re-executes only that
+# question's block. Set BTF_FRAGMENT_ANSWERS=0 to fall back to full reruns.
+FRAGMENT_ANSWERS = os.environ.get("BTF_FRAGMENT_ANSWERS", "1") != "0"
+
+
+def answer_fragment(func):
+    return st.fragment(func) if FRAGMENT_ANSWERS else func
+
+
+def rerun_after_answer(was_complete, is_complete):
+    # completion checks / Continue buttons sit outside the fragments,
+    # so a full rerun is only needed when the step's completion flips
+    if FRAGMENT_ANSWERS and was_complete == is_complete:
+        metrics.count_rerun(st.session_state.step, "answer_fragment")
+        persist()
+        try:
+            st.rerun(scope="fragment")
+        except StreamlitAPIException:
+            # click arrived in a full-app run, not a fragment rerun
+            pass
+    rerun("answer")
+
+
+def persist():
+    # durable snapshot (write-behind) + shared state for other workers (if configured)
+    snapshots.save(st.session_state.session_token, st.session_state)
+    state_store.save(st.session_state.session_token, st.session_state)
+
+
+def rerun(site):
+    # every full rerun goes through here so metrics can see its call site
+    # and the state transition that caused it is persisted
+    if _run is None:
+        # fragment rerun: the timed full run has already ended
+        metrics.count_rerun(st.session_state.step, site)
+    else:
+        metrics.rerun_requested(_run, site)
+    persist()
+    st.rerun()
+
 
 def force_scroll_top():
     st.components.v1.html(
@@ -21,6 +77,20 @@ def force_scroll_top():
 # INIT STATE
 # ---------------------------
 
+# Resume token (?session=…): restores the last snapshot after a restart
+if "session_token" not in st.session_state:
+    token = st.query_params.get("session")
+    snapshot = snapshots.load(token)
+    if snapshot is not None:
+        st.session_state.update(snapshot)
+    elif not state_store.sync(token, st.session_state):
+        token = snapshots.new_token()
+    st.session_state.session_token = token
+    st.query_params["session"] = token
+
+# Shared state backend: pick up what another worker wrote since our last run
+state_store.sync(st.session_state.session_token, st.session_state)
+
 # Navigation step
 if "step" not in st.session_state:
     st.session_state.step = 1
@@ -29,6 +99,10 @@ if "step" not in st.session_state:
 if "mars" not in st.session_state:
     st.session_state.mars = None
 
+# Second possible Mars sign when Mars changed sign on the birth date
+if "mars_alt" not in st.session_state:
+    st.session_state.mars_alt = None
+
 # Time range defaults (datetime.time objects!)
 if "time1" not in st.session_state:
     st.session_state.time1 = datetime.time(0, 0)
@@ -44,25 +118,20 @@ if "hour_slots" not in st.session_state:
 if "final_end" not in st.session_state:
     st.session_state.final_end = None
 
+# Per-minute timeline (only when calculated from birth data)
+if "timeline" not in st.session_state:
+    st.session_state.timeline = None
 
-# Zodiac & House cycles
-zodiac_cycle = [
-    "Aries","Taurus","Gemini","Cancer","Leo","Virgo",
-    "Libra","Scorpio","Sagittarius","Capricorn","Aquarius","Pisces",
-    "Aries","Taurus","Gemini","Cancer","Leo","Virgo",
-    "Libra","Scorpio","Sagittarius","Capricorn","Aquarius","Pisces"
-]
+# Adaptive question mode (best-split question first, stop when resolved)
+if "adaptive" not in st.session_state:
+    st.session_state.adaptive = False
 
-house_cycle = [
-    "1","12","11","10","9","8","7","6","5","4","3","2",
-    "1","12","11","10","9","8","7","6","5","4","3","2"
-]
+# Probabilistic scoring (answers are likelihoods, Step 7 ranks by posterior)
+if "scoring" not in st.session_state:
+    st.session_state.scoring = False
 
-
-def expand_range(start, end, cycle):
-    start_idx = cycle.index(start)
-    end_idx = start_idx + cycle[start_idx:].index(end)
-    return cycle[start_idx:end_idx+1]
+# per-run instrumentation (no-op unless BTF_METRICS_FILE / BTF_METRICS_PORT)
+_run = metrics.start_run(st.session_state.step)
 
 
 # ---------------------------
@@ -96,15 +165,46 @@ def time_selector(label, default=None):
 if st.session_state.step == 1:
     st.title("Birth Time Finder")
 
-    mars = st.selectbox("Select your Mars sign", [
-        "Aries","Taurus","Gemini","Cancer","Leo","Virgo",
-        "Libra","Scorpio","Sagittarius","Capricorn","Aquarius","Pisces"
-    ])
+    with st.expander("🔎 Don't know your Mars sign? Look it up from your birth date"):
+        col_date, col_tz = st.columns(2)
+        with col_date:
+            mars_date = st.date_input("Birth date", value=datetime.date(2000, 1, 1),
+                                      min_value=datetime.date(1900, 1, 1),
+                                      max_value=datetime.date(2100, 12, 31), key="mars_date")
+        with col_tz:
+            mars_tz = st.number_input("UTC offset (hours)", -12.0, 14.0, value=9.0, step=0.5, key="mars_tz")
+        if st.button("Look up Mars sign"):
+            from mars_ingress import mars_signs
+            try:
+                signs, ingress = mars_signs(mars_date, mars_tz)
+            except ValueError as e:
+                st.error(f"❗ {e}")
+            else:
+                # set before the selectbox below is created in this run
+                st.session_state.mars_pick = signs[0]
+                st.session_state.mars_lookup = (signs, ingress)
+
+    lookup = st.session_state.get("mars_lookup")
+    if lookup and len(lookup[0]) > 1:
+        (before, after), ingress = lookup
+        st.info(f"Mars moved from {before} into {after} on this day (around {ingress:%H:%M} UTC). "
+                f"Questions for both signs will be shown.")
+
+    mars = st.selectbox("Select your Mars sign", ZODIAC, key="mars_pick")
+    adaptive = st.checkbox("Adaptive questions (ask only what narrows the window)",
+                           value=st.session_state.adaptive)
+    scoring = st.checkbox("Probabilistic scoring (rank times by probability; “No” is not final)",
+                          value=st.session_state.scoring)
 
     if st.button("Next"):
         st.session_state.mars = mars
+        # ingress day: keep the other sign only if the pick is one of the two
+        signs = lookup[0] if lookup else []
+        st.session_state.mars_alt = next((s for s in signs if s != mars), None) if mars in signs else None
+        st.session_state.adaptive = adaptive
+        st.session_state.scoring = scoring
         st.session_state.step = 2
-        st.rerun()
+        rerun("step1_next")
 
 # ---------------------------
 # STEP 2 — Select Time Range & baseline data
@@ -127,6 +227,51 @@ elif st.session_state.step == 2:
     st.session_state.time1 = time1
     st.session_state.time2 = time2
 
+    # ---------------------------
+    # AUTO TIMELINE (optional)
+    # ---------------------------
+    with st.expander("⚡ Calculate the whole timeline from birth data"):
+        birth_date = st.date_input("Birth date", value=datetime.date(2000, 1, 1),
+                                   min_value=datetime.date(1900, 1, 1),
+                                   max_value=datetime.date(2100, 12, 31))
+        col_lat, col_lon, col_tz = st.columns(3)
+        with col_lat:
+            lat = st.number_input("Latitude", -66.0, 66.0, value=37.57, format="%.2f")
+        with col_lon:
+            lon = st.number_input("Longitude (east +)", -180.0, 180.0, value=126.98, format="%.2f")
+        with col_tz:
+            tz_offset = st.number_input("UTC offset (hours)", -12.0, 14.0, value=9.0, step=0.5)
+        # Saturn / Chiron come from the bundled ephemeris unless entered by hand
+        manual_lon = st.checkbox("Enter Saturn / Chiron longitudes manually")
+        sat_lon = chi_lon = None
+        if manual_lon:
+            col_sl, col_cl = st.columns(2)
+            with col_sl:
+                sat_lon = st.number_input("Saturn longitude (°)", 0.0, 359.99, value=0.0)
+            with col_cl:
+                chi_lon = st.number_input("Chiron longitude (°)", 0.0, 359.99, value=0.0)
+        house_system = st.selectbox("House system", list(HOUSE_SYSTEMS), format_func=HOUSE_SYSTEMS.get)
+
+        if st.button("Calculate & Proceed"):
+            from timeline import build_timeline, timeline_to_hour_slots, timeline_final_end
+            timeline_args = dict(
+                date=birth_date, lat=lat, lon=lon, time1=time1, time2=time2,
+                sat_lon=sat_lon, chi_lon=chi_lon, tz_offset=tz_offset, house_system=house_system,
+            )
+            try:
+                timeline = build_timeline(**timeline_args)
+            except ValueError as e:
+                st.error(f"❗ {e}")
+            else:
+                # per-minute ASC / houses are kept for the Step 7 window chart;
+                # snapshots store only the inputs and rebuild it on resume
+                st.session_state.timeline = timeline
+                st.session_state.timeline_args = timeline_args
+                st.session_state.hour_slots = timeline_to_hour_slots(timeline)
+                st.session_state.final_end = timeline_final_end(timeline)
+                st.session_state.step = 3
+                rerun("step2_auto")
+
     st.write("Enter astro info for Time1 & Time2 (start and end points)")
 
     # ---------------------------
@@ -136,17 +281,17 @@ elif st.session_state.step == 2:
 
     with col1:
         st.subheader("Time1")
-        t1_hl = st.selectbox("Hour Lord", ["Saturn","Jupiter","Mars","Sun","Venus","Mercury","Moon"], key="t1_hl")
-        t1_asc = st.selectbox("Ascendant", zodiac_cycle[:12], key="t1_asc")
-        t1_sat = st.selectbox("Saturn House", [str(i) for i in range(1,13)], key="t1_sat")
-        t1_chi = st.selectbox("Chiron House", [str(i) for i in range(1,13)], key="t1_chi")
+        t1_hl = st.selectbox("Hour Lord", HOUR_LORDS, key="t1_hl")
+        t1_asc = st.selectbox("Ascendant", ZODIAC, key="t1_asc")
+        t1_sat = st.selectbox("Saturn House", HOUSES, key="t1_sat")
+        t1_chi = st.selectbox("Chiron House", HOUSES, key="t1_chi")
 
     with col2:
         st.subheader("Time2")
         # Time2 has NO hour lord field by your design
-        t2_asc = st.selectbox("Ascendant", zodiac_cycle[:12], key="t2_asc")
-        t2_sat = st.selectbox("Saturn House", [str(i) for i in range(1,13)], key="t2_sat")
-        t2_chi = st.selectbox("Chiron House", [str(i) for i in range(1,13)], key="t2_chi")
+        t2_asc = st.selectbox("Ascendant", ZODIAC, key="t2_asc")
+        t2_sat = st.selectbox("Saturn House", HOUSES, key="t2_sat")
+        t2_chi = st.selectbox("Chiron House", HOUSES, key="t2_chi")
 
     # ---------------------------
     # SUBMIT
@@ -160,24 +305,16 @@ elif st.session_state.step == 2:
             "chi": t2_chi
         }
 
-        # first HL slot: ONLY store start point
-        st.session_state.hour_slots.append({
-            "hl": t1_hl,
-            "start_time": time1,
-
-            "asc_start": t1_asc,
-            "sat_start": t1_sat,
-            "chi_start": t1_chi,
-
-            "asc_range": [t1_asc],
-            "sat_range": [t1_sat],
-            "chi_range": [t1_chi],
+        st.session_state.timeline = None
+        st.session_state.timeline_args = None
 
-            "alive": True
-        })
+        # first HL slot: ONLY store start point
+        st.session_state.hour_slots = SlotIndex(
+            time1, time2, [new_slot(t1_hl, time1, t1_asc, t1_sat, t1_chi)]
+        )
 
         st.session_state.step = 3
-        st.rerun()
+        rerun("step2_confirm")
 
 # ---------------------------
 # STEP 3 — Hour Lord input loop
@@ -193,38 +330,27 @@ elif st.session_state.step == 3:
     if st.session_state.hour_slots:
         st.subheader("Current Hour Lord Entries")
 
-        t2 = st.session_state.time2.strftime("%H:%M")
-        total = len(st.session_state.hour_slots)
-
         for i, slot in enumerate(st.session_state.hour_slots):
-
-            # ✅ Display logic
-            if "end_time" in slot and slot["end_time"] not in [None, "??:??"]:
-                end_display = slot["end_time"]
-            elif i == total - 1:  # last slot
-                end_display = t2  # ✅ show birth-window end
-            else:
-                end_display = "??:??"
-
-            st.write(
-                f"**{i+1}.** {slot['start_time'].strftime('%H:%M')} → {end_display} — "
-                f"{slot['hl']} | ASC {', '.join(slot['asc_range'])} | "
-                f"SAT {', '.join(slot['sat_range'])} | CHI {', '.join(slot['chi_range'])}"
-            )
-
-        # Undo button
-        if len(st.session_state.hour_slots) > 1:
-            if st.button("Undo Last Entry ❌"):
-                st.session_state.hour_slots.pop()
-                # restore previous end
-                if len(st.session_state.hour_slots) == 1:
-                    st.session_state.hour_slots[0]["end_time"] = t2
-                else:
-                    st.session_state.hour_slots[-1]["end_time"] = "??:??"
-                st.rerun()
+            slot = slot.to_dict()
+
+            col_slot, col_remove = st.columns([12, 1])
+            with col_slot:
+                st.write(
+                    f"**{i+1}.** {slot['start_time'].strftime('%H:%M')} → {slot['end_time']} — "
+                    f"{slot['hl']} | ASC {', '.join(slot['asc_range'])} | "
+                    f"SAT {', '.join(slot['sat_range'])} | CHI {', '.join(slot['chi_range'])}"
+                )
+            # any transition can be removed (the Time1 slot stays)
+            if i > 0:
+                with col_remove:
+                    if st.button("❌", key=f"remove_{i}", help="Remove this transition"):
+                        undo_transition(st.session_state.hour_slots, i)
+                        rerun("step3_remove")
 
     st.write("---")
-    st.subheader("Add Next Hour Lord Transition")
+    st.subheader("Add Hour Lord Transition")
+    st.caption("Transitions can be added in any order. If the window crosses midnight, "
+               "times earlier than Time1 belong to the next day.")
 
     with st.form("hl_form"):
         col_h, col_m = st.columns(2)
@@ -235,56 +361,92 @@ elif st.session_state.step == 3:
 
         next_time = datetime.time(next_hour, next_minute)
 
-        next_hl = st.selectbox("Hour Lord", ["Saturn","Jupiter","Mars","Sun","Venus","Mercury","Moon"])
-        next_asc = st.selectbox("Ascendant", zodiac_cycle[:12])
-        next_sat = st.selectbox("Saturn House", [str(i) for i in range(1,13)])
-        next_chi = st.selectbox("Chiron House", [str(i) for i in range(1,13)])
+        next_hl = st.selectbox("Hour Lord", HOUR_LORDS)
+        next_asc = st.selectbox("Ascendant", ZODIAC)
+        next_sat = st.selectbox("Saturn House", HOUSES)
+        next_chi = st.selectbox("Chiron House", HOUSES)
 
         submit = st.form_submit_button("Add")
 
         if submit:
-            last = st.session_state.hour_slots[-1]
-
-            if next_time <= last["start_time"]:
-                st.error("❗ New HL must be AFTER previous HL time.")
+            try:
+                add_transition(
+                    st.session_state.hour_slots,
+                    next_time, next_hl, next_asc, next_sat, next_chi
+                )
+            except ValueError as e:
+                st.error(f"❗ {e}")
             else:
-                # ✅ finalize previous slot end time
-                last["end_time"] = next_time.strftime("%H:%M")
+                rerun("step3_add")
+
+    st.write("---")
+    if st.button("Done — Go to Question Phase"):
+        # questions phase runs on the bitmask candidate state (first NumPy import)
+        from candidates import CandidateState
+        st.session_state.candidates = CandidateState.from_hour_slots(
+            st.session_state.hour_slots, st.session_state.timeline
+        )
+        st.success("Hour Lord setup complete.")
+        st.session_state.step = 4
+        rerun("step3_done")
 
-                # ✅ only update the **immediately previous slot's ranges**
-                if next_asc not in last["asc_range"]:
-                    last["asc_range"].append(next_asc)
-                if next_sat not in last["sat_range"]:
-                    last["sat_range"].append(next_sat)
-                if next_chi not in last["chi_range"]:
-                    last["chi_range"].append(next_chi)
+# ---------------------------
+# STEP 4 (adaptive) — one question at a time, best split first
+# ---------------------------
+elif st.session_state.step == 4 and st.session_state.adaptive:
 
-                # ✅ create new slot with clean initial range
-                st.session_state.hour_slots.append({
-                    "hl": next_hl,
-                    "start_time": next_time,
-                    "end_time": "??:??",
+    st.header("Birth Time Questions")
+    st.write("There are no good or bad items.")
+    st.write("Trust your intuition — not every statement has to be perfectly accurate, but it should resonate.")
 
-                    "asc_start": next_asc,
-                    "sat_start": next_sat,
-                    "chi_start": next_chi,
+    from adaptive import apply_answer, record_answer
+    import decision_trees
+    from question_store import mars_questions_for, hourlord_question, saturn_question, chiron_question
 
-                    "asc_range": [next_asc],
-                    "sat_range": [next_sat],
-                    "chi_range": [next_chi],
+    candidates = st.session_state.candidates
 
-                    "alive": True
-                })
+    # init state for answers (same dicts as the fixed flow)
+    for answers_key in ("asc_answers", "hl_asc_answers", "pair_answers"):
+        if answers_key not in st.session_state:
+            st.session_state[answers_key] = {}
+    if "adaptive_asked" not in st.session_state:
+        st.session_state.adaptive_asked = []
+        # precomputed question tree for this slot configuration (None = live)
+        st.session_state.adaptive_node = decision_trees.root(candidates)
 
-                st.rerun()
+    asked = [q for q, _ in st.session_state.adaptive_asked]
+    question = decision_trees.next_question(candidates, asked, st.session_state.adaptive_node)
+    metrics.questions_rendered(_run, int(question is not None))
 
-    st.write("---")
-    if st.button("Done — Go to Question Phase"):
-        # ✅ ensure final slot has true end_time from step2
-        st.session_state.hour_slots[-1]["end_time"] = t2
-        st.success("Hour Lord setup complete.")
-        st.session_state.step = 4
-        st.rerun()
+    st.caption(f"{len(asked)} answered · {int(candidates.slots['alive'].sum())} possible slots left")
+
+    if question is None:
+        st.success("Your birth window is narrowed down as far as the questions allow.")
+        if st.button("See Results →"):
+            st.session_state.step = 7
+            rerun("adaptive_results")
+    else:
+        kind = question[0]
+        st.markdown(f"### Question {len(asked) + 1}")
+        if kind == "asc":
+            mars_label = " / ".join(filter(None, (st.session_state.mars, st.session_state.mars_alt)))
+            st.markdown(f"**Mars {mars_label} · Ascendant {question[1]}**")
+            st.write(mars_questions_for(st.session_state.mars, st.session_state.mars_alt)[question[1]])
+        elif kind == "hl_asc":
+            st.markdown(f"**Hour Lord {question[1]} · Ascendant {question[2]}**")
+            st.write(hourlord_question(question[1], question[2]))
+        else:
+            st.markdown(f"**Saturn House {question[1]}**\n{saturn_question(question[1])}")
+            st.markdown(f"**Chiron House {question[2]}**\n{chiron_question(question[2])}")
+
+        cols = st.columns(3)
+        for col, label, value in zip(cols, ["✅ Yes", "❌ No", "🤔 Not Sure"], ["Yes", "No", "Maybe"]):
+            if col.button(label, key=f"adaptive_{len(asked)}_{value}"):
+                record_answer(st.session_state, candidates, question, value)
+                apply_answer(candidates, question, value)
+                st.session_state.adaptive_asked.append((question, value))
+                st.session_state.adaptive_node = decision_trees.advance(st.session_state.adaptive_node, value)
+                rerun("adaptive_answer")
 
 # ---------------------------
 # STEP 4 — ASC Questions Based on Mars Sign
@@ -299,24 +461,24 @@ elif st.session_state.step == 4:
     # Your selected Mars sign
     mars = st.session_state.mars
 
-    # import mars-asc dict
-    from mars_asc_questions import mars_asc_questions
+    # mars-asc texts (compiled store, only this Mars sign — or both on an ingress day — is loaded)
+    from question_store import mars_questions_for
 
     # ✅ Extract only asc signs that exist in hour_slots
-    possible_asc = sorted({
-        asc
-        for slot in st.session_state.hour_slots
-        for asc in slot["asc_range"]
-        if slot["alive"]
-    })
+    possible_asc = st.session_state.candidates.possible_ascs()
 
     # ✅ Filter questions to only those asc
-    questions = {asc: mars_asc_questions[mars][asc] for asc in possible_asc}
+    mars_asc_questions = mars_questions_for(mars, st.session_state.mars_alt)
+    questions = {asc: mars_asc_questions[ZODIAC[asc]] for asc in possible_asc}
+    metrics.questions_rendered(_run, len(questions))
 
     # init state for answers
     if "asc_answers" not in st.session_state:
         st.session_state.asc_answers = {asc: None for asc in possible_asc}
 
+    def asc_complete():
+        return None not in st.session_state.asc_answers.values()
+
     # Button Component
     def answer_button(label, asc, choice):
         selected = st.session_state.asc_answers.get(asc)
@@ -328,17 +490,17 @@ elif st.session_state.step == 4:
             "background-color:#E8E8E8;color:black;border-radius:6px;padding:4px 10px;"
         )
 
-        if st.button(label, key=f"{asc}_{label}", help=f"{asc} → {label}", use_container_width=False):
+        name = ZODIAC[asc]
+        if st.button(label, key=f"{name}_{label}", help=f"{name} → {label}", use_container_width=False):
+            was_complete = asc_complete()
             st.session_state.asc_answers[asc] = choice
+            rerun_after_answer(was_complete, asc_complete())
 
         st.markdown(f"<span style='{style}'></span>", unsafe_allow_html=True)
 
-
-    st.markdown(f"### Mars: **{mars}**")
-
-    # ASC questions loop
-    for asc, q in questions.items():
-        st.write(f"#### {asc}")
+    @answer_fragment
+    def asc_question(asc, q):
+        st.write(f"#### {ZODIAC[asc]}")
         st.write(q)
 
         col1, col2, col3 = st.columns(3)
@@ -351,21 +513,27 @@ elif st.session_state.step == 4:
 
         st.write("---")
 
+
+    if st.session_state.mars_alt:
+        st.markdown(f"### Mars: **{mars}** or **{st.session_state.mars_alt}**")
+    else:
+        st.markdown(f"### Mars: **{mars}**")
+
+    # ASC questions loop
+    for asc, q in questions.items():
+        asc_question(asc, q)
+
     # ✅ Ensure all answered before allowing next step
-    if None in st.session_state.asc_answers.values():
+    if not asc_complete():
         st.warning("Please answer all questions before continuing.")
     else:
         if st.button("Continue to Hour-Lord × Asc Questions"):
-            # elimination: drop asc marked "No"
-            for asc, ans in st.session_state.asc_answers.items():
-                if ans == "No":
-                    # remove asc from all hour slots
-                    for slot in st.session_state.hour_slots:
-                        if asc in slot["asc_range"]:
-                            slot["asc_range"].remove(asc)
+            # elimination: drop asc marked "No" (scoring mode keeps them, weighted)
+            if not st.session_state.scoring:
+                st.session_state.candidates.eliminate_ascs(st.session_state.asc_answers)
 
             st.session_state.step = 5
-            st.rerun()
+            rerun("step4_continue")
 
 # ---------------------------
 # STEP 5 — Hour Lord × Asc Questions
@@ -376,16 +544,24 @@ elif st.session_state.step == 5:
 
     st.write("Even if it reflects the person you want to be, please select “No” if it doesn’t match your current reality.")
 
-    from hourlord_asc_questions import hourlord_asc_questions
+    from question_store import hourlord_question
 
     # Initialize answer state
     if "hl_asc_answers" not in st.session_state:
         st.session_state.hl_asc_answers = {}
 
+    hl_questions = st.session_state.candidates.hl_asc_questions()
+
+    def hl_complete():
+        return all(
+            (slot_id, asc) in st.session_state.hl_asc_answers
+            for slot_id, _, asc in hl_questions
+        )
+
     # Render answer button
     def render_choice(slot_id, asc, value, label, color):
-        key = f"HLASC_{slot_id}_{asc}"
-        selected = st.session_state.hl_asc_answers.get(key)
+        selected = st.session_state.hl_asc_answers.get((slot_id, asc))
+        key = hl_asc_key(slot_id, ZODIAC[asc])
 
         style = (
             f"background-color:{color};color:white;font-weight:bold;border-radius:8px;"
@@ -396,37 +572,20 @@ elif st.session_state.step == 5:
         )
 
         if st.button(label, key=f"{key}_{value}",
-                     help=f"{asc} → {value}",
+                     help=f"{ZODIAC[asc]} → {value}",
                      type="secondary" if selected != value else "primary"):
-            st.session_state.hl_asc_answers[key] = value
-            st.rerun()
+            was_complete = hl_complete()
+            st.session_state.hl_asc_answers[(slot_id, asc)] = value
+            rerun_after_answer(was_complete, hl_complete())
 
         st.markdown(f"<style>#{key}_{value} {{{style}}}</style>", unsafe_allow_html=True)
 
-    all_answered = True
-    q_num = 0
-
-    for slot_id, slot in enumerate(st.session_state.hour_slots):
-
-        if not slot.get("alive", True):
-            continue
+    @answer_fragment
+    def hl_question(q_num, slot_id, hl, asc):
+        q_text = hourlord_question(HOUR_LORDS[hl], ZODIAC[asc])
 
-        asc_list = slot.get("asc_range", [])
-
-        # ✅ skip the slot entirely if no asc assigned
-        if not asc_list:
-            continue
-
-        hl = slot["hl"]
-
-        # ✅ take only the first ASC in the slot
-        asc = asc_list[0]
-
-        q_text = hourlord_asc_questions[hl][asc]
-
-        q_num += 1
-        st.subheader(f"**Question {q_num} — Hour Lord: {hl}**")
-        st.markdown(f"**Active Ascendant:** {asc}")
+        st.subheader(f"**Question {q_num} — Hour Lord: {HOUR_LORDS[hl]}**")
+        st.markdown(f"**Active Ascendant:** {ZODIAC[asc]}")
         st.write(q_text)
 
         # Render buttons
@@ -440,22 +599,25 @@ elif st.session_state.step == 5:
 
         st.write("---")
 
-        # check answered
-        key = f"HLASC_{slot_id}_{asc}"
-        if key not in st.session_state.hl_asc_answers:
-            all_answered = False
+    q_num = 0
+
+    for slot_id, hl, asc in hl_questions:
+        q_num += 1
+        hl_question(q_num, slot_id, hl, asc)
+
+    metrics.questions_rendered(_run, q_num)
 
     # ✅ move on only if all answered
     if q_num == 0:
         st.info("No ASC questions available for selected range.")
         if st.button("Continue"):
             st.session_state.step = 6
-            st.rerun()
+            rerun("step5_skip")
 
-    elif all_answered:
+    elif hl_complete():
         if st.button("Continue to House Questions →"):
             st.session_state.step = 6
-            st.rerun()
+            rerun("step5_continue")
     else:
         st.info("Please answer all questions before continuing ✅")
 
@@ -468,67 +630,58 @@ elif st.session_state.step == 6:
     st.write("If either Saturn or Chiron part feels false, choose **No**.")
     st.write("If unsure or mixed, choose **Not Sure**.")
 
-    from house_questions import saturn_house_questions, chiron_house_questions
+    from question_store import saturn_question, chiron_question
 
-    slots = st.session_state.hour_slots
+    candidates = st.session_state.candidates
 
-    unique_pairs = []
-    slot_map = {}
-
-    for idx, slot in enumerate(slots):
-        if not slot["alive"]:
-            continue
-        pair = (slot["sat_start"], slot["chi_start"])
-        if pair not in slot_map:
-            slot_map[pair] = []
-            unique_pairs.append(pair)
-        slot_map[pair].append(idx)
+    pairs = candidates.unique_pairs()
+    metrics.questions_rendered(_run, len(pairs))
 
     # ✅ store answers to pairs
     if "pair_answers" not in st.session_state:
         st.session_state.pair_answers = {}
 
-    qnum = 1
-    for sat, chi in unique_pairs:
-        sat_q = saturn_house_questions.get(sat, "")
-        chi_q = chiron_house_questions.get(chi, "")
+    def pairs_complete():
+        return len(st.session_state.pair_answers) >= len(pairs)
+
+    @answer_fragment
+    def pair_question(qnum, sat, chi):
+        sat_name, chi_name = HOUSES[sat], HOUSES[chi]
+        sat_q = saturn_question(sat_name)
+        chi_q = chiron_question(chi_name)
 
-        qkey = f"pair_{sat}_{chi}"
+        qkey = pair_key(sat_name, chi_name)
         st.markdown(f"### Question {qnum}")
-        st.markdown(f"**Saturn House {sat}**\n{sat_q}")
-        st.markdown(f"**Chiron House {chi}**\n{chi_q}")
+        st.markdown(f"**Saturn House {sat_name}**\n{sat_q}")
+        st.markdown(f"**Chiron House {chi_name}**\n{chi_q}")
 
-        selected = st.session_state.pair_answers.get(qkey)
+        selected = st.session_state.pair_answers.get((sat, chi))
 
         cols = st.columns(3)
-        if cols[0].button("✅ Yes", key=f"{qkey}_Yes"):
-            st.session_state.pair_answers[qkey] = "Yes"
-            st.rerun()
-        if cols[1].button("❌ No", key=f"{qkey}_No"):
-            st.session_state.pair_answers[qkey] = "No"
-            st.rerun()
-        if cols[2].button("🤔 Not Sure", key=f"{qkey}_Maybe"):
-            st.session_state.pair_answers[qkey] = "Maybe"
-            st.rerun()
+        for col, label, value in zip(cols, ["✅ Yes", "❌ No", "🤔 Not Sure"], ["Yes", "No", "Maybe"]):
+            if col.button(label, key=f"{qkey}_{value}"):
+                was_complete = pairs_complete()
+                st.session_state.pair_answers[(sat, chi)] = value
+                rerun_after_answer(was_complete, pairs_complete())
 
         if selected:
             st.success(f"Selected: {selected}")
         st.write("---")
+
+    qnum = 1
+    for sat, chi in pairs:
+        pair_question(qnum, sat, chi)
         qnum += 1
 
-    if len(st.session_state.pair_answers) < len(unique_pairs):
+    if not pairs_complete():
         st.warning("Please answer all questions ✅")
     else:
         if st.button("Next: Results"):
-            # apply NO = kill those slots
-            for (sat, chi), idx_list in slot_map.items():
-                key = f"pair_{sat}_{chi}"
-                ans = st.session_state.pair_answers.get(key)
-                if ans == "No":
-                    for idx in idx_list:
-                        slots[idx]["alive"] = False
+            # apply NO = kill those slots (scoring mode keeps them, weighted)
+            if not st.session_state.scoring:
+                candidates.apply_pair_answers(st.session_state.pair_answers)
             st.session_state.step = 7
-            st.rerun()
+            rerun("step6_continue")
 
 # ---------------------------
 # STEP 7 — Show Final Results (Pair filtering logic)
@@ -536,76 +689,76 @@ elif st.session_state.step == 6:
 elif st.session_state.step == 7:
     st.header("🎯 Final Birth Window Results")
 
-    alive_slots = [s for s in st.session_state.hour_slots if s["alive"]]
-
-    st.subheader("⏰ Possible birth times based on your answers")
-    for slot in alive_slots:
-        st.write(
-            f"{slot['start_time'].strftime('%H:%M')}–{slot['end_time']} "
-            f"(HL: {slot['hl']}, "
-            f"ASC: {', '.join(slot['asc_range'])}, "
-            f"SAT: {', '.join(slot['sat_range'])}, "
-            f"CHI: {', '.join(slot['chi_range'])})"
+    candidates = st.session_state.candidates
+    pair_answers = st.session_state.pair_answers
+    if st.session_state.adaptive:
+        from adaptive import completed_pair_answers
+        pair_answers = completed_pair_answers(candidates, pair_answers)
+    result = candidates.summarize(pair_answers)
+
+    import charts
+    if st.session_state.scoring:
+        # posterior over the slots as entered in Step 3, every answer given
+        # weighted (pairs the adaptive flow never asked carry no evidence)
+        import scoring
+        from candidates import CandidateState
+        base = CandidateState.from_hour_slots(st.session_state.hour_slots, st.session_state.timeline)
+        post = scoring.posterior(
+            base.slots, st.session_state.asc_answers, st.session_state.hl_asc_answers,
+            st.session_state.pair_answers,
         )
+        order, by_slot, by_asc = scoring.rank(post)
+
+        st.subheader("⏰ Most likely birth times")
+        slots = base.to_hour_slots()
+        st.dataframe([
+            {
+                "Time": f"{slots[i].start_time.strftime('%H:%M')}–{slots[i].end_label()}",
+                "Hour Lord": HOUR_LORDS[slots[i].hl],
+                "Most likely ASC": ZODIAC[int(post[i].argmax())],
+                "Probability": f"{by_slot[i]:.1%}",
+            }
+            for i in order[:10] if by_slot[i] > 0
+        ], hide_index=True)
+        st.vega_lite_chart(charts.window_chart(base.minute_view(post), scored=True))
+        st.write("**ASC probability:** " + ", ".join(
+            f"{ZODIAC[a]} {by_asc[a]:.0%}" for a in (-by_asc).argsort()[:4] if by_asc[a] >= 0.005
+        ))
+    else:
+        st.subheader("⏰ Possible birth times based on your answers")
+        view = candidates.minute_view()
+        st.write(f"**Possible:** {', '.join(charts.possible_ranges(view)) or '—'}")
+        st.vega_lite_chart(charts.window_chart(view))
 
     st.write("---")
     st.subheader("🧬 Natal Traits Based on Your Answers")
 
-    asc_set = set()
-    hl_set = set()
-    approved_pairs = set()
-    maybe_pairs = set()
-
-    # ✅ read user decisions on SAT–CHI combos
-    for key, val in st.session_state.pair_answers.items():
-        _, s, c = key.split("_")
-        if val == "Yes":
-            approved_pairs.add((s, c))
-        elif val == "Maybe":
-            maybe_pairs.add((s, c))
-
-    # ✅ collect only approved combos inside alive slots
-    for slot in alive_slots:
-        for asc in slot["asc_range"]:
-            asc_set.add(asc)
-        hl_set.add(slot["hl"])
-
-    final_pairs = []
-    for slot in alive_slots:
-        for s in slot["sat_range"]:
-            for c in slot["chi_range"]:
-                if (s, c) in approved_pairs:
-                    final_pairs.append((s, c))
-                elif (s, c) in maybe_pairs:
-                    final_pairs.append((s, c))
-
-    # ✅ unique + sorted
-    final_pairs = sorted(set(final_pairs), key=lambda x: (int(x[0]), int(x[1])))
-
-    st.write(f"**Likely Ascendants:** {', '.join(sorted(asc_set))}")
-    st.write(f"**Likely Hour Lords:** {', '.join(sorted(hl_set))}")
+    st.write(f"**Likely Ascendants:** {', '.join(result['ascendants'])}")
+    st.write(f"**Likely Hour Lords:** {', '.join(result['hour_lords'])}")
 
     st.write("**Likely Saturn–Chiron House Combinations:**")
-    for s, c in final_pairs:
+    for s, c in result["pairs"]:
         st.write(f"- House {s} / House {c}")
 
     st.write("---")
 
-    # ✅ CSV Download
-    import pandas as pd
-    slot_display = []
-    for slot in st.session_state.hour_slots:
-        slot_display.append({
-            "start_time": slot['start_time'].strftime("%H:%M"),
-            "end_time": slot['end_time'],
-            "Hour Lord": slot['hl'],
-            "Ascendant Range": ", ".join(slot['asc_range']),
-            "Saturn House Range": ", ".join(slot['sat_range']),
-            "Chiron House Range": ", ".join(slot['chi_range']),
-            "Alive": slot['alive']
-        })
-    df_slots = pd.DataFrame(slot_display)
-    st.download_button("📎 Download Analysis CSV", df_slots.to_csv(index=False), "birth_window_analysis.csv", "text/csv")
+    # ✅ Download (the file is generated only when the button is clicked)
+    import export
+    fmt = st.radio("Export format", export.available_formats(), horizontal=True)
+    mime, ext = export.FORMATS[fmt]
+    st.download_button(
+        "📎 Download Analysis", functools.partial(export.export_bytes, candidates, fmt),
+        f"birth_window_analysis.{ext}", mime,
+    )
 
 if "step" in st.session_state and st.session_state.step != 3:
-    force_scroll_top()
\ No newline at end of file
+    force_scroll_top()
+
+# widget clicks that did not go through rerun() (e.g. answers) reach the store here
+persist()
+
+if _run is not None and "candidates" in st.session_state:
+    metrics.slots_alive(_run, int(st.session_state.candidates.slots["alive"].sum()))
+metrics.end_run(_run)
+# fragment reruns share this run's globals; they must not end it a second time
+_run = None
\ No newline at end of file
@@ -0,0 +1,198 @@
+import bisect
+import functools
+import os
+import sys
+
+import numpy as np
+
+from astro import J2000, obliquity, gmst, ascendant, local_minutes_to_jd, sign_index, time_to_minute
+
+# ---------------------------
+# Ascendant ingress grid
+# ---------------------------
+# The Ascendant depends only on latitude and the local sidereal time (RAMC);
+# the date only enters through the clock → sidereal conversion, which is
+# plain arithmetic. So for every latitude band we store the 12 RAMCs at which
+# the Ascendant enters each sign, and ASC questions become a bisect on a row:
+#
+#   file     float32 (rows, 12) .npy, row r = latitude LAT_MIN + r * LAT_STEP,
+#            column k = RAMC (deg) at which the ASC enters sign k
+#
+# Rows are built in closed form (the rising point of ecliptic longitude λ has
+# RAMC = α − H₀ with cos H₀ = −tan φ · tan δ) at the J2000 obliquity, which
+# drifts < 0.02° per century. Between rows the RAMCs are interpolated
+# linearly (error ≪ 1 s of sidereal time at 0.25° bands). The file is
+# mmap'ed and shared by all workers.
+#
+# For a birth window the grid gives every ASC change in one vectorised step
+# (``window_boundaries``); each change minute is then checked against the
+# direct formula at that minute and the one before, so the per-minute signs
+# match ``astro.ascendant`` exactly while only ~2 trig evaluations are done
+# per change instead of one per minute.
+#
+# Build:  python asc_grid.py   (also built automatically when missing)
+
+LAT_MIN = -66.0
+LAT_MAX = 66.0
+LAT_STEP = 0.25
+
+# sidereal degrees per clock minute
+SIDEREAL_RATE = 360.98564736629 / 1440.0
+
+GRID_PATH = os.environ.get(
+    "BTF_ASC_GRID",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "asc_grid.npy"),
+)
+
+
+# ---------------------------
+# Build step
+# ---------------------------
+def ingress_ramc(lat, eps=None):
+    """RAMCs (deg) at which the ASC enters each of the 12 signs (exact, trig)."""
+    eps = np.radians(obliquity(J2000) if eps is None else eps)
+    lam = np.radians(np.arange(12) * 30.0)
+    ra = np.arctan2(np.cos(eps) * np.sin(lam), np.cos(lam))
+    dec = np.arcsin(np.sin(eps) * np.sin(lam))
+    phi = np.radians(np.asarray(lat, dtype=np.float64))[..., None]
+    h0 = np.arccos(np.clip(-np.tan(phi) * np.tan(dec), -1.0, 1.0))
+    return np.mod(np.degrees(ra - h0), 360.0)
+
+
+def build(path=GRID_PATH):
+    lats = np.arange(LAT_MIN, LAT_MAX + LAT_STEP / 2, LAT_STEP)
+    grid = ingress_ramc(lats).astype(np.float32)
+    tmp = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(tmp, grid)
+    os.replace(tmp, path)
+    return path
+
+
+@functools.lru_cache(maxsize=None)
+def get_grid():
+    if not os.path.exists(GRID_PATH):
+        build()
+    return np.load(GRID_PATH, mmap_mode="r")
+
+
+# ---------------------------
+# Lookup
+# ---------------------------
+@functools.lru_cache(maxsize=1024)
+def _row(lat):
+    if not LAT_MIN <= lat <= LAT_MAX:
+        raise ValueError(f"Latitude must be within ±{LAT_MAX:g}° for the ascendant grid.")
+    grid = get_grid()
+    pos = (lat - LAT_MIN) / LAT_STEP
+    r = min(int(pos), len(grid) - 2)
+    f = pos - r
+    lo = grid[r].astype(np.float64)
+    step = np.mod(grid[r + 1] - lo + 180.0, 360.0) - 180.0
+    row = np.mod(lo + f * step, 360.0)
+    order = np.argsort(row, kind="stable").astype(np.int8)
+    return row[order], order
+
+
+def ingress_row(lat):
+    """``(ramc, sign)``: the 12 ingress RAMCs in ascending order and the sign each one enters."""
+    return _row(round(float(lat), 4))
+
+
+def asc_signs(ramc, lat):
+    """ASC sign codes for an array of RAMCs (deg) — a bisect, no trigonometry."""
+    ramc_sorted, sign = ingress_row(lat)
+    idx = np.searchsorted(ramc_sorted, np.mod(ramc, 360.0), side="right") - 1
+    return sign[idx]    # idx −1 wraps to the last ingress of the previous turn
+
+
+# ---------------------------
+# Birth window
+# ---------------------------
+def window_ramc(date, lon, minute, tz_offset=0.0):
+    """RAMC at local ``minute``; later minutes add ``SIDEREAL_RATE`` each."""
+    return float(np.mod(gmst(local_minutes_to_jd(date, minute, tz_offset)) + lon, 360.0))
+
+
+def asc_at(date, lat, lon, minute, tz_offset=0.0):
+    """ASC sign code at local ``minute`` (direct formula)."""
+    return sign_index(ascendant(local_minutes_to_jd(date, minute, tz_offset), lat, lon))
+
+
+def window_boundaries(date, lat, lon, m1, m2, tz_offset=0.0):
+    """ASC over the local minutes ``m1``–``m2``: ``(first, minutes, signs)``.
+
+    ``first`` is the sign at ``m1``; ``minutes[i]`` is the first minute whose
+    ASC is ``signs[i]``. Minutes past 1440 belong to the following days.
+    """
+    ramc_sorted, sign = ingress_row(lat)
+    turn = 360.0 / SIDEREAL_RATE
+    first = np.mod(ramc_sorted - window_ramc(date, lon, m1, tz_offset), 360.0) / SIDEREAL_RATE
+    offsets = (first + turn * np.arange(int((m2 - m1) // turn) + 2)[:, None]).ravel()
+    signs = np.tile(sign, len(offsets) // 12)
+    order = np.argsort(offsets, kind="stable")
+    offsets, signs = offsets[order], signs[order]
+    # one minute of slack at the end for changes the check below moves earlier
+    keep = (offsets > 0) & (offsets <= m2 - m1 + 1)
+    minutes = m1 + np.ceil(offsets[keep] - 1e-9).astype(np.int64)
+    signs = signs[keep]
+
+    # the grid can be a fraction of a minute off: nudge each change until the
+    # direct formula agrees (new sign at the minute, another one just before)
+    for _ in range(3):
+        early = asc_at(date, lat, lon, minutes - 1, tz_offset) == signs
+        late = asc_at(date, lat, lon, minutes, tz_offset) != signs
+        if not (early | late).any():
+            break
+        minutes = minutes - early + late
+
+    first_sign = int(asc_at(date, lat, lon, m1, tz_offset))
+    keep = (minutes > m1) & (minutes <= m2)
+    minutes, signs = minutes[keep], signs[keep]
+    # drop changes that no longer change anything (e.g. one moved onto m1)
+    prev = np.concatenate([[first_sign], signs[:-1]])
+    keep = signs != prev
+    return first_sign, minutes[keep], signs[keep].astype(np.int8)
+
+
+def asc_boundaries(date, lat, lon, time1, time2, tz_offset=0.0):
+    """ASC changes inside a birth window given as times: ``(first, minutes, signs)``.
+
+    ``time2`` earlier than ``time1`` crosses midnight, as in
+    ``timeline.build_timeline``.
+    """
+    m1 = time_to_minute(time1)
+    m2 = time_to_minute(time2)
+    if m2 < m1:
+        m2 += 1440
+    return window_boundaries(date, lat, lon, m1, m2, tz_offset)
+
+
+def expand(first, minutes, signs, m1, m2):
+    """Per-minute sign codes for ``m1``–``m2`` from ``window_boundaries``."""
+    counts = np.diff(np.concatenate([[m1], minutes, [m2 + 1]]))
+    return np.repeat(np.concatenate([[first], signs]).astype(np.int8), counts)
+
+
+def fill_asc_ranges(hour_slots, first, minutes, signs):
+    """Set ``asc_start`` / ``asc_range`` of every slot from ``window_boundaries``.
+
+    Each range covers the slot's minutes up to and including its end (the
+    next slot's start), the same span the per-minute slots use.
+    """
+    minutes = minutes.tolist()
+    signs = signs.tolist()
+    for slot in hour_slots:
+        end = slot.end if slot.end is not None else hour_slots.end
+        i = bisect.bisect_right(minutes, slot.start)
+        j = bisect.bisect_right(minutes, end)
+        slot.asc_start = signs[i - 1] if i else first
+        slot.asc_range = bytearray((slot.asc_start,))
+        for code in signs[i:j]:
+            if code not in slot.asc_range:
+                slot.asc_range.append(code)
+    return hour_slots
+
+
+if __name__ == "__main__":
+    out = build(sys.argv[1] if len(sys.argv) > 1 else GRID_PATH)
+    print(f"{out}: {os.path.getsize(out)} bytes")
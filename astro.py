@@ -0,0 +1,154 @@
+import numpy as np
+
+# ---------------------------
+# Low-precision astronomy helpers (vectorized, NumPy)
+# ---------------------------
+# Formulas follow the Astronomical Almanac "low precision" section
+# (good to ~0.01° for the Sun, ~1 arcmin for sidereal time), which is far
+# below the one-sign / one-minute resolution the wizard works at.
+
+J2000 = 2451545.0
+
+# Altitude of the Sun's centre at rise/set (refraction + semi-diameter)
+SUNRISE_ALT = -0.833
+
+
+def julian_day(date):
+    """Julian day at 0h UT of a ``datetime.date``."""
+    return date.toordinal() + 1721424.5
+
+
+def obliquity(jd):
+    return 23.439291 - 0.0000004 * (jd - J2000)
+
+
+def gmst(jd):
+    """Greenwich mean sidereal time in degrees."""
+    d = jd - J2000
+    t = d / 36525.0
+    return np.mod(280.46061837 + 360.98564736629 * d + 0.000387933 * t * t, 360.0)
+
+
+def local_sidereal_time(jd, lon):
+    return np.mod(gmst(jd) + lon, 360.0)
+
+
+def ascendant(jd, lat, lon):
+    """Ecliptic longitude of the Ascendant in degrees (east longitude +)."""
+    ramc = np.radians(local_sidereal_time(jd, lon))
+    eps = np.radians(obliquity(jd))
+    phi = np.radians(lat)
+    asc = np.degrees(np.arctan2(
+        np.cos(ramc),
+        -(np.sin(ramc) * np.cos(eps) + np.tan(phi) * np.sin(eps)),
+    ))
+    return np.mod(asc, 360.0)
+
+
+def midheaven(jd, lon):
+    """Ecliptic longitude of the MC in degrees (east longitude +)."""
+    ramc = np.radians(local_sidereal_time(jd, lon))
+    eps = np.radians(obliquity(jd))
+    return np.mod(np.degrees(np.arctan2(np.sin(ramc), np.cos(ramc) * np.cos(eps))), 360.0)
+
+
+def sun_position(jd):
+    """Apparent ecliptic longitude, right ascension and declination (deg)."""
+    n = jd - J2000
+    L = np.mod(280.460 + 0.9856474 * n, 360.0)
+    g = np.radians(np.mod(357.528 + 0.9856003 * n, 360.0))
+    lam = np.radians(L + 1.915 * np.sin(g) + 0.020 * np.sin(2 * g))
+    eps = np.radians(obliquity(jd))
+    ra = np.degrees(np.arctan2(np.cos(eps) * np.sin(lam), np.cos(lam)))
+    dec = np.degrees(np.arcsin(np.sin(eps) * np.sin(lam)))
+    return np.mod(np.degrees(lam), 360.0), np.mod(ra, 360.0), dec
+
+
+def sun_altitude(jd, lat, lon):
+    _, ra, dec = sun_position(jd)
+    ha = np.radians(local_sidereal_time(jd, lon) - ra)
+    phi = np.radians(lat)
+    dec = np.radians(dec)
+    return np.degrees(np.arcsin(
+        np.sin(phi) * np.sin(dec) + np.cos(phi) * np.cos(dec) * np.cos(ha)
+    ))
+
+
+# ---------------------------
+# Planets (Keplerian elements)
+# ---------------------------
+# JPL "Approximate Positions of the Planets" (Standish), Table 1: mean
+# elements at J2000 and their rates per Julian century, referred to the
+# J2000 ecliptic and equinox. Good to a few arcminutes for Mars and Saturn
+# over 1800–2050 and slowly degrading beyond — Mars moves ~0.5° a day, so
+# sign ingresses land within an hour or so.
+#   a (au), e, I, L, long. perihelion, long. node (deg)
+ELEMENTS = {
+    "EM": ((1.00000261, 0.01671123, -0.00001531, 100.46457166, 102.93768193, 0.0),
+           (0.00000562, -0.00004392, -0.01294668, 35999.37244981, 0.32327364, 0.0)),
+    "Mars": ((1.52371034, 0.09339410, 1.84969142, -4.55343205, -23.94362959, 49.55953891),
+             (0.00001847, 0.00007882, -0.00813131, 19140.30268499, 0.44441088, -0.29257343)),
+    "Saturn": ((9.53667594, 0.05386179, 2.48599187, 49.95424423, 92.59887831, 113.66242448),
+               (-0.00125060, -0.00050991, 0.00193609, 1222.49362201, -0.41897216, -0.28867794)),
+}
+
+# Chiron (2060): two-body orbit from osculating elements (perihelion
+# 1996-02-14). Unperturbed, so it drifts by up to a degree or two towards
+# 1900 / 2100 — still well inside a 30° house.
+_CHIRON_N = 0.9856076686 / 13.648 ** 1.5    # mean motion, deg/day
+ELEMENTS["Chiron"] = (
+    (13.648, 0.3831, 6.935, 548.914 + _CHIRON_N * (J2000 - 2450128.0), 548.914, 209.379),
+    (0.0, 0.0, 0.0, _CHIRON_N * 36525.0, 0.0, 0.0),
+)
+
+# general precession in longitude, deg per Julian century (J2000 → of date)
+PRECESSION = 1.396971
+
+
+def heliocentric(jd, elements):
+    """Heliocentric ecliptic x, y, z (au, J2000) from mean elements."""
+    t = (np.asarray(jd, dtype=np.float64) - J2000) / 36525.0
+    a, e, inc, L, peri, node = (v0 + dv * t for v0, dv in zip(*elements))
+    M = np.radians(np.mod(L - peri + 180.0, 360.0) - 180.0)
+    E = M + e * np.sin(M)
+    for _ in range(6):
+        E = E - (E - e * np.sin(E) - M) / (1.0 - e * np.cos(E))
+    xp = a * (np.cos(E) - e)
+    yp = a * np.sqrt(1.0 - e * e) * np.sin(E)
+    w = np.radians(peri - node)
+    node = np.radians(node)
+    inc = np.radians(inc)
+    cw, sw, cn, sn, ci = np.cos(w), np.sin(w), np.cos(node), np.sin(node), np.cos(inc)
+    x = (cw * cn - sw * sn * ci) * xp + (-sw * cn - cw * sn * ci) * yp
+    y = (cw * sn + sw * cn * ci) * xp + (-sw * sn + cw * cn * ci) * yp
+    z = (sw * np.sin(inc)) * xp + (cw * np.sin(inc)) * yp
+    return x, y, z
+
+
+def planet_longitude(jd, planet, elements=None):
+    """Geocentric ecliptic longitude of date (deg) of a planet in ``ELEMENTS``.
+
+    ``elements`` overrides the table (e.g. osculating elements of a minor body).
+    """
+    px, py, _ = heliocentric(jd, elements or ELEMENTS[planet])
+    ex, ey, _ = heliocentric(jd, ELEMENTS["EM"])
+    lon = np.degrees(np.arctan2(py - ey, px - ex))
+    t = (np.asarray(jd, dtype=np.float64) - J2000) / 36525.0
+    return np.mod(lon + PRECESSION * t, 360.0)
+
+
+def sign_index(lon):
+    """0 = Aries … 11 = Pisces for ecliptic longitudes in degrees."""
+    return (np.floor_divide(np.mod(lon, 360.0), 30.0)).astype(np.int8)
+
+
+def local_minutes_to_jd(date, minutes, tz_offset):
+    """UT Julian days for local minutes after midnight of ``date``.
+
+    ``tz_offset`` is the local UTC offset in hours (e.g. 9 for KST).
+    """
+    return julian_day(date) + (np.asarray(minutes, dtype=np.float64) - tz_offset * 60.0) / 1440.0
+
+
+def time_to_minute(t):
+    return t.hour * 60 + t.minute
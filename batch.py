@@ -0,0 +1,197 @@
+import argparse
+import collections
+import concurrent.futures
+import csv
+import datetime
+import itertools
+import json
+import os
+import sys
+
+# ---------------------------
+# Batch intake (Steps 2–7 without the wizard)
+# ---------------------------
+# Reads intake records from a file or stdin and writes one JSON result per
+# record to stdout, in input order. Records are sent to a process pool in
+# chunks with a bounded number of chunks in flight, so memory stays flat
+# however long the input is.
+#
+#   python batch.py intake.jsonl > results.jsonl
+#   cat intake.csv | python batch.py --format csv --workers 8
+#
+# JSONL record:
+#   {"id": "A-17", "mars": "Leo", "time1": "08:00", "time2": "14:00",
+#    "start": {"hl": "Sun", "asc": "Cancer", "sat": "3", "chi": "5"},
+#    "transitions": [{"time": "09:00", "hl": "Venus", "asc": "Cancer", "sat": "2", "chi": "4"}],
+#    "answers": {"asc": {"Cancer": "No", "Leo": "Yes"},
+#                "hl_asc": {"09:00/Cancer": "Yes"},      # slot start / ASC
+#                "pair": {"2/4": "Maybe"}},              # Saturn / Chiron house
+#    "scoring": false}
+#
+# CSV columns: id, mars, time1, time2, transitions, asc_answers,
+# hl_asc_answers, pair_answers[, scoring]. ``transitions`` is
+# "HH:MM HL ASC SAT CHI" entries separated by ";" (the first one starts at
+# Time1); answer columns are "key=value" entries separated by ";".
+
+CHUNK_SIZE = 256
+
+
+def _time(value):
+    h, m = value.split(":")
+    return datetime.time(int(h), int(m))
+
+
+def _pairs(text):
+    items = (item.split("=", 1) for item in text.split(";") if item.strip())
+    return {k.strip(): v.strip() for k, v in items}
+
+
+def record_from_csv(row):
+    transitions = []
+    for entry in row["transitions"].split(";"):
+        if entry.strip():
+            t, hl, asc, sat, chi = entry.split()
+            transitions.append({"time": t, "hl": hl, "asc": asc, "sat": sat, "chi": chi})
+    return {
+        "id": row.get("id"),
+        "mars": row["mars"],
+        "time1": row["time1"],
+        "time2": row["time2"],
+        "start": transitions[0] if transitions else None,
+        "transitions": transitions[1:],
+        "answers": {
+            "asc": _pairs(row.get("asc_answers") or ""),
+            "hl_asc": _pairs(row.get("hl_asc_answers") or ""),
+            "pair": _pairs(row.get("pair_answers") or ""),
+        },
+        "scoring": (row.get("scoring") or "").strip().lower() in ("1", "true", "yes"),
+    }
+
+
+# ---------------------------
+# Worker side
+# ---------------------------
+def run_record(record):
+    """Same narrowing as app.py Steps 4–7 for one intake record."""
+    from engine import BirthWindowSession, ZODIAC, HOUR_LORDS
+    import charts
+
+    if not record.get("start"):
+        raise ValueError("Record has no Time1 hour lord / ASC / houses.")
+    session = BirthWindowSession(record["mars"], _time(record["time1"]), _time(record["time2"]))
+    start = record["start"]
+    session.start(start["hl"], start["asc"], start["sat"], start["chi"], None, None, None)
+    for tr in record.get("transitions", ()):
+        session.add_transition(_time(tr["time"]), tr["hl"], tr["asc"], tr["sat"], tr["chi"])
+
+    answers = record.get("answers", {})
+    for asc, value in answers.get("asc", {}).items():
+        session.answer("asc", asc, value)
+    for key, value in answers.get("hl_asc", {}).items():
+        at, asc = key.split("/")
+        slot_id = session.hour_slots.find(_time(at))
+        if slot_id is None:
+            raise ValueError(f"No slot covers {at}.")
+        session.answer("hl_asc", (slot_id, asc), value)
+    for key, value in answers.get("pair", {}).items():
+        session.answer("pair", tuple(key.split("/")), value)
+
+    result = session.result()
+    out = {
+        "id": record.get("id"),
+        "possible": charts.possible_ranges(session.narrowed().minute_view()),
+        "ascendants": result["ascendants"],
+        "hour_lords": result["hour_lords"],
+        "pairs": [f"{s}/{c}" for s, c in result["pairs"]],
+    }
+
+    if record.get("scoring"):
+        import scoring
+        post = scoring.posterior(session.close().slots, session.asc_answers, session.hl_asc_answers, session.pair_answers)
+        order, by_slot, by_asc = scoring.rank(post)
+        out["ranked"] = [
+            {
+                "time": f"{session.hour_slots[i].start_time.strftime('%H:%M')}–{session.hour_slots[i].end_label()}",
+                "hl": HOUR_LORDS[session.hour_slots[i].hl],
+                "asc": ZODIAC[int(post[i].argmax())],
+                "p": round(float(by_slot[i]), 4),
+            }
+            for i in order if by_slot[i] > 0
+        ]
+    return out
+
+
+def run_chunk(chunk):
+    results = []
+    for n, item in chunk:
+        record = None
+        try:
+            record = json.loads(item) if isinstance(item, str) else record_from_csv(item)
+            results.append(run_record(record))
+        except Exception as e:
+            # one bad record becomes an error row; the rest of the chunk still runs
+            rid = record.get("id") if isinstance(record, dict) else None
+            results.append({"id": rid, "line": n, "error": f"{type(e).__name__}: {e}"})
+    return results
+
+
+# ---------------------------
+# Driver
+# ---------------------------
+def read_items(stream, fmt):
+    """``(line number, raw item)`` — JSON text or a CSV row dict."""
+    if fmt == "csv":
+        for n, row in enumerate(csv.DictReader(stream), start=2):
+            yield n, row
+    else:
+        for n, line in enumerate(stream, start=1):
+            if line.strip():
+                yield n, line
+
+
+def chunked(items, size):
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def process(items, workers=None, chunk_size=CHUNK_SIZE):
+    """Results in input order; at most ``2 × workers`` chunks are in flight."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunked(items, chunk_size):
+            yield from run_chunk(chunk)
+        return
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        pending = collections.deque()
+        for chunk in chunked(items, chunk_size):
+            pending.append(pool.submit(run_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run intake records through the narrowing engine.")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL / CSV file (default: stdin)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="default: from the file extension, else jsonl")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+    stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    failed = 0
+    with stream:
+        for result in process(read_items(stream, fmt), args.workers, args.chunk_size):
+            failed += "error" in result
+            sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
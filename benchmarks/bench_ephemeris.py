@@ -0,0 +1,78 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import ephemeris
+
+# ---------------------------
+# Ephemeris accuracy / throughput
+# ---------------------------
+# Accuracy: interpolated longitudes vs the direct formulas at random
+# instants over 1900–2100. Throughput: batch lookups from the mmap'ed file
+# vs computing the same positions directly. Cold open: a fresh interpreter
+# importing the module and doing its first lookup.
+#
+#   python benchmarks/bench_ephemeris.py [--samples 1000000] [--batch 1440]
+
+COLD = (
+    "import time; t = time.perf_counter(); import ephemeris; "
+    "ephemeris.longitudes([2451545.0]); print((time.perf_counter() - t) * 1000)"
+)
+
+
+def _best(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Accuracy and speed of the offline ephemeris.")
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=1440, help="size of the small batch (one day of minutes)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    table = ephemeris.get_table()
+    print(f"file: {ephemeris.EPHEMERIS_PATH} ({os.path.getsize(ephemeris.EPHEMERIS_PATH) / 1e6:.2f} MB, "
+          f"{table.shape[0]} days × {table.shape[1]} bodies)")
+
+    rng = np.random.default_rng(args.seed)
+    jd = rng.uniform(ephemeris.JD0 + ephemeris.PAD, ephemeris.JD0 + len(table) - ephemeris.PAD - 1, args.samples)
+
+    lon = ephemeris.longitudes(jd)
+    print(f"\n{'body':<8} {'max err °':>12} {'rms err °':>12} {'max err ″':>10}")
+    for k, body in enumerate(ephemeris.BODIES):
+        err = np.abs(np.mod(lon[:, k] - ephemeris.compute_longitudes(jd, body) + 180.0, 360.0) - 180.0)
+        print(f"{body:<8} {err.max():>12.2e} {np.sqrt((err ** 2).mean()):>12.2e} {err.max() * 3600:>10.3f}")
+
+    print(f"\n{'lookup':<28} {'ms':>9} {'M positions/s':>14}")
+    small = jd[:args.batch]
+    for label, fn, n in [
+        (f"mmap, {args.samples:,} × 4", lambda: ephemeris.longitudes(jd), args.samples * 4),
+        (f"direct, {args.samples:,} × 4",
+         lambda: [ephemeris.compute_longitudes(jd, b) for b in ephemeris.BODIES], args.samples * 4),
+        (f"mmap, {args.batch:,} × 4", lambda: ephemeris.longitudes(small), args.batch * 4),
+        (f"direct, {args.batch:,} × 4",
+         lambda: [ephemeris.compute_longitudes(small, b) for b in ephemeris.BODIES], args.batch * 4),
+    ]:
+        t = _best(fn, 3 if n > 100_000 else 50)
+        print(f"{label:<28} {t * 1000:>9.2f} {n / t / 1e6:>14.1f}")
+
+    cold = [float(subprocess.run([sys.executable, "-c", COLD], cwd=ROOT, capture_output=True,
+                                 text=True, check=True).stdout) for _ in range(5)]
+    print(f"\ncold import + first lookup: {np.median(cold):.1f} ms (median of 5)")
+
+
+if __name__ == "__main__":
+    main()
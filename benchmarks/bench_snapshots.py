@@ -0,0 +1,74 @@
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("BTF_SNAPSHOT_DB", os.path.join(tempfile.mkdtemp(), "sessions.sqlite"))
+
+import snapshots
+from bench_state_size import SIZES, compact_state
+from candidates import CandidateState
+
+# ---------------------------
+# Snapshot cost per rerun
+# ---------------------------
+# Time spent inside snapshots.save() on the rerun path (pickle + hand-off to
+# the writer thread) for a finished session of N slots, and the time of one
+# write-behind batch. Fails if the median save exceeds BUDGET_MS.
+#
+#   python benchmarks/bench_snapshots.py [--sizes 1 10 50 200] [--sessions 100]
+
+BUDGET_MS = 1.0
+ROUNDS = 200
+
+
+def session_state(n):
+    state = compact_state(n)
+    state.update(
+        step=6, mars="Leo", adaptive=False,
+        candidates=CandidateState.from_hour_slots(state["hour_slots"]),
+    )
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Snapshot save / flush cost.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--sessions", type=int, default=100, help="sessions per write-behind batch")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for n in args.sizes:
+        state = session_state(n)
+        token = snapshots.new_token()
+        samples = []
+        for i in range(ROUNDS):
+            state["step"] = i   # a real transition every round, so nothing is skipped
+            start = time.perf_counter()
+            snapshots.save(token, state)
+            samples.append((time.perf_counter() - start) * 1000)
+        snapshots.flush()
+
+        for _ in range(args.sessions):
+            snapshots.save(snapshots.new_token(), state)
+        start = time.perf_counter()
+        snapshots.flush()
+        batch_ms = (time.perf_counter() - start) * 1000
+
+        assert snapshots.load(token)["step"] == ROUNDS - 1
+        median = statistics.median(samples)
+        failed |= median > BUDGET_MS
+        print(
+            f"n={n:<4} save median {median:.3f} ms  p99 {sorted(samples)[int(ROUNDS * 0.99)]:.3f} ms  "
+            f"flush {args.sessions} sessions {batch_ms:.1f} ms"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
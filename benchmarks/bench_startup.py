@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# ---------------------------
+# Cold-start benchmark
+# ---------------------------
+# Every sample is a fresh interpreter (a new worker): time to import Streamlit,
+# time of the first script run (Step 1, all module-level imports of app.py),
+# peak RSS, and which heavy modules got loaded. The same worker then goes on
+# to Step 4 so the cost moved there by lazy imports is visible too.
+#
+#   python benchmarks/bench_startup.py [--repeat 5]
+
+APP = os.path.join(ROOT, "app.py")
+HEAVY = ("numpy", "pandas", "pyarrow", "candidates", "question_store", "export")
+
+
+def _rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / 1024
+
+
+def _sample(start):
+    return {
+        "ms": (time.perf_counter() - start) * 1000,
+        "rss_mb": _rss_mb(),
+        "heavy": [m for m in HEAVY if m in sys.modules],
+    }
+
+
+def child():
+    out = {}
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    out["import streamlit"] = _sample(start)
+
+    at = AppTest.from_file(APP, default_timeout=60)
+    start = time.perf_counter()
+    at.run()
+    out["step 1 first run"] = _sample(start)
+
+    from bench_wizard import synthetic_hour_slots
+    at.session_state["mars"] = "Leo"
+    at.session_state["hour_slots"] = synthetic_hour_slots(10)
+    at.session_state["step"] = 3
+    at.run()
+    start = time.perf_counter()
+    next(b for b in at.button if b.label.startswith("Done")).click().run()
+    out["step 3 → 4"] = _sample(start)
+
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    print(json.dumps(out))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fresh-worker import time and memory.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child()
+        return
+
+    env = dict(os.environ, BTF_SNAPSHOTS="0", PYTHONDONTWRITEBYTECODE="1")
+    runs = []
+    for _ in range(args.repeat):
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child"],
+            capture_output=True, text=True, env=env, cwd=ROOT, check=True,
+        )
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    for phase in runs[0]:
+        ms = statistics.median(r[phase]["ms"] for r in runs)
+        rss = statistics.median(r[phase]["rss_mb"] for r in runs)
+        heavy = ", ".join(runs[0][phase]["heavy"]) or "-"
+        print(f"{phase:<18} {ms:>8.1f} ms   peak RSS {rss:>6.1f} MB   loaded: {heavy}")
+
+
+if __name__ == "__main__":
+    main()
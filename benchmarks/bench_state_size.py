@@ -0,0 +1,82 @@
+import argparse
+import os
+import pickle
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine import ZODIAC, HOUSES, hl_asc_key, pair_key
+from candidates import CandidateState
+from bench_wizard import SIZES, synthetic_hour_slots
+
+# ---------------------------
+# Per-session state size
+# ---------------------------
+# Bytes held in session_state by one finished wizard run of N slots, for the
+# compact form (Slot objects, code-keyed answers) against the earlier form
+# (one dict of names / "HH:MM" strings per slot, string-keyed answers).
+# "deep" walks containers with sys.getsizeof (shared interned objects counted
+# once); "pickle" is the size of the whole state serialized as it is
+# (snapshots themselves are compact JSON, see snapshots.py).
+#
+#   python benchmarks/bench_state_size.py [--sizes 1 10 50 200]
+
+
+def deep_size(obj, seen=None):
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(v, seen) for v in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_size(getattr(obj, name), seen) for name in obj.__slots__)
+    return size
+
+
+def compact_state(n):
+    hour_slots = synthetic_hour_slots(n)
+    candidates = CandidateState.from_hour_slots(hour_slots)
+    return {
+        "hour_slots": hour_slots,
+        "asc_answers": {asc: "Yes" for asc in candidates.possible_ascs()},
+        "hl_asc_answers": {(i, asc): "Yes" for i, _, asc in candidates.hl_asc_questions()},
+        "pair_answers": {pair: "Yes" for pair in candidates.unique_pairs()},
+    }
+
+
+def legacy_state(state):
+    return {
+        "hour_slots": [slot.to_dict() for slot in state["hour_slots"]],
+        "asc_answers": {ZODIAC[a]: v for a, v in state["asc_answers"].items()},
+        "hl_asc_answers": {hl_asc_key(i, ZODIAC[a]): v for (i, a), v in state["hl_asc_answers"].items()},
+        "pair_answers": {pair_key(HOUSES[s], HOUSES[c]): v for (s, c), v in state["pair_answers"].items()},
+    }
+
+
+def measure(state):
+    return deep_size(state), len(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bytes per session, legacy vs compact state.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    args = parser.parse_args(argv)
+
+    print(f"{'slots':>5}  {'legacy deep':>11}  {'compact deep':>12}  {'legacy pickle':>13}  {'compact pickle':>14}")
+    for n in args.sizes:
+        compact = compact_state(n)
+        old_deep, old_pickle = measure(legacy_state(compact))
+        new_deep, new_pickle = measure(compact)
+        print(
+            f"{n:>5}  {old_deep:>11}  {new_deep:>7} ({new_deep / old_deep:4.0%})  "
+            f"{old_pickle:>13}  {new_pickle:>9} ({new_pickle / old_pickle:4.0%})"
+        )
+
+
+if __name__ == "__main__":
+    main()
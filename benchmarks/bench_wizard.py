@@ -0,0 +1,278 @@
+import argparse
+import datetime
+import json
+import os
+import pickle
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+from engine import (
+    ZODIAC, HOUSES, HOUR_LORDS,
+    SlotIndex, new_slot, add_transition, hl_asc_key, pair_key,
+)
+
+# ---------------------------
+# End-to-end wizard benchmark (Streamlit AppTest, headless)
+# ---------------------------
+# Drives app.py through Steps 1–7 for synthetic sessions of N hour-lord slots
+# and records, per step: wall time of every rerun, widgets emitted and the
+# pickled size of session_state. Steps 1–3 go through the real widgets (the
+# Step 2 selectboxes and Confirm, one Step 3 form submit per transition). A
+# rerun counts towards the step it renders, so the "Continue" click that
+# leaves Step 4 is a Step 5 rerun. Results are compared against
+# benchmarks/baselines.json; a regression exits non-zero.
+#
+# Timings are gated as ratios: each run first times a fixed calibration
+# script (plain Streamlit widgets, no app code) and baselines are scaled by
+# how much faster or slower this machine is than the one that wrote them.
+# Runs under PYTHONHASHSEED=0 (re-executing itself if needed): pickled set
+# order, and so state size, depends on the hash seed.
+#
+#   python benchmarks/bench_wizard.py                 # compare
+#   python benchmarks/bench_wizard.py --update        # rewrite baselines
+#   python benchmarks/bench_wizard.py --sizes 1 10    # subset
+
+APP = os.path.join(ROOT, "app.py")
+BASELINES = os.path.join(ROOT, "benchmarks", "baselines.json")
+
+SIZES = [1, 10, 50, 200]
+
+# answer clicks timed per question step; the rest are filled in directly
+CLICKS_PER_STEP = 3
+
+# allowed slowdown (after machine scaling) before a timing counts as a regression
+TIME_TOLERANCE = 0.5
+TIME_SLACK_MS = 5.0
+SIZE_TOLERANCE = 0.1
+
+CALIBRATION_RUNS = 30
+
+# Time1 start values and the Time2 end values entered in Step 2
+START = (HOUR_LORDS[0], ZODIAC[0], HOUSES[0], HOUSES[0])
+FINAL_END = {"asc": ZODIAC[11], "sat": HOUSES[1], "chi": HOUSES[6]}
+
+
+def synthetic_transitions(n):
+    """The ``n - 1`` transitions after Time1: (time, hl, asc, sat, chi), ASC/houses advancing."""
+    step = 1439 // n
+    for k in range(1, n):
+        m = k * step
+        sign = (k * 12) // n
+        yield (datetime.time(m // 60, m % 60),
+               HOUR_LORDS[k % 7], ZODIAC[sign], HOUSES[-sign % 12], HOUSES[(5 - sign) % 12])
+
+
+def synthetic_hour_slots(n):
+    """``n`` closed slots spread over one day (what Steps 2–3 enter via the widgets)."""
+    hl, asc, sat, chi = START
+    hour_slots = SlotIndex(datetime.time(0, 0), datetime.time(23, 59),
+                           [new_slot(hl, datetime.time(0, 0), asc, sat, chi)])
+    for transition in synthetic_transitions(n):
+        add_transition(hour_slots, *transition)
+    return hour_slots
+
+
+def count_widgets(node):
+    children = getattr(node, "children", None)
+    if children is None:
+        return 1
+    return sum(count_widgets(c) for c in children.values())
+
+
+def state_bytes(at):
+    state = {
+        k: v for k, v in at.session_state.to_dict().items()
+        if isinstance(k, str) and not k.startswith("$$")
+    }
+    return len(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class Recorder:
+    def __init__(self, at):
+        self.at = at
+        self.steps = {}
+
+    def run(self, action=None):
+        start = time.perf_counter()
+        (action() if action else self.at).run()
+        elapsed = (time.perf_counter() - start) * 1000
+        step = self.at.session_state["step"]
+        if self.at.exception:
+            raise RuntimeError(f"step {step}: {self.at.exception[0].value}")
+        rec = self.steps.setdefault(step, {"rerun_ms": []})
+        rec["rerun_ms"].append(elapsed)
+        rec["widgets"] = count_widgets(self.at.main)
+        rec["state_bytes"] = state_bytes(self.at)
+
+    def button(self, label):
+        return self.widget(self.at.button, label)
+
+    @staticmethod
+    def widget(elements, label):
+        for w in elements:
+            if w.label.startswith(label):
+                return w
+        raise KeyError(label)
+
+    def summary(self):
+        return {
+            str(step): {
+                "reruns": len(rec["rerun_ms"]),
+                "median_ms": round(statistics.median(rec["rerun_ms"]), 2),
+                "max_ms": round(max(rec["rerun_ms"]), 2),
+                "widgets": rec["widgets"],
+                "state_bytes": rec["state_bytes"],
+            }
+            for step, rec in sorted(self.steps.items())
+        }
+
+
+def answer_step(r, keys, store, button_key):
+    # time a few real clicks, then fill the rest directly
+    for key in keys[:CLICKS_PER_STEP]:
+        r.run(lambda key=key: r.at.button(key=button_key(key)).click())
+    answers = dict(r.at.session_state[store])
+    for key in keys[CLICKS_PER_STEP:]:
+        answers[key] = "Yes"
+    r.at.session_state[store] = answers
+    r.run()
+
+
+def run_session(n):
+    at = AppTest.from_file(APP, default_timeout=120)
+    r = Recorder(at)
+
+    # STEP 1
+    r.run()
+    r.run(lambda: r.button("Next").click())
+
+    # STEP 2: window 00:00–23:59, Time1 / Time2 fields, Confirm
+    r.run()
+    for label, value in (("Time1 Hour", 0), ("Time1 Min", 0), ("Time2 Hour", 23), ("Time2 Min", 59)):
+        r.widget(at.selectbox, label).set_value(value)
+    for key, value in zip(("t1_hl", "t1_asc", "t1_sat", "t1_chi"), START):
+        at.selectbox(key=key).set_value(value)
+    for field, value in FINAL_END.items():
+        at.selectbox(key=f"t2_{field}").set_value(value)
+    r.run(lambda: r.button("Confirm Range").click())
+
+    # STEP 3: one form submit per transition
+    for t, hl, asc, sat, chi in synthetic_transitions(n):
+        r.widget(at.number_input, "Hour").set_value(t.hour)
+        r.widget(at.number_input, "Minute").set_value(t.minute)
+        for label, value in (("Hour Lord", hl), ("Ascendant", asc), ("Saturn House", sat), ("Chiron House", chi)):
+            r.widget(at.selectbox, label).set_value(value)
+        r.run(lambda: r.button("Add").click())
+    assert len(at.session_state["hour_slots"]) == n
+    r.run(lambda: r.button("Done").click())
+
+    # STEP 4
+    ascs = list(at.session_state["asc_answers"].keys())
+    answer_step(r, ascs, "asc_answers", lambda asc: f"{ZODIAC[asc]}_Yes")
+    r.run(lambda: r.button("Continue to Hour").click())
+
+    # STEP 5
+    keys = [(i, asc) for i, _, asc in at.session_state["candidates"].hl_asc_questions()]
+    answer_step(r, keys, "hl_asc_answers", lambda key: f"{hl_asc_key(key[0], ZODIAC[key[1]])}_Yes")
+    r.run(lambda: r.button("Continue").click())
+
+    # STEP 6
+    keys = at.session_state["candidates"].unique_pairs()
+    answer_step(r, keys, "pair_answers", lambda key: f"{pair_key(HOUSES[key[0]], HOUSES[key[1]])}_Yes")
+    r.run(lambda: r.button("Next: Results").click())
+
+    # STEP 7
+    r.run()
+    return r.summary()
+
+
+def calibration_script():
+    import streamlit as st
+
+    st.header("calibration")
+    for i in range(40):
+        st.write(f"row {i}")
+        st.selectbox("pick", list(range(24)), key=f"pick_{i}")
+    st.button("go")
+
+
+def calibrate():
+    """Fastest rerun (ms) of a fixed widget script: this machine's speed, not the app's.
+
+    The minimum, as with ``timeit``: it moves least with background load.
+    """
+    at = AppTest.from_function(calibration_script, default_timeout=60)
+    at.run()
+    times = []
+    for _ in range(CALIBRATION_RUNS):
+        start = time.perf_counter()
+        at.run()
+        times.append((time.perf_counter() - start) * 1000)
+    return round(min(times), 3)
+
+
+def compare(results, baselines, calibration_ms):
+    failures = []
+    # > 1 on a machine slower than the one that wrote the baselines
+    scale = calibration_ms / baselines["calibration_ms"]
+    for n, steps in results.items():
+        for step, cur in steps.items():
+            base = baselines["sizes"].get(n, {}).get(step)
+            if base is None:
+                continue
+            limit = base["median_ms"] * scale * (1 + TIME_TOLERANCE) + TIME_SLACK_MS
+            if cur["median_ms"] > limit:
+                failures.append(f"n={n} step {step}: median {cur['median_ms']} ms > {limit:.1f} ms")
+            for metric in ("widgets", "state_bytes"):
+                limit = base[metric] * (1 + SIZE_TOLERANCE)
+                if cur[metric] > limit:
+                    failures.append(f"n={n} step {step}: {metric} {cur[metric]} > {limit:.0f}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AppTest benchmark for the seven-step wizard.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--update", action="store_true", help="write results as the new baselines")
+    parser.add_argument("--baselines", default=BASELINES)
+    args = parser.parse_args(argv)
+
+    calibration_ms = calibrate()
+    print(f"calibration: {calibration_ms:.2f} ms per rerun")
+    results = {}
+    for n in args.sizes:
+        results[str(n)] = run_session(n)
+        for step, rec in results[str(n)].items():
+            print(
+                f"n={n:<4} step {step}: {rec['reruns']:>2} reruns  "
+                f"median {rec['median_ms']:>8.2f} ms  max {rec['max_ms']:>8.2f} ms  "
+                f"{rec['widgets']:>5} widgets  {rec['state_bytes']:>7} B state"
+            )
+
+    if args.update:
+        with open(args.baselines, "w", encoding="utf-8") as f:
+            json.dump({"calibration_ms": calibration_ms, "sizes": results}, f, indent=2, sort_keys=True)
+        print(f"baselines written to {args.baselines}")
+        return 0
+
+    if not os.path.exists(args.baselines):
+        print("no baselines yet — run with --update")
+        return 0
+    with open(args.baselines, encoding="utf-8") as f:
+        failures = compare(results, json.load(f), calibration_ms)
+    for line in failures:
+        print(f"REGRESSION {line}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    if os.environ.get("PYTHONHASHSEED") != "0":
+        os.environ["PYTHONHASHSEED"] = "0"
+        os.execv(sys.executable, [sys.executable, *sys.argv])
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine import ZODIAC, HOUR_LORDS, ANSWERS
+
+# ---------------------------
+# api.py load test
+# ---------------------------
+# N concurrent clients, each on its own keep-alive connection, run the whole
+# flow as a user would: create a session, enter transitions, fetch and answer
+# every question bank, read the result. Reports requests/s and latency
+# percentiles per endpoint. Starts ``api.py`` on a spare port unless --port
+# points at one that is already running.
+#
+#   python benchmarks/load_api.py [--clients 50] [--sessions 500] [--port 8765]
+
+TRANSITIONS = 8
+
+
+class Client:
+    def __init__(self, host, port, latencies):
+        self.host, self.port = host, port
+        self.latencies = latencies
+        self.reader = self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, name, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        start = time.perf_counter()
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+        )
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        payload = json.loads(await self.reader.readexactly(length))
+        self.latencies.setdefault(name, []).append(time.perf_counter() - start)
+        if status >= 400:
+            raise RuntimeError(f"{method} {path} → {status}: {payload.get('error')}")
+        return payload
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def scenario(client, rng):
+    sign = rng.randrange(12)
+    state = await client.request("create", "POST", "/sessions", {
+        "mars": ZODIAC[rng.randrange(12)], "time1": "06:00", "time2": "18:00",
+        "start": {"hl": HOUR_LORDS[0], "asc": ZODIAC[sign], "sat": "1", "chi": "1"},
+    })
+    sid = state["session"]
+    for k in range(1, TRANSITIONS + 1):
+        await client.request("transition", "POST", f"/sessions/{sid}/transitions", {
+            "time": f"{6 + k:02d}:{rng.randrange(60):02d}",
+            "hl": HOUR_LORDS[k % 7], "asc": ZODIAC[(sign + k // 2) % 12],
+            "sat": str(1 + k % 12), "chi": str(1 + (k * 5) % 12),
+        })
+    for kind in ("asc", "hl_asc", "pair"):
+        items = (await client.request(kind, "GET", f"/sessions/{sid}/questions/{kind}"))["questions"]
+        for item in items:
+            await client.request("answer", "POST", f"/sessions/{sid}/answers",
+                                 {"kind": kind, "key": item["key"], "value": rng.choice(ANSWERS)})
+    await client.request("result", "GET", f"/sessions/{sid}/result")
+    await client.request("delete", "DELETE", f"/sessions/{sid}")
+
+
+async def run(host, port, clients, sessions, seed):
+    latencies = {}
+    remaining = iter(range(sessions))
+
+    async def worker(n):
+        client = Client(host, port, latencies)
+        await client.connect()
+        rng = random.Random(seed + n)
+        try:
+            for _ in remaining:
+                await scenario(client, rng)
+        finally:
+            await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(clients)))
+    return time.perf_counter() - start, latencies
+
+
+def _pct(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))] * 1000
+
+
+def report(elapsed, latencies, sessions):
+    everything = sorted(x for values in latencies.values() for x in values)
+    print(f"{sessions} sessions, {len(everything)} requests in {elapsed:.2f} s"
+          f" → {len(everything) / elapsed:,.0f} req/s, {sessions / elapsed:,.1f} sessions/s")
+    print(f"{'endpoint':<12} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, values in list(latencies.items()) + [("all", everything)]:
+        values = sorted(values)
+        print(f"{name:<12} {len(values):>7} {statistics.median(values) * 1000:>8.2f}"
+              f" {_pct(values, 0.95):>8.2f} {_pct(values, 0.99):>8.2f} {values[-1] * 1000:>8.2f}")
+
+
+def _start_server(host):
+    import socket
+    with socket.socket() as s:
+        s.bind((host, 0))
+        port = s.getsockname()[1]
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "api.py"), "--host", host, "--port", str(port)],
+        stdout=subprocess.PIPE, text=True, cwd=ROOT,
+    )
+    proc.stdout.readline()    # "listening on …"
+    return proc, port
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for api.py.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="use a server already running here")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    proc, port = (None, args.port) if args.port else _start_server(args.host)
+    try:
+        elapsed, latencies = asyncio.run(run(args.host, port, args.clients, args.sessions, args.seed))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    report(elapsed, latencies, args.sessions)
+
+
+if __name__ == "__main__":
+    main()
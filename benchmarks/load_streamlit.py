@@ -0,0 +1,295 @@
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+from engine import ZODIAC
+
+# ---------------------------
+# Streamlit server load test
+# ---------------------------
+# Starts ``streamlit run app.py`` and lets N simulated users walk Steps 1–7
+# over the same websocket protocol the browser uses: each user picks a Mars
+# sign and a birth window (its width sets the slot count), lets the timeline
+# be calculated, answers every question with a think time in between, and
+# stops at the results page. Users arrive evenly over --ramp seconds.
+#
+# Reported: reruns/s and finished walks, p50/p95/p99 latency per step
+# (click → script finished, including the rerun chain a click triggers),
+# errors, and the server's CPU and RSS sampled every 0.5 s.
+#
+#   python benchmarks/load_streamlit.py [--users 200] [--ramp 60] [--think 2.0]
+#                                      [--hours 2-12] [--port 8599]
+#
+# websockets ships with Streamlit's server; psutil is used for CPU/RSS when
+# installed, else /proc (Linux).
+
+DONE = {
+    ForwardMsg.FINISHED_SUCCESSFULLY,
+    ForwardMsg.FINISHED_WITH_COMPILE_ERROR,
+    ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+}
+
+ANSWER_LABELS = {
+    "Yes": "Yes", "No": "No", "Not Sure": "Maybe",
+    "✅ Yes": "Yes", "❌ No": "No", "🤔 Not Sure": "Maybe",
+}
+ANSWER_WEIGHTS = {"Yes": 0.4, "No": 0.35, "Maybe": 0.25}
+
+# button that leaves each step → the step it leads to
+NEXT_STEP = {
+    "Next": 2,
+    "Calculate & Proceed": 3,
+    "Done — Go to Question Phase": 4,
+    "Continue to Hour-Lord × Asc Questions": 5,
+    "Continue to House Questions →": 6,
+    "Continue": 6,
+    "Next: Results": 7,
+}
+
+
+class AppError(Exception):
+    pass
+
+
+# ---------------------------
+# One browser tab
+# ---------------------------
+class Browser:
+    def __init__(self, url, latencies):
+        self.url = url
+        self.latencies = latencies
+        self.widgets = {}      # id -> (kind, label, fragment id)
+        self.values = {}       # id -> WidgetState kwargs the "user" has set
+        self.ws = None
+
+    async def open(self):
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+        await self.run("page load")
+
+    async def close(self):
+        await self.ws.close()
+
+    async def run(self, label, trigger=None, fragment_id=""):
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.fragment_id = fragment_id
+        for wid, value in self.values.items():
+            w = state.widget_states.widgets.add(id=wid)
+            setattr(w, *value)
+        if trigger is not None:
+            state.widget_states.widgets.add(id=trigger, trigger_value=True)
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        error = None
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "new_session" and not fwd.new_session.fragment_ids_this_run:
+                # a full script run starts (st.rerun chains start several)
+                self.widgets.clear()
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                etype = element.WhichOneof("type")
+                if etype == "exception":
+                    error = element.exception.message
+                proto = getattr(element, etype)
+                if getattr(proto, "id", ""):
+                    self.widgets[proto.id] = (etype, getattr(proto, "label", ""), fwd.delta.fragment_id)
+            elif kind == "script_finished" and fwd.script_finished in DONE:
+                break
+        self.latencies.setdefault(label, []).append(time.perf_counter() - start)
+        if error:
+            raise AppError(error)
+
+    def find(self, kind, label):
+        return next((wid for wid, (k, l, _) in self.widgets.items() if k == kind and l == label), None)
+
+    def set(self, kind, label, field, value):
+        wid = self.find(kind, label)
+        if wid is not None:
+            self.values[wid] = (field, value)
+
+    async def click(self, label, wid):
+        await self.run(label, trigger=wid, fragment_id=self.widgets[wid][2])
+
+
+# ---------------------------
+# One user walking the wizard
+# ---------------------------
+async def walk(url, latencies, rng, think, hours):
+    async def pause():
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * think)
+
+    tab = Browser(url, latencies)
+    await tab.open()
+    try:
+        step = 1
+        answered = set()
+        while step < 7:
+            await pause()
+            if step == 1:
+                tab.set("selectbox", "Select your Mars sign", "string_value", rng.choice(ZODIAC))
+            elif step == 2:
+                start = rng.randrange(24)
+                width = rng.randint(*hours)
+                tab.set("selectbox", "Time1 Hour", "string_value", str(start))
+                tab.set("selectbox", "Time2 Hour", "string_value", str((start + width) % 24))
+
+            # answer the next open question of this step, else move on
+            pending = {}
+            for wid, (kind, label, _) in tab.widgets.items():
+                question = wid.rsplit("-", 1)[-1].rsplit("_", 1)[0]
+                if kind == "button" and label in ANSWER_LABELS and (step, question) not in answered:
+                    pending.setdefault(question, {})[ANSWER_LABELS[label]] = wid
+            if pending:
+                question, choices = next(iter(pending.items()))
+                value = rng.choices(list(ANSWER_WEIGHTS), list(ANSWER_WEIGHTS.values()))[0]
+                await tab.click(f"step {step} answer", choices.get(value) or next(iter(choices.values())))
+                answered.add((step, question))
+                continue
+
+            label = next((l for l in NEXT_STEP if tab.find("button", l)), None)
+            if label is None:
+                raise AppError(f"stuck on step {step}: no way forward")
+            await tab.click(f"step {step} → {NEXT_STEP[label]}", tab.find("button", label))
+            step = NEXT_STEP[label]
+        await pause()
+        await tab.run("step 7 rerun")
+    finally:
+        await tab.close()
+
+
+# ---------------------------
+# Server + resource sampling
+# ---------------------------
+def start_server(port, env):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "app.py"),
+         "--server.headless", "true", "--server.port", str(port),
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as r:
+                if r.read() == b"ok":
+                    return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("Streamlit server did not come up")
+
+
+def _usage(pid):
+    """(cpu seconds, rss MB) of ``pid``."""
+    try:
+        import psutil
+        p = psutil.Process(pid)
+        t = p.cpu_times()
+        return t.user + t.system, p.memory_info().rss / 1e6
+    except ImportError:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        ticks = os.sysconf("SC_CLK_TCK")
+        with open(f"/proc/{pid}/statm") as f:
+            rss_pages = int(f.read().split()[1])
+        return (int(fields[11]) + int(fields[12])) / ticks, rss_pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+async def sample(pid, samples, interval=0.5):
+    last_cpu, last_t = _usage(pid)[0], time.perf_counter()
+    while True:
+        await asyncio.sleep(interval)
+        cpu, rss = _usage(pid)
+        now = time.perf_counter()
+        samples.append(((cpu - last_cpu) / (now - last_t) * 100, rss))
+        last_cpu, last_t = cpu, now
+
+
+# ---------------------------
+# Driver
+# ---------------------------
+async def load(url, pid, users, ramp, think, hours, seed):
+    latencies, errors, samples = {}, [], []
+    sampler = asyncio.create_task(sample(pid, samples))
+
+    async def user(n):
+        await asyncio.sleep(ramp * n / max(users, 1))
+        try:
+            await walk(url, latencies, random.Random(seed + n), think, hours)
+            return True
+        except (AppError, OSError, websockets.WebSocketException) as e:
+            errors.append(f"{type(e).__name__}: {e}")
+            return False
+
+    start = time.perf_counter()
+    finished = await asyncio.gather(*(user(n) for n in range(users)))
+    elapsed = time.perf_counter() - start
+    sampler.cancel()
+    return elapsed, sum(finished), latencies, errors, samples
+
+
+def _pct(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+
+def report(elapsed, finished, users, latencies, errors, samples):
+    reruns = sum(len(v) for v in latencies.values())
+    print(f"{finished}/{users} walks finished in {elapsed:.1f} s · {reruns} reruns"
+          f" → {reruns / elapsed:.1f} reruns/s, {finished / elapsed * 60:.1f} walks/min")
+    print(f"\n{'action':<16} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for label in sorted(latencies):
+        values = sorted(latencies[label])
+        print(f"{label:<16} {len(values):>6} {statistics.median(values) * 1000:>8.1f}"
+              f" {_pct(values, 0.95):>8.1f} {_pct(values, 0.99):>8.1f} {values[-1] * 1000:>8.1f}")
+    if samples:
+        cpu = [c for c, _ in samples]
+        rss = [r for _, r in samples]
+        print(f"\nserver CPU  mean {statistics.mean(cpu):.0f}%  peak {max(cpu):.0f}%"
+              f"   RSS  start {rss[0]:.0f} MB  peak {max(rss):.0f} MB  end {rss[-1]:.0f} MB")
+    if errors:
+        print(f"\n{len(errors)} errors, e.g.:")
+        for e in sorted(set(errors))[:5]:
+            print(f"  {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent users walking app.py on a real Streamlit server.")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--ramp", type=float, default=60.0, help="seconds over which users arrive")
+    parser.add_argument("--think", type=float, default=2.0, help="mean think time between clicks (s)")
+    parser.add_argument("--hours", default="2-12", help="birth window width range in hours (≈ slots)")
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    hours = tuple(int(h) for h in args.hours.split("-"))
+
+    env = dict(os.environ, BTF_SNAPSHOTS=os.environ.get("BTF_SNAPSHOTS", "0"))
+    proc = start_server(args.port, env)
+    try:
+        url = f"ws://127.0.0.1:{args.port}/_stcore/stream"
+        result = asyncio.run(load(url, proc.pid, args.users, args.ramp, args.think, hours, args.seed))
+    finally:
+        proc.terminate()
+        proc.wait()
+    report(*result[:2], args.users, *result[2:])
+
+
+if __name__ == "__main__":
+    main()
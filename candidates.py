@@ -0,0 +1,248 @@
+import numpy as np
+
+from engine import ZODIAC, HOUSES, HOUR_LORDS, Slot
+
+# ---------------------------
+# Bitmask candidate state (Steps 4–7)
+# ---------------------------
+# Once the hour-lord timeline is closed, every slot becomes one row of a
+# structured array. Sign and house sets are 12-bit masks (bit i = ZODIAC[i]
+# or house i+1), so eliminations, pair dedupe and Step 7 aggregation are a
+# few whole-array operations instead of nested list scans.
+
+SLOT_DTYPE = np.dtype([
+    ("start", "<i4"),       # minutes from midnight of the birth date
+    ("end", "<i4"),
+    ("hl", "i1"),           # index into HOUR_LORDS
+    ("asc_start", "i1"),    # index into ZODIAC
+    ("sat_start", "i1"),    # house - 1
+    ("chi_start", "i1"),
+    ("asc", "<u2"),         # 12-bit masks
+    ("sat", "<u2"),
+    ("chi", "<u2"),
+    ("alive", "?"),
+])
+
+ALL_SIGNS = 0xFFF
+BITS = np.arange(12, dtype=np.uint16)
+
+
+def to_mask(indices):
+    mask = 0
+    for i in indices:
+        mask |= 1 << i
+    return mask
+
+
+def mask_names(mask, names):
+    return [names[i] for i in range(12) if mask >> i & 1]
+
+
+def mask_indices(mask):
+    return [i for i in range(12) if mask >> i & 1]
+
+
+def mask_bits(masks):
+    """(n,) masks → (n, 12) 0/1 matrix."""
+    return (np.asarray(masks, dtype=np.uint16)[:, None] >> BITS) & 1
+
+
+def _rotate_right(masks, shift):
+    masks = masks.astype(np.int32)
+    shift = shift.astype(np.int32)
+    return ((masks >> shift) | (masks << (12 - shift))) & ALL_SIGNS
+
+
+def first_from(masks, start):
+    """First set bit at or after ``start`` walking forward (ASC order); -1 if empty."""
+    r = _rotate_right(masks, start)
+    low = r & -r
+    idx = np.where(low > 0, np.log2(np.maximum(low, 1)).astype(np.int32), -1)
+    return np.where(idx >= 0, (start + idx) % 12, -1)
+
+
+def _ordered(mask, start, step):
+    # range in timeline order: ASC walks forward through the zodiac,
+    # houses walk backward (1, 12, 11, …)
+    return bytearray(
+        (start + step * k) % 12 for k in range(12) if mask >> ((start + step * k) % 12) & 1
+    )
+
+
+class CandidateState:
+    def __init__(self, slots, timeline=None):
+        self.slots = slots
+        # optional per-minute ASC / houses from timeline.build_timeline
+        self.timeline = timeline
+
+    @classmethod
+    def from_hour_slots(cls, hour_slots, timeline=None):
+        slots = np.zeros(len(hour_slots), dtype=SLOT_DTYPE)
+        for i, s in enumerate(hour_slots):
+            end = s.end
+            if end is None:
+                end = hour_slots[i + 1].start if i + 1 < len(hour_slots) else s.start
+            slots[i] = (
+                s.start, end,
+                s.hl, s.asc_start, s.sat_start, s.chi_start,
+                to_mask(s.asc_range), to_mask(s.sat_range), to_mask(s.chi_range),
+                s.alive,
+            )
+        if timeline is not None:
+            timeline = {k: timeline[k] for k in ("minute", "asc", "sat", "chi")}
+        return cls(slots, timeline)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def copy(self):
+        return CandidateState(self.slots.copy(), self.timeline)
+
+    def to_dict(self):
+        """JSON-ready slot table as hex of the ``SLOT_DTYPE`` rows (the timeline is not included)."""
+        return {"slots": self.slots.tobytes().hex()}
+
+    @classmethod
+    def from_dict(cls, d, timeline=None):
+        slots = np.frombuffer(bytes.fromhex(d["slots"]), dtype=SLOT_DTYPE).copy()
+        return cls(slots, timeline)
+
+    # ---------------------------
+    # STEP 4 — ASC
+    # ---------------------------
+    def asc_mask(self):
+        alive = self.slots["alive"]
+        return int(np.bitwise_or.reduce(self.slots["asc"][alive])) if alive.any() else 0
+
+    def possible_ascs(self):
+        """ASC codes still possible, in the (alphabetical) order they are asked."""
+        return sorted(mask_indices(self.asc_mask()), key=ZODIAC.__getitem__)
+
+    def eliminate_ascs(self, asc_answers):
+        rejected = to_mask(a for a, ans in asc_answers.items() if ans == "No")
+        self.slots["asc"] &= np.uint16(~rejected & ALL_SIGNS)
+
+    # ---------------------------
+    # STEP 5 — Hour Lord × Asc
+    # ---------------------------
+    def hl_asc_questions(self):
+        """(slot_id, hl, first remaining asc) codes for alive slots that still have an ASC."""
+        first = first_from(self.slots["asc"], self.slots["asc_start"])
+        ids = np.nonzero(self.slots["alive"] & (first >= 0))[0]
+        return [(int(i), int(self.slots["hl"][i]), int(first[i])) for i in ids]
+
+    # ---------------------------
+    # STEP 6 — Saturn + Chiron pairs
+    # ---------------------------
+    def pair_codes(self):
+        return self.slots["sat_start"].astype(np.int16) * 12 + self.slots["chi_start"]
+
+    def unique_pairs(self):
+        """Distinct (sat_start, chi_start) house codes among alive slots, in timeline order."""
+        codes = self.pair_codes()[self.slots["alive"]]
+        uniq, first = np.unique(codes, return_index=True)
+        return [divmod(int(c), 12) for c in uniq[np.argsort(first)]]
+
+    def apply_pair_answers(self, pair_answers):
+        # apply NO = kill those slots
+        rejected = [s * 12 + c for (s, c), ans in pair_answers.items() if ans == "No"]
+        self.slots["alive"] &= ~np.isin(self.pair_codes(), rejected)
+
+    # ---------------------------
+    # STEP 7 — Aggregation
+    # ---------------------------
+    def summarize(self, pair_answers):
+        alive = self.slots[self.slots["alive"]]
+
+        accepted = np.zeros((12, 12), dtype=bool)
+        for (s, c), ans in pair_answers.items():
+            if ans in ("Yes", "Maybe"):
+                accepted[s, c] = True
+
+        # every (sat, chi) combination covered by some alive slot
+        covered = (mask_bits(alive["sat"]).T @ mask_bits(alive["chi"])) > 0
+        pairs = np.argwhere(covered & accepted)
+
+        asc = int(np.bitwise_or.reduce(alive["asc"])) if len(alive) else 0
+        return {
+            "alive_slots": self.to_hour_slots(alive_only=True),
+            "ascendants": sorted(mask_names(asc, ZODIAC)),
+            "hour_lords": sorted(HOUR_LORDS[h] for h in np.unique(alive["hl"])),
+            "pairs": [(HOUSES[s], HOUSES[c]) for s, c in pairs],
+        }
+
+    # ---------------------------
+    # Per-minute projection
+    # ---------------------------
+    def minute_view(self, posterior=None):
+        """Per-minute arrays over the window (one entry per minute, multi-day capable).
+
+        ``slot`` indexes ``self.slots``; ``asc`` / ``sat`` / ``chi`` come from
+        the computed timeline when there is one, otherwise from the slot
+        (first remaining ASC, start houses). A minute is alive when its slot
+        is alive and its ASC is still in the slot's mask. ``weight`` is the
+        alive flag as float, or with a (n_slots, 12) ``posterior`` (see
+        scoring.py) the probability spread over the minutes: per (slot, ASC)
+        cell when the timeline gives each minute's ASC, otherwise (and for
+        cells without a minute of their own) evenly over the slot. Dead
+        slots weigh 0, so the weights sum to the alive slots' probability.
+        """
+        slots = self.slots
+        minute = np.arange(slots["start"][0], slots["end"][-1] + 1, dtype=np.int32)
+        slot = np.searchsorted(slots["start"], minute, side="right") - 1
+
+        tl = self.timeline
+        per_minute = tl is not None and len(tl["minute"]) == len(minute) and tl["minute"][0] == minute[0]
+        if per_minute:
+            asc, sat, chi = tl["asc"], tl["sat"], tl["chi"]
+        else:
+            asc = first_from(slots["asc"], slots["asc_start"])[slot]
+            sat, chi = slots["sat_start"][slot], slots["chi_start"][slot]
+
+        has_asc = (asc >= 0) & ((slots["asc"][slot] >> np.maximum(asc, 0)) & 1 == 1)
+        alive = slots["alive"][slot] & has_asc
+        if posterior is None:
+            weight = alive.astype(np.float32)
+        else:
+            n = len(slots)
+            weight = np.zeros(len(minute))
+            if per_minute:
+                cell = slot * 12 + asc
+                minutes_per_cell = np.bincount(cell, minlength=posterior.size)
+                weight = posterior.ravel()[cell] / minutes_per_cell[cell]
+            # whatever no minute carried yet goes evenly over the slot
+            rest = posterior.sum(axis=1) - np.bincount(slot, weights=weight, minlength=n)
+            weight += (rest / np.maximum(np.bincount(slot, minlength=n), 1))[slot]
+            weight *= slots["alive"][slot]
+        return {
+            "minute": minute, "slot": slot, "hl": slots["hl"][slot],
+            "asc": asc, "sat": sat, "chi": chi,
+            "alive": alive, "weight": weight,
+        }
+
+    def to_hour_slots(self, alive_only=False):
+        return list(self.iter_hour_slots(alive_only))
+
+    def iter_hour_slots(self, alive_only=False):
+        for row in self.slots:
+            if alive_only and not row["alive"]:
+                continue
+            asc_start, sat_start, chi_start = int(row["asc_start"]), int(row["sat_start"]), int(row["chi_start"])
+            slot = Slot(int(row["hl"]), int(row["start"]), asc_start, sat_start, chi_start, end=int(row["end"]))
+            slot.asc_range = _ordered(int(row["asc"]), asc_start, 1)
+            slot.sat_range = _ordered(int(row["sat"]), sat_start, -1)
+            slot.chi_range = _ordered(int(row["chi"]), chi_start, -1)
+            slot.alive = bool(row["alive"])
+            yield slot
+
+
+def runs(view, fields=("slot", "asc", "alive")):
+    """(first, last) minute indices of stretches where ``fields`` stay constant."""
+    n = len(view["minute"])
+    change = np.zeros(n, dtype=bool)
+    change[0] = True
+    for f in fields:
+        change[1:] |= view[f][1:] != view[f][:-1]
+    first = np.nonzero(change)[0]
+    last = np.append(first[1:] - 1, n - 1)
+    return first, last
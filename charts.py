@@ -0,0 +1,80 @@
+import datetime
+
+from engine import ZODIAC, HOUSES, HOUR_LORDS, hhmm
+from candidates import runs
+
+# ---------------------------
+# Step 7 window chart (Vega-Lite)
+# ---------------------------
+# The per-minute candidate view is collapsed into runs of constant
+# (slot, ASC, alive) and drawn as one bar per run: x = time, y = hour lord,
+# colour = still possible or ruled out (or the run's probability when the
+# view carries posterior weights). A day's window is a few dozen bars.
+
+BASE = datetime.datetime(2000, 1, 1)
+
+COLORS = {"Possible": "#4CAF50", "Ruled out": "#DDDDDD"}
+
+
+def _iso(minute):
+    return (BASE + datetime.timedelta(minutes=int(minute))).isoformat()
+
+
+def window_records(view):
+    first, last = runs(view)
+    records = []
+    for a, b in zip(first, last):
+        start, end = view["minute"][a], view["minute"][b] + 1
+        asc = int(view["asc"][a])
+        records.append({
+            "start": _iso(start),
+            "end": _iso(end),
+            "time": f"{hhmm(start)}–{hhmm(end)}",
+            "hl": HOUR_LORDS[view["hl"][a]],
+            "asc": ZODIAC[asc] if asc >= 0 else "—",
+            "sat": HOUSES[view["sat"][a]],
+            "chi": HOUSES[view["chi"][a]],
+            "status": "Possible" if view["alive"][a] else "Ruled out",
+            "p": round(float(view["weight"][a:b + 1].sum()) * 100, 1),
+        })
+    return records
+
+
+def possible_ranges(view):
+    """``["HH:MM–HH:MM", …]`` for the stretches of minutes still alive."""
+    first, last = runs(view, ("alive",))
+    end_of_window = view["minute"][-1]
+    return [
+        f"{hhmm(view['minute'][a])}–{hhmm(min(view['minute'][b] + 1, end_of_window))}"
+        for a, b in zip(first, last) if view["alive"][a]
+    ]
+
+
+def window_chart(view, scored=False):
+    """Vega-Lite spec for ``st.vega_lite_chart``."""
+    if scored:
+        color = {"field": "p", "type": "quantitative", "title": "%", "scale": {"scheme": "greens"}}
+    else:
+        color = {
+            "field": "status", "type": "nominal", "title": None,
+            "scale": {"domain": list(COLORS), "range": list(COLORS.values())},
+        }
+    return {
+        "data": {"values": window_records(view)},
+        "mark": {"type": "bar", "cornerRadius": 2},
+        "encoding": {
+            "x": {"field": "start", "type": "temporal", "title": None, "axis": {"format": "%H:%M"}},
+            "x2": {"field": "end"},
+            "y": {"field": "hl", "type": "nominal", "title": "Hour Lord", "sort": HOUR_LORDS},
+            "color": color,
+            "tooltip": [
+                {"field": "time", "title": "Time"},
+                {"field": "hl", "title": "Hour Lord"},
+                {"field": "asc", "title": "ASC"},
+                {"field": "sat", "title": "Saturn House"},
+                {"field": "chi", "title": "Chiron House"},
+                {"field": "p", "title": "Probability (%)"} if scored else {"field": "status", "title": "Status"},
+            ],
+        },
+        "height": {"step": 28},
+    }
@@ -0,0 +1,229 @@
+import argparse
+import datetime
+import functools
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+
+from engine import ZODIAC, HOUSES, HOUR_LORDS, Slot
+from candidates import CandidateState
+from adaptive import next_question as live_next_question, apply_answer
+
+# ---------------------------
+# Precomputed adaptive question trees
+# ---------------------------
+# The adaptive flow depends only on the slot configuration (hour lord, ASC
+# mask, Saturn/Chiron start houses per slot) and the answers so far; Mars
+# only changes the question text. Yes and Not Sure leave the candidates
+# unchanged, so every node has two children: "No" and "other".
+#
+# All trees live in one .npz file:
+#   keys    configuration fingerprints (S16)
+#   roots   root node index per key
+#   code    question code per node (STOP = resolved, UNKNOWN = not precomputed)
+#   no      child index after "No"
+#   other   child index after "Yes" / "Not Sure"
+#
+# Runtime lookups are O(1) per answer; a missing configuration or a node
+# below the precomputed depth falls back to live computation.
+#
+# Build:  python decision_trees.py configs.jsonl [--depth 10]
+#         python decision_trees.py --lat 37.57 --lon 126.98 --tz 9 \
+#             --sat-lon 330 --chi-lon 15 --start 2024-01-01 --days 365
+
+STOP = -1
+UNKNOWN = -2
+
+TREES_PATH = os.environ.get(
+    "BTF_DECISION_TREES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "decision_trees.npz"),
+)
+
+
+# ---------------------------
+# Question codes
+# ---------------------------
+def encode_question(q):
+    kind = q[0]
+    if kind == "asc":
+        return ZODIAC.index(q[1])
+    if kind == "hl_asc":
+        return 12 + HOUR_LORDS.index(q[1]) * 12 + ZODIAC.index(q[2])
+    if kind == "pair":
+        return 96 + HOUSES.index(q[1]) * 12 + HOUSES.index(q[2])
+    raise ValueError(f"Unknown question kind: {kind}")
+
+
+def decode_question(code):
+    code = int(code)
+    if code < 12:
+        return ("asc", ZODIAC[code])
+    if code < 96:
+        hl, a = divmod(code - 12, 12)
+        return ("hl_asc", HOUR_LORDS[hl], ZODIAC[a])
+    s, c = divmod(code - 96, 12)
+    return ("pair", HOUSES[s], HOUSES[c])
+
+
+def fingerprint(candidates):
+    slots = candidates.slots
+    h = hashlib.blake2b(digest_size=8)
+    for field in ("hl", "asc", "sat_start", "chi_start", "alive"):
+        h.update(np.ascontiguousarray(slots[field]).tobytes())
+    return h.hexdigest().encode()
+
+
+# ---------------------------
+# Build step
+# ---------------------------
+def build_tree(candidates, max_depth):
+    """Flat node list [(code, no, other)] for one configuration, root at 0."""
+    nodes = []
+
+    def grow(state, asked, depth):
+        idx = len(nodes)
+        nodes.append([UNKNOWN, -1, -1])
+        if depth >= max_depth:
+            return idx
+        q = live_next_question(state, asked)
+        if q is None:
+            nodes[idx][0] = STOP
+            return idx
+        rejected = CandidateState(state.slots.copy())
+        apply_answer(rejected, q, "No")
+        nodes[idx][0] = encode_question(q)
+        nodes[idx][1] = grow(rejected, asked + (q,), depth + 1)
+        nodes[idx][2] = grow(state, asked + (q,), depth + 1)
+        return idx
+
+    grow(CandidateState(candidates.slots.copy()), (), 0)
+    return nodes
+
+
+def build_store(configurations, max_depth=10, path=TREES_PATH):
+    keys, roots, nodes = [], [], []
+    seen = set()
+    for candidates in configurations:
+        key = fingerprint(candidates)
+        if key in seen:
+            continue
+        seen.add(key)
+        base = len(nodes)
+        for code, no, other in build_tree(candidates, max_depth):
+            nodes.append((code, no + base if no >= 0 else -1, other + base if other >= 0 else -1))
+        keys.append(key)
+        roots.append(base)
+
+    order = np.argsort(np.array(keys, dtype="S16"))
+    table = np.array(nodes, dtype=np.int32).reshape(-1, 3)
+    # through a file handle: np.savez would append ".npz" to a bare path
+    with open(path, "wb") as f:
+        np.savez(
+            f,
+            keys=np.array(keys, dtype="S16")[order],
+            roots=np.array(roots, dtype=np.int32)[order],
+            code=table[:, 0].astype(np.int16),
+            no=table[:, 1],
+            other=table[:, 2],
+        )
+    return len(keys), len(nodes)
+
+
+# ---------------------------
+# Runtime lookup
+# ---------------------------
+@functools.lru_cache(maxsize=None)
+def load_store(path=TREES_PATH):
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def root(candidates, path=TREES_PATH):
+    """Root node for this configuration, or ``None`` on a cache miss."""
+    store = load_store(path)
+    if store is None or not len(store["keys"]):
+        return None
+    key = fingerprint(candidates)
+    i = int(np.searchsorted(store["keys"], key))
+    if i < len(store["keys"]) and store["keys"][i] == key:
+        return int(store["roots"][i])
+    return None
+
+
+def next_question(candidates, asked, node, path=TREES_PATH):
+    """Tree lookup at ``node``; live computation when the tree has no answer."""
+    store = load_store(path)
+    if node is not None and store is not None:
+        code = int(store["code"][node])
+        if code == STOP:
+            return None
+        if code != UNKNOWN:
+            return decode_question(code)
+    return live_next_question(candidates, asked)
+
+
+def advance(node, value, path=TREES_PATH):
+    if node is None:
+        return None
+    store = load_store(path)
+    if store is None or store["code"][node] < 0:
+        return None
+    child = int(store["no"][node] if value == "No" else store["other"][node])
+    return child if child >= 0 else None
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+def _configs_from_jsonl(lines):
+    for line in lines:
+        line = line.strip()
+        if line:
+            hour_slots = [Slot.from_dict(d) for d in json.loads(line)["hour_slots"]]
+            yield CandidateState.from_hour_slots(hour_slots)
+
+
+def _configs_from_timeline(args):
+    from timeline import build_hour_slots
+    day = datetime.date.fromisoformat(args.start)
+    for i in range(args.days):
+        hour_slots, _ = build_hour_slots(
+            day + datetime.timedelta(days=i), args.lat, args.lon,
+            datetime.time(0, 0), datetime.time(23, 59),
+            args.sat_lon, args.chi_lon, args.tz,
+        )
+        yield CandidateState.from_hour_slots(hour_slots)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute adaptive question trees.")
+    parser.add_argument("configs", nargs="?", help="JSONL with one {'hour_slots': [...]} per line")
+    parser.add_argument("--depth", type=int, default=10)
+    parser.add_argument("--out", default=TREES_PATH)
+    parser.add_argument("--lat", type=float)
+    parser.add_argument("--lon", type=float)
+    parser.add_argument("--tz", type=float, default=0.0)
+    parser.add_argument("--sat-lon", type=float, default=0.0)
+    parser.add_argument("--chi-lon", type=float, default=0.0)
+    parser.add_argument("--start", default="2000-01-01")
+    parser.add_argument("--days", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.lat is not None and args.lon is not None:
+        configs = _configs_from_timeline(args)
+    elif args.configs:
+        configs = _configs_from_jsonl(open(args.configs, encoding="utf-8"))
+    else:
+        configs = _configs_from_jsonl(sys.stdin)
+
+    trees, nodes = build_store(configs, args.depth, args.out)
+    print(f"{args.out}: {trees} trees, {nodes} nodes, {os.path.getsize(args.out)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+import bisect
+import datetime
+
+# ---------------------------
+# Headless narrowing engine (no Streamlit dependency)
+# ---------------------------
+# All slot / answer logic used by app.py lives here so it can be replayed
+# outside the wizard (batch jobs, process pools, other front-ends).
+
+ZODIAC = [
+    "Aries","Taurus","Gemini","Cancer","Leo","Virgo",
+    "Libra","Scorpio","Sagittarius","Capricorn","Aquarius","Pisces"
+]
+
+HOUSES = [str(i) for i in range(1, 13)]
+
+# house systems for computed timelines (houses.py) → display label
+HOUSE_SYSTEMS = {"whole": "Whole Sign", "equal": "Equal", "porphyry": "Porphyry"}
+
+# Chaldean order
+HOUR_LORDS = ["Saturn","Jupiter","Mars","Sun","Venus","Mercury","Moon"]
+
+ANSWERS = ("Yes", "No", "Maybe")
+
+
+def hl_asc_key(slot_id, asc):
+    return f"HLASC_{slot_id}_{asc}"
+
+
+def pair_key(sat, chi):
+    return f"pair_{sat}_{chi}"
+
+
+def to_minute(t):
+    return t.hour * 60 + t.minute
+
+
+def hhmm(minute):
+    minute %= 1440
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+# ---------------------------
+# Compact slot
+# ---------------------------
+class Slot:
+    """One hour-lord slot, stored as small-int codes.
+
+    ``hl`` indexes HOUR_LORDS, signs index ZODIAC, houses are 0-based
+    (0 = house "1"), times are minutes after midnight of the birth date
+    (past 1440 on later days) and ``end`` is ``None`` while the slot is
+    still open ("??:??"). Ranges are bytearrays
+    of codes in timeline order.
+    """
+
+    __slots__ = (
+        "hl", "start", "end",
+        "asc_start", "sat_start", "chi_start",
+        "asc_range", "sat_range", "chi_range",
+        "alive",
+    )
+
+    def __init__(self, hl, start, asc, sat, chi, end=None):
+        self.hl = hl
+        self.start = start
+        self.end = end
+
+        self.asc_start = asc
+        self.sat_start = sat
+        self.chi_start = chi
+
+        self.asc_range = bytearray((asc,))
+        self.sat_range = bytearray((sat,))
+        self.chi_range = bytearray((chi,))
+
+        self.alive = True
+
+    def extend(self, asc, sat, chi):
+        if asc not in self.asc_range:
+            self.asc_range.append(asc)
+        if sat not in self.sat_range:
+            self.sat_range.append(sat)
+        if chi not in self.chi_range:
+            self.chi_range.append(chi)
+
+    def __getstate__(self):
+        # flat tuple: much smaller snapshots than the default {slot: value} state
+        return (
+            self.hl, self.start, self.end,
+            self.asc_start, self.sat_start, self.chi_start,
+            bytes(self.asc_range), bytes(self.sat_range), bytes(self.chi_range),
+            self.alive,
+        )
+
+    def __setstate__(self, state):
+        (self.hl, self.start, self.end,
+         self.asc_start, self.sat_start, self.chi_start,
+         asc_range, sat_range, chi_range,
+         self.alive) = state
+        self.asc_range = bytearray(asc_range)
+        self.sat_range = bytearray(sat_range)
+        self.chi_range = bytearray(chi_range)
+
+    @property
+    def start_time(self):
+        return datetime.time(self.start % 1440 // 60, self.start % 60)
+
+    def end_label(self):
+        return "??:??" if self.end is None else hhmm(self.end)
+
+    def to_dict(self):
+        """Display / export form with names and "HH:MM" strings."""
+        return {
+            "hl": HOUR_LORDS[self.hl],
+            "start_time": self.start_time,
+            "end_time": self.end_label(),
+
+            "asc_start": ZODIAC[self.asc_start],
+            "sat_start": HOUSES[self.sat_start],
+            "chi_start": HOUSES[self.chi_start],
+
+            "asc_range": [ZODIAC[a] for a in self.asc_range],
+            "sat_range": [HOUSES[h] for h in self.sat_range],
+            "chi_range": [HOUSES[h] for h in self.chi_range],
+
+            "alive": self.alive
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        start = d["start_time"]
+        start = to_minute(start) if isinstance(start, datetime.time) else _parse_hhmm(start)
+        end = d.get("end_time")
+        end = to_minute(end) if isinstance(end, datetime.time) else _parse_hhmm(end)
+        slot = cls(
+            HOUR_LORDS.index(d["hl"]), start,
+            ZODIAC.index(d["asc_start"]), HOUSES.index(d["sat_start"]), HOUSES.index(d["chi_start"]),
+            end=end,
+        )
+        slot.asc_range = bytearray(ZODIAC.index(a) for a in d["asc_range"])
+        slot.sat_range = bytearray(HOUSES.index(h) for h in d["sat_range"])
+        slot.chi_range = bytearray(HOUSES.index(h) for h in d["chi_range"])
+        slot.alive = d.get("alive", True)
+        return slot
+
+
+def _parse_hhmm(value):
+    if isinstance(value, str) and value[:1].isdigit():
+        h, m = value.split(":")
+        return int(h) * 60 + int(m)
+    return None
+
+
+def new_slot(hl, start_time, asc, sat, chi):
+    return Slot(
+        HOUR_LORDS.index(hl), to_minute(start_time),
+        ZODIAC.index(asc), HOUSES.index(sat), HOUSES.index(chi),
+    )
+
+
+# ---------------------------
+# STEP 3 — Hour Lord timeline (interval index)
+# ---------------------------
+class SlotIndex:
+    """Hour-lord slots of one birth window, kept sorted by start minute.
+
+    The window runs from ``start`` to ``end`` in minutes after midnight of
+    the birth date; ``end`` may pass 1440 (midnight crossing) or span several
+    days. A ``datetime.time`` maps to its first occurrence inside the window,
+    an int is taken as a window minute as-is. Slot i covers
+    [slots[i].start, slots[i + 1].start); the first slot is anchored at the
+    window start, the last one runs to the window end.
+
+    Transitions can be inserted and removed at any position: the slot is
+    found by bisection and only the neighbours' ``end`` and ranges change.
+    Iteration / indexing / ``len`` behave like the plain list it replaces.
+    """
+
+    __slots__ = ("start", "end", "slots", "starts")
+
+    def __init__(self, time1, time2, slots=()):
+        self.start = time1 if isinstance(time1, int) else to_minute(time1)
+        self.end = self.minute(time2)
+        self.slots = []
+        self.starts = []
+        # slots arriving with their own ranges (e.g. a computed timeline) keep them
+        for slot in slots:
+            i = bisect.bisect_left(self.starts, slot.start)
+            self.starts.insert(i, slot.start)
+            self.slots.insert(i, slot)
+        if self.slots:
+            self.slots[-1].end = self.end
+
+    def minute(self, t):
+        if isinstance(t, int):
+            return t
+        return self.start + (to_minute(t) - self.start) % 1440
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __iter__(self):
+        return iter(self.slots)
+
+    def __getitem__(self, i):
+        return self.slots[i]
+
+    def find(self, minute):
+        """Position of the slot covering ``minute`` (or time), ``None`` outside the window."""
+        minute = self.minute(minute)
+        if not self.slots or not self.start <= minute <= self.end:
+            return None
+        return bisect.bisect_right(self.starts, minute) - 1
+
+    def _link(self, i):
+        # slot i ends where slot i + 1 starts and its ranges reach that start
+        slot = self.slots[i]
+        slot.asc_range = bytearray((slot.asc_start,))
+        slot.sat_range = bytearray((slot.sat_start,))
+        slot.chi_range = bytearray((slot.chi_start,))
+        if i + 1 < len(self.slots):
+            nxt = self.slots[i + 1]
+            slot.end = nxt.start
+            slot.extend(nxt.asc_start, nxt.sat_start, nxt.chi_start)
+        else:
+            slot.end = self.end
+
+    def insert(self, slot):
+        if not self.slots:
+            if slot.start != self.start:
+                raise ValueError("The first HL must start at Time1.")
+            i = 0
+        else:
+            if not self.start < slot.start <= self.end:
+                raise ValueError("New HL must be AFTER Time1 and not after Time2.")
+            i = bisect.bisect_left(self.starts, slot.start)
+            if i < len(self.starts) and self.starts[i] == slot.start:
+                raise ValueError(f"There is already a transition at {hhmm(slot.start)}.")
+        self.starts.insert(i, slot.start)
+        self.slots.insert(i, slot)
+        self._link(i)
+        if i > 0:
+            self._link(i - 1)
+        return i
+
+    def remove(self, i):
+        """Delete the transition at position ``i`` (not the Time1 slot)."""
+        if i < 0:
+            i += len(self.slots)
+        if not 0 < i < len(self.slots):
+            raise ValueError("The Time1 slot cannot be removed.")
+        del self.starts[i]
+        slot = self.slots.pop(i)
+        self._link(i - 1)
+        return slot
+
+    def to_dict(self):
+        """JSON-ready form: window minutes and one row of codes per slot (ranges as hex)."""
+        return {
+            "start": self.start,
+            "end": self.end,
+            "slots": [
+                [s.hl, s.start, s.end, s.asc_start, s.sat_start, s.chi_start,
+                 s.asc_range.hex(), s.sat_range.hex(), s.chi_range.hex(), s.alive]
+                for s in self.slots
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        slots = []
+        for hl, start, end, asc, sat, chi, asc_range, sat_range, chi_range, alive in d["slots"]:
+            slot = Slot(hl, start, asc, sat, chi, end=end)
+            slot.asc_range = bytearray.fromhex(asc_range)
+            slot.sat_range = bytearray.fromhex(sat_range)
+            slot.chi_range = bytearray.fromhex(chi_range)
+            slot.alive = bool(alive)
+            slots.append(slot)
+        return cls(d["start"], d["end"], slots)
+
+
+def add_transition(hour_slots, next_time, hl, asc, sat, chi):
+    slot = Slot(
+        HOUR_LORDS.index(hl), hour_slots.minute(next_time),
+        ZODIAC.index(asc), HOUSES.index(sat), HOUSES.index(chi),
+    )
+    # ✅ neighbours' end time and ranges follow automatically
+    hour_slots.insert(slot)
+    return slot
+
+
+def undo_transition(hour_slots, i=-1):
+    return hour_slots.remove(i)
+
+
+# ---------------------------
+# Answer tables
+# ---------------------------
+# asc_answers     {asc code: answer or None}
+# hl_asc_answers  {(slot_id, asc code): answer}
+# pair_answers    {(sat house code, chi house code): answer}
+
+
+# ---------------------------
+# Session object
+# ---------------------------
+class BirthWindowSession:
+    """Whole wizard flow (Steps 2–7) as a plain Python object.
+
+    Usage mirrors app.py: ``start`` (Step 2), ``add_transition`` / ``remove``
+    (Step 3), ``answer`` for the three question kinds, then ``result``.
+    Questions and results run on the bitmask ``CandidateState``.
+
+    Answers can be revised at any time, so eliminations are never applied to
+    ``candidates`` itself: every ``questions`` / ``result`` call narrows a
+    fresh copy with the current answers (see ``narrowed``).
+    """
+
+    def __init__(self, mars, time1=datetime.time(0, 0), time2=datetime.time(23, 59)):
+        self.mars = mars
+        self.time1 = time1
+        self.time2 = time2
+        self.hour_slots = []
+        self.final_end = None
+        self.candidates = None
+        self.asc_answers = {}
+        self.hl_asc_answers = {}
+        self.pair_answers = {}
+
+    def start(self, hl, asc, sat, chi, end_asc, end_sat, end_chi):
+        self.final_end = {"asc": end_asc, "sat": end_sat, "chi": end_chi}
+        self.hour_slots = SlotIndex(self.time1, self.time2, [new_slot(hl, self.time1, asc, sat, chi)])
+        self.candidates = None
+        self.hl_asc_answers = {}
+        return self
+
+    def add_transition(self, next_time, hl, asc, sat, chi):
+        slot = add_transition(self.hour_slots, next_time, hl, asc, sat, chi)
+        self.candidates = None
+        self._renumber(self.hour_slots.find(slot.start), 1)
+        return slot
+
+    def remove(self, i):
+        if i < 0:
+            i += len(self.hour_slots)
+        slot = undo_transition(self.hour_slots, i)
+        self.candidates = None
+        self._renumber(i, -1)
+        return slot
+
+    def _renumber(self, i, shift):
+        # hl_asc answers are keyed by slot position: follow an insert (+1) or
+        # removal (-1) at position i; answers for a removed slot are dropped
+        answers = {}
+        for (slot_id, asc), value in self.hl_asc_answers.items():
+            if slot_id >= i:
+                if shift < 0 and slot_id == i:
+                    continue
+                slot_id += shift
+            answers[(slot_id, asc)] = value
+        self.hl_asc_answers = answers
+
+    def undo(self):
+        if len(self.hour_slots) > 1:
+            self.remove(-1)
+
+    def close(self):
+        """Finish Step 3 and build the candidate state (idempotent, never narrowed)."""
+        if self.candidates is None:
+            from candidates import CandidateState
+            self.candidates = CandidateState.from_hour_slots(self.hour_slots)
+        return self.candidates
+
+    def narrowed(self, pairs=True):
+        """Copy of the candidate state with the current ASC (and pair) answers applied."""
+        candidates = self.close().copy()
+        candidates.eliminate_ascs(self.asc_answers)
+        if pairs:
+            candidates.apply_pair_answers(self.pair_answers)
+        return candidates
+
+    def questions(self, kind):
+        """Pending question keys for ``kind`` ("asc", "hl_asc" or "pair")."""
+        if kind == "asc":
+            return [ZODIAC[a] for a in self.close().possible_ascs()]
+        candidates = self.narrowed(pairs=False)
+        if kind == "hl_asc":
+            return [(slot_id, ZODIAC[asc]) for slot_id, _, asc in candidates.hl_asc_questions()]
+        if kind == "pair":
+            return [(HOUSES[sat], HOUSES[chi]) for sat, chi in candidates.unique_pairs()]
+        raise ValueError(f"Unknown question kind: {kind}")
+
+    def answer(self, kind, key, value):
+        """Record an answer; ``key`` uses names as returned by ``questions``."""
+        if value not in ANSWERS:
+            raise ValueError(f"Unknown answer: {value}")
+        if kind == "asc":
+            self.asc_answers[ZODIAC.index(key)] = value
+        elif kind == "hl_asc":
+            slot_id, asc = key
+            self.hl_asc_answers[(slot_id, ZODIAC.index(asc))] = value
+        elif kind == "pair":
+            sat, chi = key
+            self.pair_answers[(HOUSES.index(sat), HOUSES.index(chi))] = value
+        else:
+            raise ValueError(f"Unknown question kind: {kind}")
+
+    def result(self):
+        result = self.narrowed().summarize(self.pair_answers)
+        result["alive_slots"] = [slot.to_dict() for slot in result["alive_slots"]]
+        return result
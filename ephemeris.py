@@ -0,0 +1,102 @@
+import datetime
+import functools
+import os
+import sys
+
+import numpy as np
+
+from astro import julian_day, planet_longitude, sun_position
+
+# ---------------------------
+# Offline ephemeris (memory-mapped)
+# ---------------------------
+# Geocentric ecliptic longitudes of date for the bodies the wizard needs,
+# sampled daily at 0h UT and stored as one float32 array:
+#
+#   file     .npy float32 (days, 4), columns = BODIES, degrees in [0, 360)
+#            row 0 = 0h UT of START − PAD days
+#
+# The file (~1.2 MB for 1900–2100) is opened with mmap_mode="r", so every
+# Streamlit worker on the host shares the same page-cache pages. Lookups
+# take arrays of Julian days and interpolate with a 4-point Lagrange cubic
+# on the unwrapped longitudes; the benchmark reports the error against the
+# direct formulas (well under 0.01° for all four bodies).
+#
+# Build:  python ephemeris.py   (also built automatically when missing)
+
+BODIES = ("Sun", "Mars", "Saturn", "Chiron")
+
+START = datetime.date(1900, 1, 1)
+END = datetime.date(2101, 1, 1)
+PAD = 2    # extra days on both ends for the cubic stencil
+
+EPHEMERIS_PATH = os.environ.get(
+    "BTF_EPHEMERIS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "ephemeris.npy"),
+)
+
+JD0 = julian_day(START) - PAD
+
+
+# ---------------------------
+# Build step
+# ---------------------------
+def compute_longitudes(jd, body):
+    """Direct (uncached) longitude in degrees — the reference for the file."""
+    if body == "Sun":
+        return sun_position(jd)[0]
+    return planet_longitude(jd, body)
+
+
+def build(path=EPHEMERIS_PATH):
+    days = (END - START).days + 1 + 2 * PAD
+    jd = JD0 + np.arange(days, dtype=np.float64)
+    table = np.stack([compute_longitudes(jd, body) for body in BODIES], axis=1).astype(np.float32)
+    tmp = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(tmp, table)
+    os.replace(tmp, path)
+    return path
+
+
+@functools.lru_cache(maxsize=None)
+def get_table():
+    if not os.path.exists(EPHEMERIS_PATH):
+        build(EPHEMERIS_PATH)
+    return np.load(EPHEMERIS_PATH, mmap_mode="r")
+
+
+# ---------------------------
+# Lookup
+# ---------------------------
+def longitudes(jd, bodies=BODIES):
+    """``(len(jd), len(bodies))`` longitudes (deg) for an array of Julian days."""
+    table = get_table()
+    cols = [BODIES.index(body) for body in bodies]
+    x = np.atleast_1d(np.asarray(jd, dtype=np.float64)) - JD0
+    i = np.floor(x).astype(np.intp)
+    if i.size and (i.min() < 1 or i.max() > len(table) - 3):
+        raise ValueError(f"Ephemeris covers {START.year}–{END.year - 1} only.")
+    f = (x - i)[:, None]
+
+    p = table[i[:, None] + np.arange(-1, 3), :][:, :, cols].astype(np.float64)
+    # unwrap the stencil around its second point (bodies move < 2° a day)
+    p = p[:, 1:2] + np.mod(p - p[:, 1:2] + 180.0, 360.0) - 180.0
+    # Lagrange weights for nodes −1, 0, 1, 2
+    w = np.stack([
+        -f * (f - 1) * (f - 2) / 6,
+        (f + 1) * (f - 1) * (f - 2) / 2,
+        -(f + 1) * f * (f - 2) / 2,
+        (f + 1) * f * (f - 1) / 6,
+    ], axis=1)
+    return np.mod((w * p).sum(axis=1), 360.0)
+
+
+def longitude(body, jd):
+    """Longitude (deg) of one body; same shape as ``jd``."""
+    out = longitudes(jd, (body,))[:, 0]
+    return out if np.ndim(jd) else float(out[0])
+
+
+if __name__ == "__main__":
+    out = build(sys.argv[1] if len(sys.argv) > 1 else EPHEMERIS_PATH)
+    print(f"{out}: {os.path.getsize(out)} bytes")
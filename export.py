@@ -0,0 +1,148 @@
+import argparse
+import csv
+import importlib.util
+import io
+import json
+import sys
+
+# ---------------------------
+# Result export (CSV / JSONL / Parquet)
+# ---------------------------
+# Rows are streamed straight from the slot structure into a binary file
+# object, one row (or one Parquet row group) at a time, so nothing is built
+# until a download is requested and many sessions can be exported in one
+# pass. Parquet needs ``pyarrow`` (in requirements.txt); without it the
+# format is simply not offered.
+#
+#   python export.py --format jsonl --out sessions.jsonl   # every stored snapshot
+
+COLUMNS = (
+    "start_time", "end_time", "Hour Lord",
+    "Ascendant Range", "Saturn House Range", "Chiron House Range", "Alive",
+)
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+PARQUET_ROW_GROUP = 10_000
+
+
+def available_formats():
+    return [fmt for fmt in FORMATS if fmt != "parquet" or importlib.util.find_spec("pyarrow")]
+
+
+# ---------------------------
+# Rows
+# ---------------------------
+def _slots(source):
+    # CandidateState (Steps 4–7) or a plain hour_slots list (Steps 2–3)
+    return source.iter_hour_slots() if hasattr(source, "iter_hour_slots") else iter(source)
+
+
+def slot_rows(source):
+    for slot in _slots(source):
+        slot = slot.to_dict()
+        yield (
+            slot["start_time"].strftime("%H:%M"),
+            slot["end_time"],
+            slot["hl"],
+            ", ".join(slot["asc_range"]),
+            ", ".join(slot["sat_range"]),
+            ", ".join(slot["chi_range"]),
+            slot["alive"],
+        )
+
+
+def session_rows(sessions):
+    """Rows of many ``(session_id, slots)`` pairs, with the id as first column."""
+    for session_id, source in sessions:
+        for row in slot_rows(source):
+            yield (session_id,) + row
+
+
+# ---------------------------
+# Writers
+# ---------------------------
+def _write_csv(rows, columns, out):
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=True)
+    writer = csv.writer(text, lineterminator="\n")
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(row)
+    text.detach()
+
+
+def _write_jsonl(rows, columns, out):
+    for row in rows:
+        out.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False).encode("utf-8"))
+        out.write(b"\n")
+
+
+def _write_parquet(rows, columns, out):
+    if not importlib.util.find_spec("pyarrow"):
+        raise ValueError("Parquet export needs the pyarrow package.")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(c, pa.bool_() if c == "Alive" else pa.string()) for c in columns])
+    with pq.ParquetWriter(out, schema) as writer:
+        batch, written = [], False
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= PARQUET_ROW_GROUP:
+                writer.write_table(pa.Table.from_pylist([dict(zip(columns, r)) for r in batch], schema))
+                batch, written = [], True
+        if batch or not written:
+            writer.write_table(pa.Table.from_pylist([dict(zip(columns, r)) for r in batch], schema))
+
+
+WRITERS = {"csv": _write_csv, "jsonl": _write_jsonl, "parquet": _write_parquet}
+
+
+def write(rows, fmt, out, columns=COLUMNS):
+    """Stream ``rows`` into the binary file object ``out``."""
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    WRITERS[fmt](rows, columns, out)
+
+
+def export_bytes(source, fmt):
+    """One session's file contents (called only when the download is clicked)."""
+    out = io.BytesIO()
+    write(slot_rows(source), fmt, out)
+    return out.getvalue()
+
+
+def export_sessions(sessions, fmt, out):
+    write(session_rows(sessions), fmt, out, ("session",) + COLUMNS)
+
+
+# ---------------------------
+# CLI — all stored session snapshots
+# ---------------------------
+def _stored_sessions():
+    import snapshots
+    for token, state in snapshots.iter_snapshots():
+        source = state.get("candidates") or state.get("hour_slots")
+        if source:
+            yield token, source
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export stored sessions.")
+    parser.add_argument("--format", choices=list(FORMATS), default="csv")
+    parser.add_argument("--out", help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.out:
+        with open(args.out, "wb") as out:
+            export_sessions(_stored_sessions(), args.format, out)
+    else:
+        export_sessions(_stored_sessions(), args.format, sys.stdout.buffer)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import numpy as np
+
+from astro import sign_index
+
+# ---------------------------
+# Saturn / Chiron houses per minute
+# ---------------------------
+# One call gives the house of a planet for every minute of the window.
+# Planet longitudes may be a scalar (Saturn and Chiron move < 0.1° a day)
+# or one value per minute. Houses are 0-based codes (0 = house "1").
+#
+#   whole     whole-sign: the ASC sign is house 1 (only needs the ASC sign)
+#   equal     30° houses measured from the ASC degree
+#   porphyry  each quadrant between ASC / IC / DSC / MC split in three
+
+
+def whole_sign(planet_lon, asc_sign):
+    return ((sign_index(np.asarray(planet_lon)) - asc_sign) % 12).astype(np.int8)
+
+
+def equal(planet_lon, asc_lon):
+    rel = np.mod(np.asarray(planet_lon) - asc_lon, 360.0)
+    return np.minimum(rel // 30.0, 11).astype(np.int8)
+
+
+def porphyry_cusps(asc_lon, mc_lon):
+    """(n, 12) cusps relative to the ASC (deg), cusp 1 = 0."""
+    asc_lon, mc_lon = np.broadcast_arrays(np.atleast_1d(asc_lon), np.atleast_1d(mc_lon))
+    ic = np.mod(mc_lon + 180.0 - asc_lon, 360.0)    # ASC → IC, 3 houses
+    thirds = np.arange(3) / 3.0
+    return np.concatenate([
+        thirds * ic[:, None],
+        ic[:, None] + thirds * (180.0 - ic)[:, None],
+        180.0 + thirds * ic[:, None],
+        180.0 + ic[:, None] + thirds * (180.0 - ic)[:, None],
+    ], axis=1)
+
+
+def porphyry(planet_lon, asc_lon, mc_lon):
+    cusps = porphyry_cusps(asc_lon, mc_lon)
+    rel = np.mod(np.asarray(planet_lon) - asc_lon, 360.0)
+    return ((cusps <= np.atleast_1d(rel)[:, None]).sum(axis=1) - 1).astype(np.int8)
+
+
+def house_codes(planet_lon, system, asc_sign=None, asc_lon=None, mc_lon=None):
+    """House code of ``planet_lon`` for every minute."""
+    if system == "whole":
+        return whole_sign(planet_lon, asc_sign)
+    if system == "equal":
+        return equal(planet_lon, asc_lon)
+    if system == "porphyry":
+        return porphyry(planet_lon, asc_lon, mc_lon)
+    raise ValueError(f"Unknown house system: {system}")
@@ -0,0 +1,113 @@
+import bisect
+import datetime
+import functools
+import os
+import sys
+
+import numpy as np
+
+from astro import planet_longitude, julian_day, sign_index
+from engine import ZODIAC
+
+# ---------------------------
+# Mars sign from the birth date
+# ---------------------------
+# A sorted table of every Mars sign ingress 1900–2100 (retrograde re-entries
+# included), so Step 1 can fill in the Mars sign with one bisect instead of
+# the user looking it up elsewhere:
+#
+#   jd     float64  UT Julian day of the ingress, ascending
+#   sign   int8     sign Mars enters there (ZODIAC index)
+#   first  int8     sign at START (before the first ingress)
+#
+# Ingresses are found on a 6-hour grid of geocentric longitudes and placed by
+# linear interpolation. Births within MARGIN_HOURS of an ingress on their
+# local day get both signs, so both sets of Mars questions can be asked.
+#
+# The table (~13 kB) is committed. Rebuild it after changing the Mars model:
+#
+#   python mars_ingress.py
+
+START = datetime.date(1900, 1, 1)
+END = datetime.date(2101, 1, 1)
+STEP_DAYS = 0.25
+MARGIN_HOURS = 3.0
+
+TABLE_PATH = os.environ.get(
+    "BTF_MARS_INGRESS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "mars_ingress.npz"),
+)
+
+
+# ---------------------------
+# Build step
+# ---------------------------
+def compute_ingresses(start=START, end=END, step=STEP_DAYS):
+    jd = np.arange(julian_day(start), julian_day(end) + step, step)
+    lon = planet_longitude(jd, "Mars")
+    sign = sign_index(lon)
+    idx = np.nonzero(sign[1:] != sign[:-1])[0]
+    # unwrapped motion across the boundary (retrograde steps are negative)
+    delta = np.mod(lon[idx + 1] - lon[idx] + 180.0, 360.0) - 180.0
+    forward = delta > 0
+    boundary = np.where(forward, sign[idx + 1], sign[idx]) * 30.0
+    frac = np.mod(boundary - lon[idx] + 180.0, 360.0) - 180.0
+    at = jd[idx] + step * frac / delta
+    return at, sign[idx + 1].astype(np.int8), int(sign[0])
+
+
+def build(path=TABLE_PATH):
+    at, sign, first = compute_ingresses()
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp, jd=at, sign=sign, first=np.int8(first))
+    os.replace(tmp, path)
+    return path
+
+
+@functools.lru_cache(maxsize=None)
+def get_table():
+    """``(jd list, sign list, first sign)`` — plain lists for ``bisect``."""
+    if not os.path.exists(TABLE_PATH):
+        build()
+    with np.load(TABLE_PATH) as data:
+        return data["jd"].tolist(), data["sign"].tolist(), int(data["first"])
+
+
+# ---------------------------
+# Lookup
+# ---------------------------
+def _sign_at(jd):
+    jds, signs, first = get_table()
+    i = bisect.bisect_right(jds, jd)
+    return signs[i - 1] if i else first
+
+
+def mars_signs(date, tz_offset=0.0, margin_hours=MARGIN_HOURS):
+    """Possible Mars signs on the local ``date``.
+
+    Returns ``(signs, ingress)``: one sign name, or two (before / after) when
+    Mars changes sign during that day (± ``margin_hours``); ``ingress`` is
+    then the UTC ``datetime`` of the change, else ``None``.
+    """
+    if not START <= date < END:
+        raise ValueError(f"Mars lookup covers {START.year}–{END.year - 1} only.")
+    jds, signs, _ = get_table()
+    day_start = julian_day(date) - (tz_offset + margin_hours) / 24.0
+    day_end = julian_day(date) + (24.0 - tz_offset + margin_hours) / 24.0
+
+    before = _sign_at(day_start)
+    i = bisect.bisect_right(jds, day_start)
+    j = bisect.bisect_right(jds, day_end)
+    if i == j:
+        return [ZODIAC[before]], None
+    after = signs[j - 1]
+    ingress = datetime.datetime(2000, 1, 1, 12) + datetime.timedelta(days=jds[i] - 2451545.0)
+    if after == before:
+        # in and straight back out (retrograde station on the cusp)
+        after = signs[i]
+    return [ZODIAC[before], ZODIAC[after]], ingress
+
+
+if __name__ == "__main__":
+    out = build(sys.argv[1] if len(sys.argv) > 1 else TABLE_PATH)
+    print(f"{out}: {os.path.getsize(out)} bytes, {len(get_table()[0])} ingresses")
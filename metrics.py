@@ -0,0 +1,184 @@
+import atexit
+import http.server
+import os
+import threading
+import time
+
+# ---------------------------
+# Rerun instrumentation (Prometheus text format)
+# ---------------------------
+# Disabled unless one of these is set:
+#   BTF_METRICS_FILE=/path/metrics.prom   (rewritten every BTF_METRICS_INTERVAL s)
+#   BTF_METRICS_PORT=9464                 (serves /metrics from this process)
+# When disabled every hook returns immediately, so app.py can call them
+# unconditionally.
+
+METRICS_FILE = os.environ.get("BTF_METRICS_FILE")
+METRICS_PORT = os.environ.get("BTF_METRICS_PORT")
+FLUSH_INTERVAL = float(os.environ.get("BTF_METRICS_INTERVAL", "10"))
+
+ENABLED = bool(METRICS_FILE or METRICS_PORT)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 200, 500)
+
+HELP = {
+    "btf_rerun_duration_seconds": ("histogram", "Script run wall time per wizard step."),
+    "btf_reruns_total": ("counter", "Script runs per wizard step."),
+    "btf_rerun_requests_total": ("counter", "st.rerun() calls per step and call site."),
+    "btf_questions_rendered": ("histogram", "Questions rendered per run of a question step."),
+    "btf_slots_alive": ("histogram", "Alive candidate slots seen per run."),
+}
+
+_lock = threading.Lock()
+_counters = {}     # (name, labels) -> value
+_histograms = {}   # (name, labels) -> [bucket counts..., sum, count]
+_last_flush = 0.0
+
+
+def _labels(**labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _inc(name, labels, value=1):
+    with _lock:
+        _counters[(name, labels)] = _counters.get((name, labels), 0) + value
+
+
+def _observe(name, labels, value, buckets):
+    with _lock:
+        h = _histograms.get((name, labels))
+        if h is None:
+            h = _histograms[(name, labels)] = [0] * len(buckets) + [0.0, 0]
+        for i, le in enumerate(buckets):
+            if value <= le:
+                h[i] += 1
+        h[-2] += value
+        h[-1] += 1
+
+
+# ---------------------------
+# Hooks used by app.py
+# ---------------------------
+def start_run(step):
+    if not ENABLED:
+        return None
+    return step, time.perf_counter()
+
+
+def end_run(run):
+    if run is None:
+        return
+    step, start = run
+    labels = _labels(step=step)
+    _observe("btf_rerun_duration_seconds", labels, time.perf_counter() - start, DURATION_BUCKETS)
+    _inc("btf_reruns_total", labels)
+    _maybe_flush()
+
+
+def rerun_requested(run, site):
+    """Count an st.rerun() call site; the current run ends right after it."""
+    if run is None:
+        return
+    _inc("btf_rerun_requests_total", _labels(step=run[0], site=site))
+    end_run(run)
+
+
+def count_rerun(step, site):
+    """Count a rerun that does not end a timed run (fragment reruns)."""
+    if ENABLED:
+        _inc("btf_rerun_requests_total", _labels(step=step, site=site))
+
+
+def questions_rendered(run, n):
+    if run is not None:
+        _observe("btf_questions_rendered", _labels(step=run[0]), n, COUNT_BUCKETS)
+
+
+def slots_alive(run, n):
+    if run is not None:
+        _observe("btf_slots_alive", _labels(step=run[0]), n, COUNT_BUCKETS)
+
+
+# ---------------------------
+# Export
+# ---------------------------
+def _fmt_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+def render():
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: list(v) for k, v in _histograms.items()}
+
+    lines = []
+    for name, (kind, text) in HELP.items():
+        lines.append(f"# HELP {name} {text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (n, labels), value in sorted(counters.items()):
+                if n == name:
+                    lines.append(f"{name}{_fmt_labels(labels)} {value}")
+        else:
+            buckets = DURATION_BUCKETS if name == "btf_rerun_duration_seconds" else COUNT_BUCKETS
+            for (n, labels), h in sorted(histograms.items()):
+                if n != name:
+                    continue
+                for le, count in zip(buckets, h):
+                    lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', le)])} {count}")
+                lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', '+Inf')])} {h[-1]}")
+                lines.append(f"{name}_sum{_fmt_labels(labels)} {h[-2]}")
+                lines.append(f"{name}_count{_fmt_labels(labels)} {h[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def flush():
+    global _last_flush
+    _last_flush = time.monotonic()
+    if not METRICS_FILE:
+        return
+    tmp = f"{METRICS_FILE}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp, METRICS_FILE)
+
+
+def _maybe_flush():
+    if METRICS_FILE and time.monotonic() - _last_flush >= FLUSH_INTERVAL:
+        flush()
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(port):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="btf-metrics").start()
+
+
+if METRICS_PORT:
+    try:
+        _serve(int(METRICS_PORT))
+    except OSError:
+        # another worker already serves this port
+        pass
+
+if METRICS_FILE:
+    atexit.register(flush)
@@ -0,0 +1,153 @@
+import datetime
+import functools
+import os
+import sqlite3
+
+import numpy as np
+
+from astro import SUNRISE_ALT, sun_altitude, local_minutes_to_jd
+
+# ---------------------------
+# Planetary-hour tables (shared per date + location cell)
+# ---------------------------
+# Hour lords depend only on local sunrise/sunset and the weekday, so every
+# session for the same city and day gets the same table: an in-memory LRU
+# sits on top of a small SQLite store that survives restarts and is shared
+# by all workers on the host.
+
+# First planetary hour of each weekday (index into HOUR_LORDS, date.weekday() order)
+DAY_RULER = [6, 2, 5, 1, 4, 0, 3]
+
+# Location cell size in degrees (~11 km; sunrise moves < 1 min inside a cell)
+CELL = 0.1
+
+MEMORY_CACHE_SIZE = 4096
+
+CACHE_PATH = os.environ.get(
+    "BTF_HOUR_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "planetary_hours.sqlite"),
+)
+
+
+def sun_events(date, lat, lon, tz_offset=0.0):
+    """Sunrises and sunsets from the day before to the day after ``date``.
+
+    Returned as local minutes relative to midnight of ``date``.
+    """
+    minutes = np.arange(-1440, 2881, dtype=np.float64)
+    alt = sun_altitude(local_minutes_to_jd(date, minutes, tz_offset), lat, lon) - SUNRISE_ALT
+    up = alt > 0
+    idx = np.nonzero(up[1:] != up[:-1])[0]
+    crossing = minutes[idx] + alt[idx] / (alt[idx] - alt[idx + 1])
+    rising = up[idx + 1]
+    return crossing[rising], crossing[~rising]
+
+
+def compute_planetary_hours(date, lat, lon, tz_offset=0.0):
+    """Unequal-hour table covering the whole local day of ``date`` (uncached).
+
+    Returns ``(bounds, lords)``: 37 boundaries in local minutes (previous
+    night's 12 hours, then the 24 hours starting at this day's sunrise) and
+    the 36 hour-lord codes in Chaldean order.
+    """
+    rises, sets = sun_events(date, lat, lon, tz_offset)
+
+    rises_today = rises[rises >= 0]
+    if not len(rises_today):
+        raise ValueError("No sunrise at this location on this date.")
+    sunrise = rises_today[0]
+    sets_before = sets[sets < sunrise]
+    sets_after = sets[sets > sunrise]
+    if not len(sets_before) or not len(sets_after):
+        raise ValueError("No sunset at this location on this date.")
+    sunset_prev = sets_before[-1]
+    sunset = sets_after[0]
+    rises_next = rises[rises > sunset]
+    if not len(rises_next):
+        raise ValueError("No sunrise at this location on the following day.")
+    sunrise_next = rises_next[0]
+
+    bounds = np.concatenate([
+        np.linspace(sunset_prev, sunrise, 13)[:-1],
+        np.linspace(sunrise, sunset, 13)[:-1],
+        np.linspace(sunset, sunrise_next, 13),
+    ])
+
+    prev_ruler = DAY_RULER[(date - datetime.timedelta(days=1)).weekday()]
+    ruler = DAY_RULER[date.weekday()]
+    lords = np.concatenate([
+        (prev_ruler + 12 + np.arange(12)) % 7,
+        (ruler + np.arange(24)) % 7,
+    ]).astype(np.int8)
+    return bounds, lords
+
+
+# ---------------------------
+# On-disk store
+# ---------------------------
+def _connect():
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH, timeout=5)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS planetary_hours ("
+        "key TEXT PRIMARY KEY, bounds BLOB NOT NULL, lords BLOB NOT NULL)"
+    )
+    return conn
+
+
+def _disk_get(key):
+    try:
+        with _connect() as conn:
+            row = conn.execute(
+                "SELECT bounds, lords FROM planetary_hours WHERE key = ?", (key,)
+            ).fetchone()
+    except (sqlite3.Error, OSError):
+        return None
+    if row is None:
+        return None
+    return np.frombuffer(row[0], dtype=np.float64), np.frombuffer(row[1], dtype=np.int8)
+
+
+def _disk_put(key, bounds, lords):
+    try:
+        with _connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO planetary_hours VALUES (?, ?, ?)",
+                (key, bounds.tobytes(), lords.tobytes()),
+            )
+    except (sqlite3.Error, OSError):
+        # the disk layer is only a cache — never fail a session over it
+        pass
+
+
+# ---------------------------
+# Cached lookup
+# ---------------------------
+def location_cell(lat, lon):
+    return round(lat / CELL), round(lon / CELL)
+
+
+@functools.lru_cache(maxsize=MEMORY_CACHE_SIZE)
+def _cached_table(date_iso, lat_cell, lon_cell, tz_offset):
+    key = f"{date_iso}|{lat_cell}|{lon_cell}|{tz_offset}"
+    table = _disk_get(key)
+    if table is None:
+        date = datetime.date.fromisoformat(date_iso)
+        bounds, lords = compute_planetary_hours(date, lat_cell * CELL, lon_cell * CELL, tz_offset)
+        _disk_put(key, bounds, lords)
+        table = bounds, lords
+    for arr in table:
+        arr.flags.writeable = False
+    return table
+
+
+def planetary_hours(date, lat, lon, tz_offset=0.0):
+    """Shared (read-only) planetary-hour table for ``date`` and the location cell."""
+    lat_cell, lon_cell = location_cell(lat, lon)
+    return _cached_table(date.isoformat(), lat_cell, lon_cell, float(tz_offset))
+
+
+def hour_lord_codes(table, minutes):
+    bounds, lords = table
+    idx = np.searchsorted(bounds, minutes, side="right") - 1
+    return lords[np.clip(idx, 0, len(lords) - 1)]
@@ -0,0 +1,175 @@
+import functools
+import inspect
+import mmap
+import os
+import struct
+import sys
+import unicodedata
+
+from engine import ZODIAC, HOUSES, HOUR_LORDS
+
+# ---------------------------
+# Compiled question bank
+# ---------------------------
+# The three *_questions.py dict literals are compiled into one file:
+#
+#   header   b"BTFQ" + u16 version + u16 text count
+#   index    u16 text ids: mars×asc (144), hl×asc (84), saturn (12), chiron (12)
+#   offsets  u32 × (text count + 1) into the blob
+#   blob     dedented, NFC-normalized UTF-8 texts (identical texts stored once)
+#
+# The file is mmap'ed, so a session only touches the pages of the texts it
+# actually shows (e.g. the 12 entries of the selected Mars sign).
+#
+# Build:  python question_store.py   (also rebuilt automatically when stale)
+
+MAGIC = b"BTFQ"
+VERSION = 1
+MISSING = 0xFFFF
+
+_HEADER = struct.Struct("<4sHH")
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+STORE_PATH = os.environ.get("BTF_QUESTION_STORE", os.path.join(_HERE, "question_bank.bin"))
+SOURCES = [
+    os.path.join(_HERE, name)
+    for name in ("mars_asc_questions.py", "hourlord_asc_questions.py", "house_questions.py")
+]
+
+# index layout (offset into the u16 index, length)
+MARS_ASC = (0, 144)
+HL_ASC = (144, 84)
+SATURN = (228, 12)
+CHIRON = (240, 12)
+INDEX_SIZE = 252
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFC", inspect.cleandoc(text))
+    return "\n".join(line.rstrip() for line in text.splitlines())
+
+
+# ---------------------------
+# Build step
+# ---------------------------
+def build(path=STORE_PATH):
+    from mars_asc_questions import mars_asc_questions
+    from hourlord_asc_questions import hourlord_asc_questions
+    from house_questions import saturn_house_questions, chiron_house_questions
+
+    texts = []
+    text_ids = {}
+    index = [MISSING] * INDEX_SIZE
+
+    def intern(slot, text):
+        text = normalize(text)
+        if text not in text_ids:
+            text_ids[text] = len(texts)
+            texts.append(text)
+        index[slot] = text_ids[text]
+
+    for m, mars in enumerate(ZODIAC):
+        for a, asc in enumerate(ZODIAC):
+            if asc in mars_asc_questions.get(mars, {}):
+                intern(MARS_ASC[0] + m * 12 + a, mars_asc_questions[mars][asc])
+    for h, hl in enumerate(HOUR_LORDS):
+        for a, asc in enumerate(ZODIAC):
+            if asc in hourlord_asc_questions.get(hl, {}):
+                intern(HL_ASC[0] + h * 12 + a, hourlord_asc_questions[hl][asc])
+    for i, house in enumerate(HOUSES):
+        if house in saturn_house_questions:
+            intern(SATURN[0] + i, saturn_house_questions[house])
+        if house in chiron_house_questions:
+            intern(CHIRON[0] + i, chiron_house_questions[house])
+
+    blobs = [t.encode("utf-8") for t in texts]
+    offsets = [0]
+    for b in blobs:
+        offsets.append(offsets[-1] + len(b))
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(texts)))
+        f.write(struct.pack(f"<{INDEX_SIZE}H", *index))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(b"".join(blobs))
+    os.replace(tmp, path)
+    return path
+
+
+def is_stale(path=STORE_PATH):
+    if not os.path.exists(path):
+        return True
+    built = os.path.getmtime(path)
+    return any(os.path.getmtime(src) > built for src in SOURCES if os.path.exists(src))
+
+
+# ---------------------------
+# Lookup layer
+# ---------------------------
+class QuestionStore:
+    def __init__(self, path=STORE_PATH):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a question store: {path}")
+        self._index_at = _HEADER.size
+        self._offsets_at = self._index_at + 2 * INDEX_SIZE
+        self._blob_at = self._offsets_at + 4 * (count + 1)
+
+    def text(self, slot):
+        (text_id,) = struct.unpack_from("<H", self._mm, self._index_at + 2 * slot)
+        if text_id == MISSING:
+            return None
+        start, end = struct.unpack_from("<II", self._mm, self._offsets_at + 4 * text_id)
+        return self._mm[self._blob_at + start:self._blob_at + end].decode("utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def get_store():
+    if is_stale():
+        build()
+    return QuestionStore()
+
+
+@functools.lru_cache(maxsize=12)
+def mars_questions(mars):
+    """ASC → question text for one Mars sign (loads only those 12 entries)."""
+    base = MARS_ASC[0] + ZODIAC.index(mars) * 12
+    store = get_store()
+    questions = {}
+    for a, asc in enumerate(ZODIAC):
+        text = store.text(base + a)
+        if text is not None:
+            questions[asc] = text
+    return questions
+
+
+def mars_questions_for(mars, alt=None):
+    """Like ``mars_questions``; with ``alt`` (Mars changed sign that day) both texts, labelled."""
+    texts = mars_questions(mars)
+    if alt is None:
+        return texts
+    alt_texts = mars_questions(alt)
+    return {
+        asc: f"**Mars {mars}:** {text}\n\n**Mars {alt}:** {alt_texts[asc]}" if asc in alt_texts else text
+        for asc, text in texts.items()
+    }
+
+
+def hourlord_question(hl, asc):
+    return get_store().text(HL_ASC[0] + HOUR_LORDS.index(hl) * 12 + ZODIAC.index(asc))
+
+
+def saturn_question(house):
+    return get_store().text(SATURN[0] + HOUSES.index(house)) or ""
+
+
+def chiron_question(house):
+    return get_store().text(CHIRON[0] + HOUSES.index(house)) or ""
+
+
+if __name__ == "__main__":
+    out = build(sys.argv[1] if len(sys.argv) > 1 else STORE_PATH)
+    print(f"{out}: {os.path.getsize(out)} bytes")
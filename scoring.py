@@ -0,0 +1,80 @@
+import math
+
+import numpy as np
+
+from candidates import mask_bits
+
+# ---------------------------
+# Probabilistic scoring (soft answers)
+# ---------------------------
+# Candidates are (slot, ASC) cells. The prior spreads each slot's duration
+# evenly over the signs in its ASC range. Every answer is a likelihood:
+# P(answer | the statement is true for this cell) vs P(answer | it is not),
+# so "Yes" and "Not Sure" raise the cells a question describes and "No"
+# lowers them without removing anything. In log space each answer only adds
+# its log-odds to the cells it matches, which makes every answer kind one
+# array operation:
+#
+#   asc      → one column          hl_asc  → single cells (np.add.at)
+#   pair     → rows with that (Saturn, Chiron) start pair
+#
+# Scores are always computed from the slots as entered in Step 3, never from
+# the hard-eliminated masks; a slot marked dead gets no probability. Only
+# answers actually given count: a question never asked adds nothing (it is
+# not a "Not Sure").
+
+# answer → (P(answer | true), P(answer | false))
+LIKELIHOOD = {
+    "Yes": (0.8, 0.2),
+    "Maybe": (0.55, 0.45),
+    "No": (0.1, 0.9),
+}
+
+LOG_ODDS = {answer: math.log(t / f) for answer, (t, f) in LIKELIHOOD.items()}
+
+
+def log_prior(slots):
+    bits = mask_bits(slots["asc"]).astype(bool)
+    duration = np.maximum(slots["end"] - slots["start"], 1).astype(np.float64)
+    per_sign = duration / np.maximum(bits.sum(axis=1), 1)
+    with np.errstate(divide="ignore"):
+        return np.where(bits, np.log(per_sign)[:, None], -np.inf)
+
+
+def log_likelihood(slots, asc_answers, hl_asc_answers, pair_answers):
+    ll = np.zeros((len(slots), 12))
+
+    asc_ll = np.zeros(12)
+    for asc, answer in asc_answers.items():
+        if answer is not None:
+            asc_ll[asc] = LOG_ODDS[answer]
+    ll += asc_ll
+
+    if hl_asc_answers:
+        keys = np.array(list(hl_asc_answers.keys()), dtype=np.intp).reshape(-1, 2)
+        odds = np.array([LOG_ODDS[a] for a in hl_asc_answers.values()])
+        np.add.at(ll, (keys[:, 0], keys[:, 1]), odds)
+
+    pair_ll = np.zeros(144)
+    for (sat, chi), answer in pair_answers.items():
+        pair_ll[sat * 12 + chi] = LOG_ODDS[answer]
+    codes = slots["sat_start"].astype(np.intp) * 12 + slots["chi_start"]
+    ll += pair_ll[codes][:, None]
+    return ll
+
+
+def posterior(slots, asc_answers, hl_asc_answers, pair_answers):
+    """(n_slots, 12) probabilities over (slot, ASC) cells, summing to 1 (all 0 if none is possible)."""
+    log_post = log_prior(slots) + log_likelihood(slots, asc_answers, hl_asc_answers, pair_answers)
+    log_post[~slots["alive"]] = -np.inf
+    if not np.isfinite(log_post).any():
+        return np.zeros_like(log_post)
+    post = np.exp(log_post - log_post[np.isfinite(log_post)].max())
+    return post / post.sum()
+
+
+def rank(post):
+    """Slot ids by descending probability, with per-slot and per-ASC marginals."""
+    by_slot = post.sum(axis=1)
+    order = np.argsort(-by_slot, kind="stable")
+    return order, by_slot, post.sum(axis=0)
@@ -0,0 +1,287 @@
+import atexit
+import collections
+import datetime
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+# ---------------------------
+# Durable session snapshots (write-behind SQLite)
+# ---------------------------
+# Every state transition (rerun call site in app.py) hands the wizard state to
+# ``save``: it is encoded and parked in memory, and a background thread writes
+# all parked snapshots in one transaction every BTF_SNAPSHOT_INTERVAL seconds.
+# The rerun itself only pays for the encoding and its hash: ~10–35 µs up to
+# 10 slots, ~0.3 ms at 200 slots (benchmarks/bench_snapshots.py).
+# Derived data is left out to keep it there: a computed timeline is stored as
+# its build inputs (``timeline_args``) and rebuilt on load, the candidate
+# state as its slot table only.
+# A restarted worker or a dropped websocket resumes from ``?session=<token>``.
+#
+# Snapshots are JSON of the compact codes (never pickle), so a blob read back
+# from a shared store can only ever produce plain data: see ``CODECS``.
+#
+#   BTF_SNAPSHOTS=0             disable
+#   BTF_SNAPSHOT_DB=path        SQLite file (default .cache/sessions.sqlite)
+#   BTF_SNAPSHOT_INTERVAL=0.5   write-behind period (s)
+#   BTF_SNAPSHOT_TTL_DAYS=30    snapshots older than this are pruned
+#
+# To skip unchanged snapshots, the hash of each session's last blob is kept
+# in memory. Hashes of sessions idle for IDLE_SECONDS are dropped on flush;
+# such a session's next save is simply written again.
+
+ENABLED = os.environ.get("BTF_SNAPSHOTS", "1") != "0"
+
+DB_PATH = os.environ.get(
+    "BTF_SNAPSHOT_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "sessions.sqlite"),
+)
+FLUSH_INTERVAL = float(os.environ.get("BTF_SNAPSHOT_INTERVAL", "0.5"))
+TTL_DAYS = float(os.environ.get("BTF_SNAPSHOT_TTL_DAYS", "30"))
+IDLE_SECONDS = 3600.0
+
+# session_state keys that make up a resumable session (widget state is not kept)
+STATE_KEYS = (
+    "step", "mars", "mars_alt", "time1", "time2", "adaptive", "scoring",
+    "hour_slots", "final_end", "timeline_args", "candidates",
+    "asc_answers", "hl_asc_answers", "pair_answers",
+    "adaptive_asked", "adaptive_node",
+)
+
+_lock = threading.Lock()
+_pending = {}      # token -> (updated, blob) not yet on disk
+_last = collections.OrderedDict()    # token -> (hash of the last blob handed to the writer, time)
+_wake = threading.Event()
+_writer = None
+
+
+def new_token():
+    return secrets.token_urlsafe(12)
+
+
+# ---------------------------
+# JSON encoding
+# ---------------------------
+def _hhmm(t):
+    return t.strftime("%H:%M")
+
+
+def _keyed(answers):
+    # {code or (code, code): answer} → [[code, ..., answer], ...]
+    return [[*(k if isinstance(k, tuple) else (k,)), v] for k, v in answers.items()]
+
+
+def _unkeyed(rows):
+    return {(tuple(row[:-1]) if len(row) > 2 else row[0]): row[-1] for row in rows}
+
+
+def _slots_in(d):
+    from engine import SlotIndex
+    return SlotIndex.from_dict(d) if d else []
+
+
+def _timeline_args_out(args):
+    return dict(args, date=args["date"].isoformat(), time1=_hhmm(args["time1"]), time2=_hhmm(args["time2"]))
+
+
+def _timeline_args_in(args):
+    return dict(
+        args,
+        date=datetime.date.fromisoformat(args["date"]),
+        time1=datetime.time.fromisoformat(args["time1"]),
+        time2=datetime.time.fromisoformat(args["time2"]),
+    )
+
+
+# key → (encode, decode) for values JSON can't hold as they are; None passes through
+CODECS = {
+    "time1": (_hhmm, datetime.time.fromisoformat),
+    "time2": (_hhmm, datetime.time.fromisoformat),
+    "hour_slots": (lambda s: s.to_dict() if s else [], _slots_in),
+    "timeline_args": (_timeline_args_out, _timeline_args_in),
+    "candidates": (lambda c: c.to_dict(), None),     # decoded in _rebuild (needs the timeline)
+    "asc_answers": (_keyed, _unkeyed),
+    "hl_asc_answers": (_keyed, _unkeyed),
+    "pair_answers": (_keyed, _unkeyed),
+    "adaptive_asked": (
+        lambda asked: [[list(q), v] for q, v in asked],
+        lambda rows: [(tuple(q), v) for q, v in rows],
+    ),
+}
+
+
+def dumps(state):
+    """JSON bytes of the ``STATE_KEYS`` part of ``state`` (session_state or dict)."""
+    snapshot = {}
+    for key in STATE_KEYS:
+        if key not in state:
+            continue
+        value = state[key]
+        if value is not None and key in CODECS:
+            value = CODECS[key][0](value)
+        snapshot[key] = value
+    return json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(blob):
+    try:
+        snapshot = json.loads(blob)
+        state = {}
+        for key in STATE_KEYS:
+            if key not in snapshot:
+                continue
+            value = snapshot[key]
+            decode = CODECS.get(key, (None, None))[1]
+            if value is not None and decode is not None:
+                value = decode(value)
+            state[key] = value
+        return _rebuild(state)
+    except Exception:
+        # not a snapshot this version can read — start fresh
+        return None
+
+
+def _rebuild(state):
+    # the derived parts dumps() leaves out
+    timeline = None
+    if state.get("timeline_args"):
+        from timeline import build_timeline
+        timeline = build_timeline(**state["timeline_args"])
+    state["timeline"] = timeline
+    if state.get("candidates") is not None:
+        from candidates import CandidateState
+        state["candidates"] = CandidateState.from_dict(state["candidates"], timeline)
+    return state
+
+
+# ---------------------------
+# On-disk store
+# ---------------------------
+def _connect():
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=5)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS snapshots ("
+        "token TEXT PRIMARY KEY, updated REAL NOT NULL, state BLOB NOT NULL)"
+    )
+    return conn
+
+
+def _write(batch):
+    with _connect() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)",
+            [(token, updated, blob) for token, (updated, blob) in batch.items()],
+        )
+
+
+def prune(max_age_days=TTL_DAYS):
+    try:
+        with _connect() as conn:
+            conn.execute("DELETE FROM snapshots WHERE updated < ?", (time.time() - max_age_days * 86400,))
+    except sqlite3.Error:
+        pass
+
+
+def _forget_idle(now):
+    # _last is kept in save order: drop from the front until a recent session
+    while _last:
+        token, (_, seen) = next(iter(_last.items()))
+        if now - seen < IDLE_SECONDS:
+            break
+        del _last[token]
+
+
+def flush():
+    """Write every parked snapshot now."""
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+        _forget_idle(time.time())
+    if not batch:
+        return
+    try:
+        _write(batch)
+    except sqlite3.Error:
+        # keep them for the next round unless a newer snapshot arrived meanwhile
+        with _lock:
+            for token, item in batch.items():
+                _pending.setdefault(token, item)
+
+
+def _run_writer():
+    while True:
+        _wake.wait(FLUSH_INTERVAL)
+        _wake.clear()
+        flush()
+
+
+def _start_writer():
+    global _writer
+    with _lock:
+        if _writer is not None:
+            return
+        _writer = threading.Thread(target=_run_writer, daemon=True, name="btf-snapshots")
+        _writer.start()
+    prune()
+    atexit.register(flush)
+
+
+# ---------------------------
+# API used by app.py
+# ---------------------------
+def save(token, state):
+    """Park a snapshot of ``state`` (session_state or dict) for the writer."""
+    if not ENABLED or not token:
+        return
+    blob = dumps(state)
+    now = time.time()
+    digest = hash(blob)
+    with _lock:
+        last = _last.get(token)
+        _last[token] = (digest, now)
+        _last.move_to_end(token)
+        if last is not None and last[0] == digest:
+            return
+        _pending[token] = (now, blob)
+    if _writer is None:
+        _start_writer()
+
+
+def load(token):
+    """Latest snapshot dict for ``token``, or ``None``."""
+    if not ENABLED or not token:
+        return None
+    with _lock:
+        item = _pending.get(token)
+    if item is not None:
+        blob = item[1]
+    else:
+        try:
+            with _connect() as conn:
+                row = conn.execute("SELECT state FROM snapshots WHERE token = ?", (token,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        blob = row[0]
+    return loads(blob)
+
+
+def iter_snapshots():
+    """``(token, state)`` for every stored snapshot, read one row at a time."""
+    flush()
+    try:
+        conn = _connect()
+    except sqlite3.Error:
+        return
+    try:
+        for token, blob in conn.execute("SELECT token, state FROM snapshots ORDER BY updated"):
+            state = loads(blob)
+            if state is not None:
+                yield token, state
+    finally:
+        conn.close()
@@ -0,0 +1,241 @@
+import collections
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+
+from snapshots import dumps, loads
+
+# ---------------------------
+# Shared session state (any worker can serve any rerun)
+# ---------------------------
+# With a backend configured, the wizard state is written to an external store
+# at the end of every run and at every state transition, under a version
+# number. Each run starts with a version probe: if another worker has written
+# a newer version, that state replaces the local one; otherwise nothing is
+# read. Blobs this worker has already seen sit in a small in-process LRU, so a
+# session bouncing between a few workers rarely transfers its state twice.
+# Blobs are snapshots.dumps JSON; nothing read from the store is unpickled.
+#
+#   BTF_STATE_BACKEND=sqlite:///path/to/state.sqlite   (sqlite:// = .cache/state.sqlite)
+#   BTF_STATE_BACKEND=redis://host:6379/0              (any Redis-protocol server; needs `redis`)
+#   BTF_STATE_BACKEND=memory://                        (single process, for tests)
+#   BTF_STATE_TTL_DAYS=30                              idle sessions expire after this
+#   BTF_STATE_CACHE=1024                               LRU entries per worker
+#
+# Unset (the default) keeps state in the worker, as before.
+
+BACKEND_URL = os.environ.get("BTF_STATE_BACKEND", "")
+TTL_DAYS = float(os.environ.get("BTF_STATE_TTL_DAYS", "30"))
+CACHE_SIZE = int(os.environ.get("BTF_STATE_CACHE", "1024"))
+
+# session_state key holding the version this worker last loaded or wrote
+VERSION_KEY = "state_version"
+
+DEFAULT_SQLITE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "state.sqlite")
+
+
+# ---------------------------
+# Backends: version(token), get(token) → (version, blob),
+# put(token, version, blob) → True if stored (only a newer version is)
+# ---------------------------
+class MemoryBackend:
+    errors = ()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def version(self, token):
+        item = self._data.get(token)
+        return item[0] if item else None
+
+    def get(self, token):
+        return self._data.get(token)
+
+    def put(self, token, version, blob):
+        with self._lock:
+            current = self._data.get(token)
+            if current is not None and current[0] >= version:
+                return False
+            self._data[token] = (version, blob)
+            return True
+
+
+class SQLiteBackend:
+    errors = (sqlite3.Error,)
+
+    def __init__(self, path=DEFAULT_SQLITE):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self):
+        # one connection per thread; WAL lets workers read while one writes
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS state ("
+                "token TEXT PRIMARY KEY, version INTEGER NOT NULL, "
+                "updated REAL NOT NULL, blob BLOB NOT NULL)"
+            )
+            conn.execute("DELETE FROM state WHERE updated < ?", (time.time() - TTL_DAYS * 86400,))
+            self._local.conn = conn
+        return conn
+
+    def version(self, token):
+        row = self._conn().execute("SELECT version FROM state WHERE token = ?", (token,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, token):
+        row = self._conn().execute("SELECT version, blob FROM state WHERE token = ?", (token,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, token, version, blob):
+        cursor = self._conn().execute(
+            "INSERT INTO state VALUES (?, ?, ?, ?) ON CONFLICT(token) DO UPDATE SET "
+            "version = excluded.version, updated = excluded.updated, blob = excluded.blob "
+            "WHERE excluded.version > state.version",
+            (token, version, time.time(), blob),
+        )
+        return cursor.rowcount > 0
+
+
+class RedisBackend:
+    # newer versions only (1 = stored); refresh the idle TTL either way
+    PUT = (
+        "local stored = 0 "
+        "if (tonumber(redis.call('HGET', KEYS[1], 'v')) or -1) < tonumber(ARGV[1]) then "
+        "redis.call('HSET', KEYS[1], 'v', ARGV[1], 'blob', ARGV[2]) stored = 1 end "
+        "redis.call('EXPIRE', KEYS[1], ARGV[3]) "
+        "return stored"
+    )
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise ValueError("BTF_STATE_BACKEND=redis://… needs the `redis` package (pip install redis).")
+        self.errors = (redis.RedisError,)
+        self._client = redis.Redis.from_url(url)
+        self._put = self._client.register_script(self.PUT)
+
+    @staticmethod
+    def _key(token):
+        return f"btf:state:{token}"
+
+    def version(self, token):
+        v = self._client.hget(self._key(token), "v")
+        return int(v) if v is not None else None
+
+    def get(self, token):
+        v, blob = self._client.hmget(self._key(token), "v", "blob")
+        return (int(v), blob) if v is not None and blob is not None else None
+
+    def put(self, token, version, blob):
+        return bool(self._put(keys=[self._key(token)], args=[version, blob, int(TTL_DAYS * 86400)]))
+
+
+def from_url(url):
+    scheme, _, rest = url.partition("://")
+    if scheme == "memory":
+        return MemoryBackend()
+    if scheme == "sqlite":
+        return SQLiteBackend(urllib.parse.unquote(rest) or DEFAULT_SQLITE)
+    if scheme in ("redis", "rediss", "unix"):
+        return RedisBackend(url)
+    raise ValueError(f"Unknown state backend: {url}")
+
+
+# ---------------------------
+# Read-through cache + API used by app.py
+# ---------------------------
+class StateStore:
+    def __init__(self, backend, cache_size=CACHE_SIZE):
+        self.backend = backend
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache = collections.OrderedDict()    # token -> (version, blob)
+
+    def _remember(self, token, version, blob):
+        with self._lock:
+            self._cache[token] = (version, blob)
+            self._cache.move_to_end(token)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _cached(self, token, version):
+        with self._lock:
+            item = self._cache.get(token)
+            if item is None or item[0] != version:
+                return None
+            self._cache.move_to_end(token)
+        return item[1]
+
+    def sync(self, token, state):
+        """Bring ``state`` up to the stored version; True if it was replaced."""
+        try:
+            version = self.backend.version(token)
+            if version is None or version == state.get(VERSION_KEY):
+                return False
+            blob = self._cached(token, version)
+            if blob is None:
+                item = self.backend.get(token)
+                if item is None:
+                    return False
+                version, blob = item
+                self._remember(token, version, blob)
+        except self.backend.errors:
+            # store unreachable — carry on with what this worker has
+            return False
+        snapshot = loads(blob)
+        if snapshot is None:
+            return False
+        state.update(snapshot)
+        state[VERSION_KEY] = version
+        return True
+
+    def save(self, token, state):
+        """Write ``state`` as the next version (skipped when nothing changed).
+
+        If another worker stored that version first, its state wins and
+        replaces ``state``, as a ``sync`` would on the next run.
+        """
+        blob = dumps(state)
+        version = state.get(VERSION_KEY) or 0
+        if version and self._cached(token, version) == blob:
+            return
+        try:
+            stored = self.backend.put(token, version + 1, blob)
+        except self.backend.errors:
+            return
+        if not stored:
+            self.sync(token, state)
+            return
+        state[VERSION_KEY] = version + 1
+        self._remember(token, version + 1, blob)
+
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None and BACKEND_URL:
+        _store = StateStore(from_url(BACKEND_URL))
+    return _store
+
+
+def sync(token, state):
+    store = get_store()
+    return store.sync(token, state) if store is not None and token else False
+
+
+def save(token, state):
+    store = get_store()
+    if store is not None and token:
+        store.save(token, state)
@@ -0,0 +1,134 @@
+import datetime
+import math
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import adaptive
+from candidates import CandidateState
+from engine import ZODIAC, HOUSES, HOUR_LORDS
+from timeline import build_hour_slots
+
+# ---------------------------
+# Expected information gain
+# ---------------------------
+
+
+def test_expected_gain():
+    members = np.array([
+        [1, 1, 0, 0],    # halves the cells: 1 bit
+        [1, 0, 0, 0],    # a quarter
+        [1, 1, 1, 1],    # every cell: splits nothing
+        [0, 0, 0, 0],    # no cell
+    ], dtype=bool)
+    quarter = -(0.25 * math.log2(0.25) + 0.75 * math.log2(0.75))
+    np.testing.assert_allclose(adaptive.expected_gain(members), [1.0, quarter, 0.0, 0.0])
+    # weights move the split: cell 0 alone now holds half the weight
+    np.testing.assert_allclose(adaptive.expected_gain(members, np.array([3.0, 1, 1, 1]))[1], 1.0)
+    assert not adaptive.expected_gain(members, np.zeros(4)).any()
+
+
+# ---------------------------
+# Question choice and answers
+# ---------------------------
+
+
+def candidates_for(day, t1=(6, 0), t2=(18, 0)):
+    hour_slots, _ = build_hour_slots(
+        datetime.date(1988, 4, 2) + datetime.timedelta(days=day), 37.57, 126.98,
+        datetime.time(*t1), datetime.time(*t2), 210.0 + day, 40.0, 9.0,
+    )
+    return CandidateState.from_hour_slots(hour_slots)
+
+
+def describes(question, slots, slot, asc):
+    kind = question[0]
+    if kind == "asc":
+        return ZODIAC[asc] == question[1]
+    if kind == "hl_asc":
+        return HOUR_LORDS[slots["hl"][slot]] == question[1] and ZODIAC[asc] == question[2]
+    return (HOUSES[slots["sat_start"][slot]], HOUSES[slots["chi_start"][slot]]) == question[1:]
+
+
+def test_first_question_has_the_best_split():
+    candidates = candidates_for(0)
+    question = adaptive.next_question(candidates)
+    c = adaptive.cells(candidates)
+    questions, members = adaptive._pool(c)
+    gain = adaptive.expected_gain(members)
+    assert gain[questions.index(question)] == gain.max() > 0
+    # an asked question is never picked again
+    assert adaptive.next_question(candidates, [question]) != question
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_truthful_answers_find_the_true_slot(seed):
+    rng = random.Random(seed)
+    candidates = candidates_for(seed)
+    slots = candidates.slots
+    c = adaptive.cells(candidates)
+    k = rng.randrange(len(c["slot"]))
+    true_slot, true_asc = int(c["slot"][k]), int(c["asc"][k])
+
+    asked = []
+    while (question := adaptive.next_question(candidates, asked)) is not None:
+        value = "Yes" if describes(question, slots, true_slot, true_asc) else "No"
+        adaptive.apply_answer(candidates, question, value)
+        asked.append(question)
+        assert slots["alive"][true_slot] and slots["asc"][true_slot] >> true_asc & 1
+
+    assert adaptive.is_resolved(candidates)
+    assert np.nonzero(slots["alive"])[0].tolist() == [true_slot]
+    # far fewer than the fixed flow's one question per ASC, slot and pair
+    fixed = len(candidates_for(seed).possible_ascs()) + len(slots) + len(candidates_for(seed).unique_pairs())
+    assert len(asked) < fixed
+
+
+def test_apply_answer():
+    candidates = candidates_for(1)
+    before = candidates.slots.copy()
+    for value in ("Yes", "Maybe"):
+        adaptive.apply_answer(candidates, ("asc", "Leo"), value)
+    np.testing.assert_array_equal(candidates.slots, before)
+
+    asc = int(candidates.slots["asc_start"][0])
+    adaptive.apply_answer(candidates, ("asc", ZODIAC[asc]), "No")
+    assert not (candidates.slots["asc"] >> asc & 1).any()
+    # slots left without an ASC are dead
+    assert np.array_equal(candidates.slots["alive"], candidates.slots["asc"] != 0)
+
+    sat, chi = int(candidates.slots["sat_start"][-1]), int(candidates.slots["chi_start"][-1])
+    adaptive.apply_answer(candidates, ("pair", HOUSES[sat], HOUSES[chi]), "No")
+    hit = (candidates.slots["sat_start"] == sat) & (candidates.slots["chi_start"] == chi)
+    assert not candidates.slots["alive"][hit].any()
+
+    with pytest.raises(ValueError):
+        adaptive.apply_answer(candidates, ("moon", "Leo"), "No")
+
+
+def test_record_answer_uses_the_fixed_flow_keys():
+    candidates = candidates_for(2)
+    state = {"asc_answers": {}, "hl_asc_answers": {}, "pair_answers": {}}
+    slots = candidates.slots
+    hl, asc = int(slots["hl"][0]), int(slots["asc_start"][0])
+    adaptive.record_answer(state, candidates, ("asc", ZODIAC[asc]), "Yes")
+    adaptive.record_answer(state, candidates, ("hl_asc", HOUR_LORDS[hl], ZODIAC[asc]), "No")
+    adaptive.record_answer(state, candidates, ("pair", "3", "11"), "Maybe")
+
+    assert state["asc_answers"] == {asc: "Yes"}
+    expected = {(int(i), asc): "No" for i in np.nonzero((slots["hl"] == hl) & (slots["asc"] >> asc & 1 == 1))[0]}
+    assert state["hl_asc_answers"] == expected and (0, asc) in expected
+    assert state["pair_answers"] == {(2, 10): "Maybe"}
+
+
+def test_completed_pair_answers():
+    candidates = candidates_for(3)
+    pairs = candidates.unique_pairs()
+    answers = adaptive.completed_pair_answers(candidates, {pairs[0]: "No"})
+    assert answers == {p: "Maybe" for p in pairs} | {pairs[0]: "No"}
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import api
+
+# ---------------------------
+# dispatch (routing, validation, error mapping)
+# ---------------------------
+
+START = {"mars": "Leo", "time1": "08:00", "time2": "14:00",
+         "start": {"hl": "Sun", "asc": "Leo", "sat": "1", "chi": "2"}}
+
+
+def call(method, path, body=None):
+    status, payload = api.dispatch(method, path, json.dumps(body).encode() if body is not None else b"")
+    # every payload must be serializable as the server writes it
+    json.dumps(payload)
+    return status, payload
+
+
+@pytest.fixture
+def sid():
+    api._sessions.clear()
+    status, state = call("POST", "/sessions", START)
+    assert status == 201
+    return state["session"]
+
+
+def test_full_flow(sid):
+    assert call("POST", f"/sessions/{sid}/transitions",
+                {"time": "10:00", "hl": "Venus", "asc": "Virgo", "sat": "12", "chi": "1"})[0] == 201
+    status, state = call("POST", f"/sessions/{sid}/transitions",
+                         {"time": "12:30", "hl": "Mercury", "asc": "Libra", "sat": "11", "chi": "12"})
+    assert [s["start_time"] for s in state["slots"]] == ["08:00", "10:00", "12:30"]
+    assert [s["end_time"] for s in state["slots"]] == ["10:00", "12:30", "14:00"]
+
+    status, asc = call("GET", f"/sessions/{sid}/questions/asc")
+    assert status == 200 and [q["key"] for q in asc["questions"]] == ["Leo", "Libra", "Virgo"]
+    for q in asc["questions"]:
+        call("POST", f"/sessions/{sid}/answers", {"kind": "asc", "key": q["key"], "value": "No" if q["key"] == "Leo" else "Yes"})
+
+    _, hl = call("GET", f"/sessions/{sid}/questions/hl_asc")
+    assert [q["key"] for q in hl["questions"]] == [
+        {"slot": 0, "asc": "Virgo"}, {"slot": 1, "asc": "Virgo"}, {"slot": 2, "asc": "Libra"}
+    ]
+    assert hl["questions"][0]["hour_lord"] == "Sun"
+
+    _, pairs = call("GET", f"/sessions/{sid}/questions/pair")
+    assert [q["key"] for q in pairs["questions"]] == [
+        {"sat": "1", "chi": "2"}, {"sat": "12", "chi": "1"}, {"sat": "11", "chi": "12"}
+    ]
+    status, echo = call("POST", f"/sessions/{sid}/answers", {"kind": "pair", "key": {"sat": "1", "chi": "2"}, "value": "No"})
+    assert status == 200 and echo["value"] == "No"
+
+    status, result = call("GET", f"/sessions/{sid}/result")
+    assert status == 200
+    assert [s["start_time"] for s in result["alive_slots"]] == ["10:00", "12:30"]
+    assert result["ascendants"] == ["Libra", "Virgo"]
+
+    assert call("DELETE", f"/sessions/{sid}/transitions/1")[1]["slots"][1]["start_time"] == "12:30"
+    assert call("DELETE", f"/sessions/{sid}")[0] == 200
+    assert call("GET", f"/sessions/{sid}")[0] == 404
+
+
+@pytest.mark.parametrize("body, message", [
+    ({"time1": "08:00"}, "Missing field: mars, start"),
+    (dict(START, start={"hl": "Sun", "asc": "Leo"}), "Missing field: sat, chi"),
+    (dict(START, start="Sun"), "Expected a JSON object"),
+    (dict(START, mars="Pluto"), "Unknown Mars sign: 'Pluto'"),
+    (dict(START, start=dict(START["start"], hl="Uranus")), "Unknown hour lord: 'Uranus'"),
+    (dict(START, time2="25:00"), "Bad time"),
+])
+def test_create_rejects(body, message):
+    status, payload = call("POST", "/sessions", body)
+    assert status == 400
+    assert message in payload["error"]
+
+
+@pytest.mark.parametrize("body, message", [
+    ({"kind": "asc", "value": "Yes"}, "Missing field: key"),
+    ({"kind": "asc", "key": "Leo", "value": "Perhaps"}, "Unknown answer"),
+    ({"kind": "asc", "key": "Leon", "value": "Yes"}, "Unknown sign: 'Leon'"),
+    ({"kind": "hl_asc", "key": {"asc": "Leo"}, "value": "Yes"}, "Missing field: slot"),
+    ({"kind": "hl_asc", "key": {"slot": 9, "asc": "Leo"}, "value": "Yes"}, "Unknown slot: 9"),
+    ({"kind": "pair", "key": "1/2", "value": "Yes"}, "Expected a JSON object"),
+    ({"kind": "moon", "key": "x", "value": "Yes"}, "Unknown question kind"),
+])
+def test_answer_rejects(sid, body, message):
+    status, payload = call("POST", f"/sessions/{sid}/answers", body)
+    assert status == 400
+    assert message in payload["error"]
+
+
+def test_transition_errors(sid):
+    base = {"hl": "Venus", "asc": "Virgo", "sat": "12", "chi": "1"}
+    assert call("POST", f"/sessions/{sid}/transitions", base) == (400, {"error": "Missing field: time"})
+    assert "AFTER Time1" in call("POST", f"/sessions/{sid}/transitions", dict(base, time="07:00"))[1]["error"]
+    assert call("DELETE", f"/sessions/{sid}/transitions/0")[0] == 400
+
+
+def test_routing_errors(sid):
+    assert call("GET", "/nowhere")[0] == 404
+    assert call("PUT", f"/sessions/{sid}")[0] == 405
+    assert call("GET", "/sessions/unknown")[0] == 404
+    assert api.dispatch("POST", "/sessions", b"{not json")[0] == 400
+    assert api.dispatch("POST", "/sessions", b"[1, 2]")[0] == 400
+
+
+def test_unexpected_error_is_a_logged_500(sid, monkeypatch, caplog):
+    def broken(*args, **kwargs):
+        raise KeyError("slots")
+    monkeypatch.setattr(api.BirthWindowSession, "result", broken)
+    with caplog.at_level("ERROR", logger="btf.api"):
+        status, payload = call("GET", f"/sessions/{sid}/result")
+    assert status == 500 and payload == {"error": "Internal server error."}
+    assert "GET /sessions/" in caplog.text and "KeyError" in caplog.text
+
+
+# ---------------------------
+# HTTP server (keep-alive, status lines)
+# ---------------------------
+def test_http_round_trip():
+    async def run():
+        ready = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(api.serve("127.0.0.1", 0, ready=ready.set_result))
+        server = await ready
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def request(method, path, body=None):
+            data = json.dumps(body).encode() if body is not None else b""
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data)
+            await writer.drain()
+            status_line = await reader.readline()
+            headers = {}
+            while (line := await reader.readline()) != b"\r\n":
+                name, _, value = line.decode().partition(":")
+                headers[name.lower()] = value.strip()
+            payload = json.loads(await reader.readexactly(int(headers["content-length"])))
+            return status_line.decode().strip(), payload
+
+        try:
+            created = await request("POST", "/sessions", START)
+            missing = await request("POST", "/sessions", {"mars": "Leo"})
+            fetched = await request("GET", f"/sessions/{created[1]['session']}")
+        finally:
+            writer.close()
+            task.cancel()
+        return created, missing, fetched
+
+    api._sessions.clear()
+    created, missing, fetched = asyncio.run(run())
+    assert created[0] == "HTTP/1.1 201 Created"
+    assert missing == ("HTTP/1.1 400 Bad Request", {"error": "Missing field: start"})
+    assert fetched[0] == "HTTP/1.1 200 OK" and fetched[1]["mars"] == "Leo"
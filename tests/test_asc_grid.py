@@ -0,0 +1,72 @@
+import datetime
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from astro import ascendant, local_minutes_to_jd, sign_index
+from asc_grid import asc_boundaries, window_boundaries, expand, fill_asc_ranges
+from timeline import build_timeline, timeline_to_hour_slots, _sequence
+
+# ---------------------------
+# Ascendant grid vs the direct formula
+# ---------------------------
+
+LON = 126.98
+TZ = 9.0
+
+
+def direct(date, lat, m1, m2):
+    jd = local_minutes_to_jd(date, np.arange(m1, m2 + 1), TZ)
+    return sign_index(ascendant(jd, lat, LON))
+
+
+@pytest.mark.parametrize("lat", [-45.0, -12.3, 0.0, 37.57, 51.5, 60.1, 65.9])
+def test_every_minute_matches_direct_formula(lat):
+    # 200 days of whole-day windows → 288k minutes per latitude
+    for d in range(200):
+        date = datetime.date(1985, 3, 1) + datetime.timedelta(days=d)
+        m1, m2 = 300, 300 + 1439
+        got = expand(*window_boundaries(date, lat, LON, m1, m2, TZ), m1, m2)
+        np.testing.assert_array_equal(got, direct(date, lat, m1, m2), err_msg=f"{date} lat {lat}")
+
+
+@pytest.mark.parametrize("lat", [-33.9, 37.57, 59.3])
+def test_boundary_minutes(lat):
+    date = datetime.date(2003, 7, 14)
+    first, minutes, signs = window_boundaries(date, lat, LON, 0, 1439, TZ)
+    assert 10 <= len(minutes) <= 14
+    assert np.all(np.diff(minutes) > 0)
+    before = direct(date, lat, 0, 1439)
+    assert first == before[0]
+    for m, s in zip(minutes, signs):
+        assert before[m] == s and before[m - 1] != s
+
+
+def test_window_crossing_midnight():
+    date = datetime.date(2011, 11, 2)
+    first, minutes, signs = asc_boundaries(date, 37.57, LON, datetime.time(22, 0), datetime.time(3, 0), TZ)
+    assert minutes.min() > 22 * 60 and minutes.max() <= 27 * 60
+    np.testing.assert_array_equal(
+        expand(first, minutes, signs, 22 * 60, 27 * 60), direct(date, 37.57, 22 * 60, 27 * 60)
+    )
+
+
+def test_slot_ranges_match_per_minute_sequence():
+    timeline = build_timeline(datetime.date(1999, 5, 20), 37.57, LON,
+                              datetime.time(4, 0), datetime.time(16, 0), 10.0, 200.0, TZ)
+    hour_slots = timeline_to_hour_slots(timeline)
+    assert len(hour_slots) >= 10
+    for slot in hour_slots:
+        seg = slice(slot.start - 240, slot.end - 240 + 1)
+        assert slot.asc_range == _sequence(timeline["asc"][seg])
+        assert slot.asc_start == timeline["asc"][slot.start - 240]
+
+    # refilling from the change list is idempotent
+    before = [bytes(s.asc_range) for s in hour_slots]
+    fill_asc_ranges(hour_slots, *timeline["asc_changes"])
+    assert [bytes(s.asc_range) for s in hour_slots] == before
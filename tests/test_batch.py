@@ -0,0 +1,100 @@
+import io
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import batch
+
+# ---------------------------
+# Batch intake: ordering and error rows
+# ---------------------------
+
+SIGNS = ["Cancer", "Leo", "Virgo", "Libra"]
+
+
+def record(i):
+    asc = SIGNS[i % 3]
+    return {
+        "id": f"R-{i}", "mars": "Leo", "time1": "08:00", "time2": "14:00",
+        "start": {"hl": "Sun", "asc": asc, "sat": "3", "chi": "5"},
+        "transitions": [
+            {"time": f"{9 + i % 4:02d}:{i % 60:02d}", "hl": "Venus", "asc": SIGNS[i % 3 + 1], "sat": "2", "chi": "4"},
+        ],
+        "answers": {"asc": {asc: "No" if i % 2 else "Yes"}, "pair": {"2/4": "Maybe"}},
+        "scoring": i % 5 == 0,
+    }
+
+
+def lines(records):
+    return [(n, json.dumps(r) if not isinstance(r, str) else r) for n, r in enumerate(records, start=1)]
+
+
+def test_single_record():
+    out = batch.run_record(record(0))
+    assert out["id"] == "R-0"
+    assert out["ascendants"] == ["Cancer", "Leo"]
+    assert out["ranked"][0]["p"] >= out["ranked"][-1]["p"]
+    assert sum(r["p"] for r in out["ranked"]) == pytest.approx(1.0, abs=1e-3)
+
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, 256), (1, 4), (3, 4)])
+def test_results_in_input_order(workers, chunk_size):
+    records = [record(i) for i in range(40)]
+    results = list(batch.process(lines(records), workers, chunk_size))
+    assert [r["id"] for r in results] == [r["id"] for r in records]
+    # pool results are the same rows a single process produces
+    assert results == [batch.run_record(r) for r in records]
+
+
+BAD = [
+    ("{not json", None, "JSONDecodeError"),
+    (json.dumps([1, 2]), None, "AttributeError"),
+    (json.dumps(dict(record(1), start=None)), "R-1", "no Time1"),
+    (json.dumps(dict(record(2), mars=None, start=dict(record(2)["start"], asc="Leon"))), "R-2", "ValueError"),
+    (json.dumps(dict(record(3), answers={"hl_asc": {"15:00/Leo": "Yes"}})), "R-3", "No slot covers 15:00"),
+    (json.dumps(dict(record(4), time1="8h")), "R-4", "ValueError"),
+]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_error_rows_keep_their_place(workers):
+    items = lines([record(10)] + [raw for raw, _, _ in BAD] + [record(11)])
+    results = list(batch.process(items, workers, chunk_size=3))
+    assert results[0]["id"] == "R-10" and results[-1]["id"] == "R-11"
+    assert "error" not in results[0] and "error" not in results[-1]
+    for row, (_, rid, message), (n, _) in zip(results[1:-1], BAD, items[1:-1]):
+        assert row["id"] == rid and row["line"] == n
+        assert message in row["error"]
+
+
+def test_unexpected_exception_is_an_error_row(monkeypatch):
+    real = batch.run_record
+
+    def flaky(rec):
+        if rec["id"] == "R-1":
+            raise RuntimeError("boom")
+        return real(rec)
+
+    monkeypatch.setattr(batch, "run_record", flaky)
+    results = batch.run_chunk(lines([record(0), record(1), record(2)]))
+    assert [r["id"] for r in results] == ["R-0", "R-1", "R-2"]
+    assert results[1] == {"id": "R-1", "line": 2, "error": "RuntimeError: boom"}
+
+
+def test_csv_and_exit_code(tmp_path, capsys):
+    path = tmp_path / "intake.csv"
+    path.write_text(
+        "id,mars,time1,time2,transitions,asc_answers,hl_asc_answers,pair_answers,scoring\n"
+        "C-1,Leo,08:00,14:00,08:00 Sun Cancer 3 5;10:00 Venus Leo 2 4,Cancer=No,10:00/Leo=Yes,2/4=Yes,1\n"
+        "C-2,Leo,08:00,14:00,,,,,\n",
+        encoding="utf-8",
+    )
+    assert batch.main([str(path), "--workers", "1"]) == 1
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert rows[0]["id"] == "C-1" and rows[0]["ascendants"] == ["Leo"]
+    assert rows[1] == {"id": "C-2", "line": 3, "error": "ValueError: Record has no Time1 hour lord / ASC / houses."}
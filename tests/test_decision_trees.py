@@ -0,0 +1,81 @@
+import datetime
+import json
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import adaptive
+import decision_trees
+from candidates import CandidateState
+from timeline import build_hour_slots
+
+# ---------------------------
+# Precomputed trees vs live adaptive ordering
+# ---------------------------
+
+DEPTH = 6
+
+
+def configs():
+    for days, (t1, t2) in enumerate([((4, 0), (10, 0)), ((13, 30), (19, 0)), ((21, 0), (2, 0))]):
+        hour_slots, _ = build_hour_slots(
+            datetime.date(1994, 2, 11) + datetime.timedelta(days=days * 40), 37.57, 126.98,
+            datetime.time(*t1), datetime.time(*t2), 330.0, 15.0, 9.0,
+        )
+        yield CandidateState.from_hour_slots(hour_slots)
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    # no .npz suffix on purpose: the file must land at exactly this path
+    path = str(tmp_path_factory.mktemp("trees") / "trees")
+    trees, nodes = decision_trees.build_store(configs(), DEPTH, path)
+    assert trees == 3 and nodes > 3
+    assert os.path.exists(path) and not os.path.exists(path + ".npz")
+    return path
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_walk_matches_live_questions(store, seed):
+    rng = random.Random(seed)
+    candidates = list(configs())[seed % 3]
+    node = decision_trees.root(candidates, store)
+    assert node is not None
+
+    asked = []
+    for _ in range(DEPTH + 4):   # past the precomputed depth: live fallback
+        question = decision_trees.next_question(candidates, asked, node, store)
+        assert question == adaptive.next_question(candidates, asked)
+        if question is None:
+            break
+        value = rng.choice(("Yes", "No", "Maybe"))
+        adaptive.apply_answer(candidates, question, value)
+        asked.append(question)
+        node = decision_trees.advance(node, value, store)
+
+
+def test_unknown_configuration_falls_back(store):
+    candidates = next(configs())
+    candidates.slots["asc"][0] ^= 1
+    assert decision_trees.root(candidates, store) is None
+    assert decision_trees.next_question(candidates, [], None, store) == adaptive.next_question(candidates, [])
+
+
+def test_cli_out_without_suffix(tmp_path, capsys):
+    lines = tmp_path / "configs.jsonl"
+    lines.write_text("\n".join(
+        json.dumps({"hour_slots": [
+            {k: (v.strftime("%H:%M") if isinstance(v, datetime.time) else v) for k, v in slot.to_dict().items()}
+            for slot in c.to_hour_slots()
+        ]})
+        for c in configs()
+    ), encoding="utf-8")
+    out = tmp_path / "trees"
+    decision_trees.main([str(lines), "--depth", "3", "--out", str(out)])
+    assert out.exists()
+    assert f"{out}: 3 trees" in capsys.readouterr().out
@@ -0,0 +1,82 @@
+import datetime
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import ephemeris
+from astro import julian_day
+
+# ---------------------------
+# Ephemeris file vs published positions and the direct formulas
+# ---------------------------
+# Almanac longitudes at 0h UT, to the arc minute.
+
+
+def dms(sign, deg, minute):
+    return 30.0 * sign + deg + minute / 60.0
+
+
+def gap(a, b):
+    return np.abs(np.mod(np.asarray(a) - b + 180.0, 360.0) - 180.0)
+
+
+KNOWN = [
+    # Sun 9°51' Capricorn, Mars 27°35' Aquarius, Saturn 10°25' Taurus, Chiron 11°52' Sagittarius
+    (datetime.date(2000, 1, 1), {"Sun": dms(9, 9, 51), "Mars": dms(10, 27, 35),
+                                 "Saturn": dms(1, 10, 25), "Chiron": dms(8, 11, 52)}),
+    # Sun 10°02' Capricorn, Mars 27°19' Sagittarius, Saturn 3°17' Pisces, Chiron 15°35' Aries
+    (datetime.date(2024, 1, 1), {"Sun": dms(9, 10, 2), "Mars": dms(8, 27, 19),
+                                 "Saturn": dms(11, 3, 17), "Chiron": dms(0, 15, 35)}),
+]
+
+
+@pytest.mark.parametrize("date, expected", KNOWN)
+def test_known_positions(date, expected):
+    jd = julian_day(date)
+    for body, lon in expected.items():
+        assert gap(ephemeris.longitude(body, jd), lon) < 0.25, body
+
+
+def test_interpolation_matches_direct_formulas():
+    rng = np.random.default_rng(0)
+    jd = rng.uniform(julian_day(ephemeris.START), julian_day(ephemeris.END) - 1, 2000)
+    # plus a dense run across the March equinox, where the Sun wraps 360° → 0°
+    jd = np.concatenate([jd, julian_day(datetime.date(2024, 3, 19)) + np.arange(0, 2, 1 / 48)])
+    table = ephemeris.longitudes(jd)
+    assert table.shape == (len(jd), len(ephemeris.BODIES))
+    assert np.all((table >= 0) & (table < 360))
+    for k, body in enumerate(ephemeris.BODIES):
+        assert gap(table[:, k], ephemeris.compute_longitudes(jd, body)).max() < 0.01, body
+
+
+def test_shapes():
+    jd = julian_day(datetime.date(1990, 6, 3)) + np.arange(6).reshape(2, 3) / 24
+    assert isinstance(ephemeris.longitude("Saturn", float(jd[0, 0])), float)
+    assert ephemeris.longitude("Saturn", jd.ravel()).shape == (6,)
+    both = ephemeris.longitudes(jd.ravel(), ("Chiron", "Sun"))
+    np.testing.assert_array_equal(both[:, 0], ephemeris.longitude("Chiron", jd.ravel()))
+    np.testing.assert_array_equal(both[:, 1], ephemeris.longitude("Sun", jd.ravel()))
+
+
+@pytest.mark.parametrize("date", [datetime.date(1899, 12, 1), datetime.date(2101, 2, 1)])
+def test_outside_the_file(date):
+    with pytest.raises(ValueError, match="Ephemeris covers 1900–2100"):
+        ephemeris.longitude("Sun", julian_day(date))
+
+
+def test_built_when_missing(tmp_path, monkeypatch):
+    path = tmp_path / "ephemeris.npy"
+    monkeypatch.setattr(ephemeris, "EPHEMERIS_PATH", str(path))
+    ephemeris.get_table.cache_clear()
+    try:
+        table = ephemeris.get_table()
+        assert path.exists() and isinstance(table, np.memmap)
+        assert table.dtype == np.float32 and table.shape[1] == len(ephemeris.BODIES)
+        assert ephemeris.get_table() is table
+    finally:
+        ephemeris.get_table.cache_clear()
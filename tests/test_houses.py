@@ -0,0 +1,97 @@
+import datetime
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import houses
+from astro import ascendant, midheaven, local_minutes_to_jd
+from timeline import build_timeline, timeline_to_hour_slots
+
+# ---------------------------
+# House systems vs hand-worked charts
+# ---------------------------
+# Codes are 0-based: 0 = house "1".
+
+
+def test_whole_sign():
+    # Saturn at 15° Aries (sign 0) with Leo (4) rising is in the 9th house
+    assert houses.whole_sign(15.0, 4) == 8
+    lon = np.array([15.0, 125.0, 359.9, 0.0])
+    np.testing.assert_array_equal(houses.whole_sign(lon, 4), [8, 0, 7, 8])
+    # one ASC sign per minute
+    np.testing.assert_array_equal(houses.whole_sign(125.0, np.array([3, 4, 5])), [1, 0, 11])
+
+
+def test_equal():
+    asc = 100.0
+    lon = np.array([100.0, 129.99, 130.0, 95.0, 280.0, 99.999])
+    np.testing.assert_array_equal(houses.equal(lon, asc), [0, 0, 1, 11, 6, 11])
+    # crossing 0° Aries
+    np.testing.assert_array_equal(houses.equal(np.array([5.0, 345.0]), 350.0), [0, 11])
+
+
+def test_porphyry():
+    # ASC 0°, MC 300°: IC is 120° on from the ASC, so houses 1–3 are 40° and
+    # houses 4–6 are 20° wide (and the same again opposite)
+    cusps = houses.porphyry_cusps(0.0, 300.0)
+    np.testing.assert_allclose(cusps[0], [0, 40, 80, 120, 140, 160, 180, 220, 260, 300, 320, 340])
+    lon = np.array([0.0, 39.9, 85.0, 125.0, 179.0, 250.0, 350.0])
+    np.testing.assert_array_equal(houses.porphyry(lon, 0.0, 300.0), [0, 0, 2, 3, 5, 7, 11])
+    # with the MC 90° from the ASC it is the equal system
+    lon = np.linspace(0, 359.5, 720)
+    np.testing.assert_array_equal(houses.porphyry(lon, 40.0, 310.0), houses.equal(lon, 40.0))
+
+
+def test_porphyry_cusps_hit_the_angles():
+    jd = local_minutes_to_jd(datetime.date(1990, 6, 3), np.arange(0, 1440, 7), 9.0)
+    asc, mc = ascendant(jd, 37.57, 126.98), midheaven(jd, 126.98)
+    cusps = houses.porphyry_cusps(asc, mc)
+    np.testing.assert_allclose(cusps[:, 9], np.mod(mc - asc, 360.0))     # 10th cusp = MC
+    np.testing.assert_allclose(cusps[:, 3], np.mod(mc + 180.0 - asc, 360.0))    # 4th = IC
+    assert np.all(np.diff(cusps, axis=1) > 0)
+
+
+def test_unknown_system():
+    with pytest.raises(ValueError, match="Unknown house system"):
+        houses.house_codes(10.0, "placidus", asc_sign=0)
+
+
+# ---------------------------
+# Houses along the computed timeline
+# ---------------------------
+ARGS = dict(date=datetime.date(1990, 6, 3), lat=37.57, lon=126.98,
+            time1=datetime.time(4, 0), time2=datetime.time(23, 0), sat_lon=290.0, chi_lon=95.0, tz_offset=9.0)
+
+
+@pytest.mark.parametrize("system", ["whole", "equal", "porphyry"])
+def test_timeline_houses(system):
+    timeline = build_timeline(**ARGS, house_system=system)
+    jd = local_minutes_to_jd(ARGS["date"], timeline["minute"], ARGS["tz_offset"])
+    angles = dict(asc_sign=timeline["asc"], asc_lon=ascendant(jd, ARGS["lat"], ARGS["lon"]),
+                  mc_lon=midheaven(jd, ARGS["lon"]))
+    np.testing.assert_array_equal(timeline["sat"], houses.house_codes(290.0, system, **angles))
+    np.testing.assert_array_equal(timeline["chi"], houses.house_codes(95.0, system, **angles))
+
+    # a fixed planet only moves back through the houses as the sky turns
+    assert set(np.diff(timeline["sat"]) % 12) <= {0, 11}
+
+    m1 = timeline["minute"][0]
+    for s in timeline_to_hour_slots(timeline):
+        seen = timeline["sat"][s.start - m1:s.end - m1]
+        assert s.sat_range[0] == seen[0] and set(seen) <= set(s.sat_range)
+        seen = timeline["chi"][s.start - m1:s.end - m1]
+        assert s.chi_range[0] == seen[0] and set(seen) <= set(s.chi_range)
+
+
+def test_whole_sign_timeline_by_hand():
+    # Chiron at 5° Cancer: in the 1st house while Cancer rises
+    timeline = build_timeline(**dict(ARGS, chi_lon=95.0), house_system="whole")
+    cancer = timeline["asc"] == 3
+    assert cancer.any() and np.all(timeline["chi"][cancer] == 0)
+    leo = timeline["asc"] == 4
+    assert leo.any() and np.all(timeline["chi"][leo] == 11)
@@ -0,0 +1,61 @@
+import datetime
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mars_ingress import mars_signs, TABLE_PATH
+
+# ---------------------------
+# Ingress table vs published ingress times
+# ---------------------------
+# UT times of Mars sign ingresses from a standard ephemeris, including the
+# retrograde re-entry into Cancer in January 2025.
+
+INGRESSES = [
+    ("2023-03-25 11:45", "Gemini", "Cancer"),
+    ("2023-05-20 15:31", "Cancer", "Leo"),
+    ("2023-07-10 11:40", "Leo", "Virgo"),
+    ("2023-08-27 13:20", "Virgo", "Libra"),
+    ("2024-04-30 15:33", "Pisces", "Aries"),
+    ("2024-06-09 04:35", "Aries", "Taurus"),
+    ("2024-07-20 20:43", "Taurus", "Gemini"),
+    ("2024-09-04 19:46", "Gemini", "Cancer"),
+    ("2024-11-04 04:10", "Cancer", "Leo"),
+    ("2025-01-06 10:44", "Leo", "Cancer"),
+    ("2025-04-18 04:21", "Cancer", "Leo"),
+]
+
+
+def test_table_is_shipped():
+    assert os.path.exists(TABLE_PATH)
+
+
+@pytest.mark.parametrize("when, before, after", INGRESSES)
+def test_known_ingress(when, before, after):
+    when = datetime.datetime.strptime(when, "%Y-%m-%d %H:%M")
+    signs, ingress = mars_signs(when.date())
+    assert signs == [before, after]
+    assert abs(ingress - when) < datetime.timedelta(hours=1)
+
+    # the days either side have a single sign
+    for days, sign in ((-2, before), (2, after)):
+        assert mars_signs(when.date() + datetime.timedelta(days=days)) == ([sign], None)
+
+
+def test_local_day_and_margin():
+    # the 2024-06-09 ingress (~04:30 UT) comes just after 8 June ends in
+    # New York (UTC-4): inside the margin both signs are offered
+    signs, ingress = mars_signs(datetime.date(2024, 6, 8), tz_offset=-4.0)
+    assert signs == ["Aries", "Taurus"] and ingress == mars_signs(datetime.date(2024, 6, 9))[1]
+    assert mars_signs(datetime.date(2024, 6, 8), tz_offset=-4.0, margin_hours=0.0)[0] == ["Aries"]
+    # in Seoul (UTC+9) it is 13:35 on 9 June
+    assert mars_signs(datetime.date(2024, 6, 10), tz_offset=9.0) == (["Taurus"], None)
+
+
+def test_outside_table():
+    with pytest.raises(ValueError):
+        mars_signs(datetime.date(1899, 12, 31))
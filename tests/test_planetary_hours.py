@@ -0,0 +1,87 @@
+import datetime
+import os
+import sqlite3
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import planetary_hours as ph
+
+# ---------------------------
+# Planetary-hour tables and their two cache layers
+# ---------------------------
+
+DATE = datetime.date(2024, 1, 1)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(ph, "CACHE_PATH", str(tmp_path / "hours.sqlite"))
+    ph._cached_table.cache_clear()
+    yield tmp_path / "hours.sqlite"
+    ph._cached_table.cache_clear()
+
+
+def rows(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT key FROM planetary_hours").fetchall()
+
+
+def test_table_shape():
+    bounds, lords = ph.compute_planetary_hours(DATE, 37.57, 126.98, 9.0)
+    assert len(bounds) == 37 and len(lords) == 36
+    assert np.all(np.diff(bounds) > 0)
+    assert bounds[0] < 0 < bounds[12] < 1440 < bounds[-1]
+    # Monday: day hours start with the Moon; Sunday night (Sun's day) before it
+    assert lords[12] == ph.DAY_RULER[DATE.weekday()] == 6
+    assert lords[0] == (ph.DAY_RULER[6] + 12) % 7
+
+
+def test_same_cell_shares_one_table(cache):
+    a = ph.planetary_hours(DATE, 37.57, 126.98, 9)
+    b = ph.planetary_hours(DATE, 37.56, 126.99, 9.0)
+    assert a is b
+    assert not a[0].flags.writeable and not a[1].flags.writeable
+    assert ph.planetary_hours(DATE, 37.77, 126.98, 9.0) is not a
+    assert len(rows(cache)) == 2
+
+
+def test_disk_layer_survives_a_restart(cache, monkeypatch):
+    first = ph.planetary_hours(DATE, 37.57, 126.98, 9.0)
+    ph._cached_table.cache_clear()
+
+    def recompute(*args):
+        raise AssertionError("table should come from the disk store")
+    monkeypatch.setattr(ph, "compute_planetary_hours", recompute)
+    again = ph.planetary_hours(DATE, 37.57, 126.98, 9.0)
+    np.testing.assert_array_equal(again[0], first[0])
+    np.testing.assert_array_equal(again[1], first[1])
+
+
+def test_unwritable_store_is_only_a_miss(tmp_path, monkeypatch):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setattr(ph, "CACHE_PATH", str(blocker / "sub" / "hours.sqlite"))
+    ph._cached_table.cache_clear()
+    try:
+        assert ph._disk_get("x") is None
+        bounds, lords = ph.planetary_hours(DATE, 37.57, 126.98, 9.0)
+    finally:
+        ph._cached_table.cache_clear()
+    assert len(lords) == 36
+
+
+def test_hour_lord_codes():
+    table = ph.compute_planetary_hours(DATE, 37.57, 126.98, 9.0)
+    bounds, lords = table
+    minutes = np.array([bounds[0] - 30, bounds[12], bounds[12] + 1, bounds[13] - 1, bounds[-1] + 30])
+    np.testing.assert_array_equal(ph.hour_lord_codes(table, minutes), lords[[0, 12, 12, 12, 35]])
+
+
+def test_midnight_sun():
+    with pytest.raises(ValueError, match="sunset|sunrise"):
+        ph.compute_planetary_hours(datetime.date(2024, 6, 21), 70.0, 25.0, 2.0)
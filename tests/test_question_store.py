@@ -0,0 +1,99 @@
+import os
+import sys
+import unicodedata
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import question_store as qs
+from engine import ZODIAC, HOUSES, HOUR_LORDS
+from mars_asc_questions import mars_asc_questions
+from hourlord_asc_questions import hourlord_asc_questions
+from house_questions import saturn_house_questions, chiron_house_questions
+
+# ---------------------------
+# Compiled question bank vs the source dicts
+# ---------------------------
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("bank") / "question_bank.bin")
+    qs.build(path)
+    return qs.QuestionStore(path), path
+
+
+def test_every_text_round_trips(store):
+    store, _ = store
+    for m, mars in enumerate(ZODIAC):
+        for a, asc in enumerate(ZODIAC):
+            expected = mars_asc_questions.get(mars, {}).get(asc)
+            got = store.text(qs.MARS_ASC[0] + m * 12 + a)
+            assert got == (qs.normalize(expected) if expected is not None else None), (mars, asc)
+    for h, hl in enumerate(HOUR_LORDS):
+        for a, asc in enumerate(ZODIAC):
+            expected = hourlord_asc_questions.get(hl, {}).get(asc)
+            got = store.text(qs.HL_ASC[0] + h * 12 + a)
+            assert got == (qs.normalize(expected) if expected is not None else None), (hl, asc)
+    for i, house in enumerate(HOUSES):
+        assert store.text(qs.SATURN[0] + i) == qs.normalize(saturn_house_questions[house])
+        assert store.text(qs.CHIRON[0] + i) == qs.normalize(chiron_house_questions[house])
+
+
+def test_identical_texts_stored_once(store):
+    store, path = store
+    sources = [t for d in mars_asc_questions.values() for t in d.values()]
+    sources += [t for d in hourlord_asc_questions.values() for t in d.values()]
+    sources += list(saturn_house_questions.values()) + list(chiron_house_questions.values())
+    unique = {qs.normalize(t) for t in sources}
+    with open(path, "rb") as f:
+        _, _, count = qs._HEADER.unpack_from(f.read(qs._HEADER.size))
+    assert count == len(unique)
+    # no source indentation or trailing blanks shipped
+    assert os.path.getsize(path) < sum(len(t.encode("utf-8")) for t in sources)
+
+
+def test_normalize():
+    text = """첫 줄.
+        둘째 줄
+        셋째 줄"""
+    assert qs.normalize(text) == "첫 줄.\n둘째 줄\n셋째 줄"
+    # NFD input (decomposed Hangul) comes out composed
+    assert qs.normalize(unicodedata.normalize("NFD", "가")) == "가"
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "bank.bin"
+    path.write_bytes(b"NOPE" + bytes(64))
+    with pytest.raises(ValueError, match="Not a question store"):
+        qs.QuestionStore(str(path))
+
+
+def test_staleness(tmp_path):
+    path = str(tmp_path / "bank.bin")
+    assert qs.is_stale(path)
+    qs.build(path)
+    newest = max(os.path.getmtime(src) for src in qs.SOURCES)
+    os.utime(path, (newest + 10, newest + 10))
+    assert not qs.is_stale(path)
+    os.utime(path, (newest - 10, newest - 10))
+    assert qs.is_stale(path)
+
+
+def test_lookup_helpers():
+    leo = qs.mars_questions("Leo")
+    assert set(leo) == set(mars_asc_questions["Leo"])
+    assert leo["Leo"] == qs.normalize(mars_asc_questions["Leo"]["Leo"])
+    assert qs.mars_questions_for("Leo") is leo
+
+    both = qs.mars_questions_for("Leo", "Virgo")
+    virgo = qs.mars_questions("Virgo")
+    asc = next(a for a in leo if a in virgo)
+    assert both[asc] == f"**Mars Leo:** {leo[asc]}\n\n**Mars Virgo:** {virgo[asc]}"
+
+    assert qs.saturn_question("1") == qs.normalize(saturn_house_questions["1"])
+    assert qs.chiron_question("12") == qs.normalize(chiron_house_questions["12"])
+    hl, asc = next((hl, asc) for hl in HOUR_LORDS for asc in hourlord_asc_questions.get(hl, {}))
+    assert qs.hourlord_question(hl, asc) == qs.normalize(hourlord_asc_questions[hl][asc])
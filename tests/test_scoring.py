@@ -0,0 +1,120 @@
+import datetime
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import scoring
+from candidates import CandidateState
+from engine import SlotIndex, new_slot, add_transition
+from timeline import build_timeline, timeline_to_hour_slots
+
+# ---------------------------
+# Posterior over (slot, ASC) cells
+# ---------------------------
+
+
+def manual_candidates():
+    # 08:00 Sun Leo→Virgo (60 min), 09:00 Venus Virgo (120 min), 11:00 Mercury Virgo→Libra (180 min)
+    hour_slots = SlotIndex(datetime.time(8, 0), datetime.time(14, 0),
+                           [new_slot("Sun", datetime.time(8, 0), "Leo", "1", "2")])
+    add_transition(hour_slots, datetime.time(9, 0), "Venus", "Virgo", "12", "1")
+    add_transition(hour_slots, datetime.time(11, 0), "Mercury", "Virgo", "12", "1")
+    hour_slots[-1].asc_range.append(6)
+    return CandidateState.from_hour_slots(hour_slots)
+
+
+def timeline_candidates():
+    timeline = build_timeline(datetime.date(2001, 9, 9), 48.85, 2.35, datetime.time(5, 0), datetime.time(17, 0),
+                              None, None, 2.0)
+    return CandidateState.from_hour_slots(timeline_to_hour_slots(timeline), timeline)
+
+
+def test_prior_spreads_duration_over_signs():
+    post = scoring.posterior(manual_candidates().slots, {}, {}, {})
+    # Leo/Virgo 30 min each, Virgo 120, Virgo/Libra 90 each — out of 360
+    expected = np.zeros((3, 12))
+    expected[0, [4, 5]] = 30 / 360
+    expected[1, 5] = 120 / 360
+    expected[2, [5, 6]] = 90 / 360
+    np.testing.assert_allclose(post, expected)
+
+
+def test_answers_shift_by_their_likelihood_ratio():
+    slots = manual_candidates().slots
+    prior = scoring.posterior(slots, {}, {}, {})
+    post = scoring.posterior(slots, {4: "Yes"}, {(2, 6): "No"}, {(11, 0): "Maybe"})
+    assert post.sum() == pytest.approx(1.0)
+
+    ratio = post / np.where(prior > 0, prior, 1)
+    yes, no, maybe = (math.exp(scoring.LOG_ODDS[a]) for a in ("Yes", "No", "Maybe"))
+    # relative to Sun/Virgo (no answer touches it)
+    base = ratio[0, 5]
+    assert ratio[0, 4] / base == pytest.approx(yes)
+    assert ratio[1, 5] / base == pytest.approx(maybe)
+    assert ratio[2, 5] / base == pytest.approx(maybe)
+    assert ratio[2, 6] / base == pytest.approx(maybe * no)
+
+
+def test_unasked_pairs_count_for_nothing():
+    slots = manual_candidates().slots
+    prior = scoring.posterior(slots, {}, {}, {})
+    np.testing.assert_allclose(scoring.posterior(slots, {}, {}, {(3, 3): "Yes"}), prior)
+    assert not np.allclose(scoring.posterior(slots, {}, {}, {(11, 0): "Maybe"}), prior)
+
+
+def test_dead_slots_get_nothing():
+    slots = manual_candidates().slots
+    slots["alive"][1] = False
+    post = scoring.posterior(slots, {5: "Yes"}, {}, {})
+    assert post[1].sum() == 0
+    assert post.sum() == pytest.approx(1.0)
+
+    slots["alive"][:] = False
+    assert scoring.posterior(slots, {}, {}, {}).sum() == 0
+
+
+def test_rank():
+    post = scoring.posterior(manual_candidates().slots, {6: "Yes"}, {(1, 5): "No"}, {})
+    order, by_slot, by_asc = scoring.rank(post)
+    assert list(order) == [2, 0, 1]
+    assert by_slot[order].tolist() == sorted(by_slot, reverse=True)
+    np.testing.assert_allclose(by_asc, post.sum(axis=0))
+    assert by_slot.sum() == pytest.approx(1.0)
+
+
+# ---------------------------
+# Per-minute weights
+# ---------------------------
+@pytest.mark.parametrize("make", [manual_candidates, timeline_candidates])
+def test_minute_weights_keep_every_slots_mass(make):
+    candidates = make()
+    post = scoring.posterior(candidates.slots, {5: "Yes", 4: "No"}, {(1, 5): "Yes"}, {})
+    view = candidates.minute_view(post)
+    assert view["weight"].sum() == pytest.approx(1.0)
+    per_slot = np.bincount(view["slot"], weights=view["weight"], minlength=len(candidates))
+    np.testing.assert_allclose(per_slot, post.sum(axis=1), atol=1e-12)
+
+
+def test_minute_weights_follow_the_timeline_asc():
+    candidates = timeline_candidates()
+    post = scoring.posterior(candidates.slots, {}, {}, {})
+    view = candidates.minute_view(post)
+    cell = view["slot"] * 12 + view["asc"]
+    per_cell = np.bincount(cell, weights=view["weight"], minlength=post.size)
+    has_minutes = np.bincount(cell, minlength=post.size) > 0
+    # cells with minutes of their own get at least their own mass
+    assert np.all(per_cell[has_minutes] >= post.ravel()[has_minutes] - 1e-12)
+
+
+def test_minute_weights_skip_dead_slots():
+    candidates = manual_candidates()
+    post = scoring.posterior(candidates.slots, {}, {}, {})
+    candidates.slots["alive"][0] = False
+    view = candidates.minute_view(post)
+    assert view["weight"][view["slot"] == 0].sum() == 0
@@ -0,0 +1,246 @@
+import datetime
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine import (
+    ZODIAC, HOUSES, HOUR_LORDS,
+    SlotIndex, new_slot, add_transition, undo_transition,
+)
+from candidates import CandidateState
+
+# ---------------------------
+# SlotIndex / CandidateState vs the original list-of-dicts wizard
+# ---------------------------
+# The legacy_* helpers below are the Step 3–7 logic app.py had before the
+# interval index and the bitmask state: slots appended in time order, the
+# previous slot's ranges extended on every append, eliminations done by
+# scanning the lists. Sessions are generated the way a real timeline moves
+# (ASC forward through the zodiac, houses backward), where both forms must
+# agree.
+
+T1 = datetime.time(8, 0)
+T2 = datetime.time(14, 0)
+
+
+def t(minute):
+    minute %= 1440
+    return datetime.time(minute // 60, minute % 60)
+
+
+# ---------------------------
+# Legacy reference (lists of dicts, names)
+# ---------------------------
+def legacy_slots(start, transitions):
+    slots = [dict(start, asc_range=[start["asc"]], sat_range=[start["sat"]],
+                  chi_range=[start["chi"]], alive=True)]
+    for tr in transitions:
+        last = slots[-1]
+        last["end"] = tr["minute"]
+        for key in ("asc", "sat", "chi"):
+            if tr[key] not in last[f"{key}_range"]:
+                last[f"{key}_range"].append(tr[key])
+        slots.append(dict(tr, asc_range=[tr["asc"]], sat_range=[tr["sat"]],
+                          chi_range=[tr["chi"]], alive=True))
+    return slots
+
+
+def legacy_narrow(slots, asc_answers, pair_answers):
+    """Steps 4–7 as app.py used to run them; returns what each step showed."""
+    out = {"possible_ascs": sorted({a for s in slots if s["alive"] for a in s["asc_range"]})}
+
+    for asc, ans in asc_answers.items():
+        if ans == "No":
+            for s in slots:
+                if asc in s["asc_range"]:
+                    s["asc_range"].remove(asc)
+
+    out["hl_asc"] = [
+        (i, s["hl"], s["asc_range"][0])
+        for i, s in enumerate(slots) if s["alive"] and s["asc_range"]
+    ]
+
+    pairs = []
+    for s in slots:
+        pair = (s["sat"], s["chi"])
+        if s["alive"] and pair not in pairs:
+            pairs.append(pair)
+    out["pairs"] = pairs
+
+    for s in slots:
+        if pair_answers.get((s["sat"], s["chi"])) == "No":
+            s["alive"] = False
+    alive = [s for s in slots if s["alive"]]
+    out["alive"] = [s["minute"] for s in alive]
+    out["ascendants"] = sorted({a for s in alive for a in s["asc_range"]})
+    out["hour_lords"] = sorted({s["hl"] for s in alive})
+    out["result_pairs"] = sorted(
+        {(sat, chi) for s in alive for sat in s["sat_range"] for chi in s["chi_range"]
+         if pair_answers.get((sat, chi)) in ("Yes", "Maybe")},
+        key=lambda p: (int(p[0]), int(p[1])),
+    )
+    return out
+
+
+# ---------------------------
+# Same session through SlotIndex + CandidateState
+# ---------------------------
+def index_slots(start, transitions, order=None):
+    hour_slots = SlotIndex(T1, T2, [new_slot(start["hl"], T1, start["asc"], start["sat"], start["chi"])])
+    for tr in (transitions if order is None else [transitions[i] for i in order]):
+        add_transition(hour_slots, t(tr["minute"]), tr["hl"], tr["asc"], tr["sat"], tr["chi"])
+    return hour_slots
+
+
+def candidate_narrow(hour_slots, asc_answers, pair_answers):
+    state = CandidateState.from_hour_slots(hour_slots)
+    out = {"possible_ascs": sorted(ZODIAC[a] for a in state.possible_ascs())}
+
+    state.eliminate_ascs({ZODIAC.index(a): v for a, v in asc_answers.items()})
+    out["hl_asc"] = [(i, HOUR_LORDS[hl], ZODIAC[a]) for i, hl, a in state.hl_asc_questions()]
+    out["pairs"] = [(HOUSES[s], HOUSES[c]) for s, c in state.unique_pairs()]
+
+    codes = {(HOUSES.index(s), HOUSES.index(c)): v for (s, c), v in pair_answers.items()}
+    state.apply_pair_answers(codes)
+    result = state.summarize(codes)
+    out["alive"] = [int(s["start"]) for s in state.slots if s["alive"]]
+    out["ascendants"] = result["ascendants"]
+    out["hour_lords"] = result["hour_lords"]
+    out["result_pairs"] = result["pairs"]
+    return out
+
+
+def random_session(rng, n):
+    minutes = sorted(rng.sample(range(to_min(T1) + 1, to_min(T2) + 1), n))
+    asc, sat, chi = rng.randrange(12), rng.randrange(12), rng.randrange(12)
+    start = {"minute": to_min(T1), "hl": rng.choice(HOUR_LORDS),
+             "asc": ZODIAC[asc], "sat": HOUSES[sat], "chi": HOUSES[chi]}
+    transitions = []
+    for m in minutes:
+        # the ASC only moves forward, houses only backward
+        asc = (asc + rng.choice((0, 0, 1))) % 12
+        sat = (sat - rng.choice((0, 0, 1))) % 12
+        chi = (chi - rng.choice((0, 1))) % 12
+        transitions.append({"minute": m, "hl": rng.choice(HOUR_LORDS),
+                            "asc": ZODIAC[asc], "sat": HOUSES[sat], "chi": HOUSES[chi]})
+    return start, transitions
+
+
+def to_min(time):
+    return time.hour * 60 + time.minute
+
+
+def slot_view(slot):
+    return (slot.start, slot.end, slot.hl, bytes(slot.asc_range), bytes(slot.sat_range), bytes(slot.chi_range))
+
+
+def legacy_view(slots, end):
+    return [
+        (s["minute"], s.get("end", end), HOUR_LORDS.index(s["hl"]),
+         bytes(ZODIAC.index(a) for a in s["asc_range"]),
+         bytes(HOUSES.index(h) for h in s["sat_range"]),
+         bytes(HOUSES.index(h) for h in s["chi_range"]))
+        for s in slots
+    ]
+
+
+# ---------------------------
+# SlotIndex
+# ---------------------------
+@pytest.mark.parametrize("seed", range(20))
+def test_in_order_matches_legacy(seed):
+    rng = random.Random(seed)
+    start, transitions = random_session(rng, rng.randint(0, 12))
+    hour_slots = index_slots(start, transitions)
+    assert [slot_view(s) for s in hour_slots] == legacy_view(legacy_slots(start, transitions), to_min(T2))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_out_of_order_insertion(seed):
+    rng = random.Random(seed)
+    start, transitions = random_session(rng, rng.randint(2, 12))
+    order = list(range(len(transitions)))
+    rng.shuffle(order)
+    shuffled = index_slots(start, transitions, order)
+    assert [slot_view(s) for s in shuffled] == [slot_view(s) for s in index_slots(start, transitions)]
+    assert shuffled.starts == sorted(shuffled.starts)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_remove_relinks_neighbours(seed):
+    rng = random.Random(seed)
+    start, transitions = random_session(rng, rng.randint(1, 10))
+    hour_slots = index_slots(start, transitions)
+    drop = rng.randrange(len(transitions))
+    removed = undo_transition(hour_slots, drop + 1)
+
+    assert removed.start == transitions[drop]["minute"]
+    rest = transitions[:drop] + transitions[drop + 1:]
+    assert [slot_view(s) for s in hour_slots] == legacy_view(legacy_slots(start, rest), to_min(T2))
+
+
+def test_midnight_crossing():
+    hour_slots = SlotIndex(datetime.time(22, 0), datetime.time(2, 0),
+                           [new_slot("Sun", datetime.time(22, 0), "Leo", "1", "2")])
+    assert hour_slots.end == 26 * 60
+    add_transition(hour_slots, datetime.time(1, 0), "Venus", "Virgo", "12", "1")
+    add_transition(hour_slots, datetime.time(23, 30), "Mercury", "Leo", "1", "1")
+
+    assert [s.start for s in hour_slots] == [22 * 60, 23 * 60 + 30, 25 * 60]
+    assert [s.end for s in hour_slots] == [23 * 60 + 30, 25 * 60, 26 * 60]
+    assert [s.end_label() for s in hour_slots] == ["23:30", "01:00", "02:00"]
+    assert hour_slots.find(datetime.time(0, 15)) == 1
+    assert hour_slots.find(datetime.time(1, 59)) == 2
+    assert hour_slots.find(datetime.time(2, 1)) is None
+    assert hour_slots[1].asc_range == bytearray((ZODIAC.index("Leo"), ZODIAC.index("Virgo")))
+
+
+@pytest.mark.parametrize("when, message", [
+    (datetime.time(8, 0), "AFTER Time1"),
+    (datetime.time(14, 1), "AFTER Time1"),
+    (datetime.time(10, 0), "already a transition"),
+])
+def test_insert_rejects(when, message):
+    hour_slots = index_slots(
+        {"hl": "Sun", "asc": "Leo", "sat": "1", "chi": "2"},
+        [{"minute": 600, "hl": "Moon", "asc": "Leo", "sat": "1", "chi": "2"}],
+    )
+    with pytest.raises(ValueError, match=message):
+        add_transition(hour_slots, when, "Mars", "Virgo", "12", "1")
+
+
+def test_time1_slot_cannot_be_removed():
+    hour_slots = index_slots({"hl": "Sun", "asc": "Leo", "sat": "1", "chi": "2"}, [])
+    with pytest.raises(ValueError):
+        undo_transition(hour_slots, 0)
+
+
+# ---------------------------
+# CandidateState (Steps 4–7)
+# ---------------------------
+@pytest.mark.parametrize("seed", range(40))
+def test_candidate_state_matches_legacy(seed):
+    rng = random.Random(seed)
+    start, transitions = random_session(rng, rng.randint(0, 15))
+    # answer every question the legacy flow would have asked
+    ascs = legacy_narrow(legacy_slots(start, transitions), {}, {})["possible_ascs"]
+    asc_answers = {a: rng.choice(("Yes", "No", "Maybe")) for a in ascs}
+    pairs = legacy_narrow(legacy_slots(start, transitions), asc_answers, {})["pairs"]
+    pair_answers = {p: rng.choice(("Yes", "No", "Maybe")) for p in pairs}
+
+    expected = legacy_narrow(legacy_slots(start, transitions), asc_answers, pair_answers)
+    assert candidate_narrow(index_slots(start, transitions), asc_answers, pair_answers) == expected
+
+
+def test_all_ascs_rejected_leaves_no_hl_questions():
+    start, transitions = random_session(random.Random(1), 5)
+    hour_slots = index_slots(start, transitions)
+    state = CandidateState.from_hour_slots(hour_slots)
+    state.eliminate_ascs({a: "No" for a in state.possible_ascs()})
+    assert state.hl_asc_questions() == []
+    assert state.summarize({})["ascendants"] == []
@@ -0,0 +1,152 @@
+import datetime
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import snapshots
+from candidates import CandidateState
+from engine import SlotIndex, new_slot, add_transition
+from timeline import build_timeline, timeline_to_hour_slots, timeline_final_end
+
+# ---------------------------
+# Snapshot round trip / resume
+# ---------------------------
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots, "DB_PATH", str(tmp_path / "sessions.sqlite"))
+    monkeypatch.setattr(snapshots, "ENABLED", True)
+    snapshots.flush()
+
+
+def manual_state():
+    hour_slots = SlotIndex(datetime.time(8, 0), datetime.time(14, 0),
+                           [new_slot("Sun", datetime.time(8, 0), "Leo", "1", "2")])
+    add_transition(hour_slots, datetime.time(9, 10), "Venus", "Virgo", "12", "1")
+    add_transition(hour_slots, datetime.time(11, 45), "Mercury", "Libra", "11", "12")
+    candidates = CandidateState.from_hour_slots(hour_slots)
+    candidates.eliminate_ascs({4: "No", 5: "Yes", 6: "Maybe"})
+    return {
+        "step": 6, "mars": "Leo", "mars_alt": None,
+        "time1": datetime.time(8, 0), "time2": datetime.time(14, 0),
+        "adaptive": False, "scoring": False,
+        "hour_slots": hour_slots, "final_end": {"asc": "Libra", "sat": "11", "chi": "12"},
+        "timeline": None, "timeline_args": None, "candidates": candidates,
+        "asc_answers": {4: "No", 5: "Yes", 6: "Maybe"},
+        "hl_asc_answers": {(1, 5): "Yes", (2, 6): "No"},
+        "pair_answers": {(11, 0): "Maybe"},
+        "widget_key": "not kept",
+    }
+
+
+def timeline_state():
+    args = dict(date=datetime.date(1990, 6, 3), lat=37.57, lon=126.98,
+                time1=datetime.time(6, 0), time2=datetime.time(12, 0),
+                sat_lon=None, chi_lon=None, tz_offset=9.0, house_system="equal")
+    timeline = build_timeline(**args)
+    hour_slots = timeline_to_hour_slots(timeline)
+    candidates = CandidateState.from_hour_slots(hour_slots, timeline)
+    candidates.slots["alive"][1] = False
+    return {
+        "step": 7, "mars": "Aries", "time1": args["time1"], "time2": args["time2"],
+        "hour_slots": hour_slots, "final_end": timeline_final_end(timeline),
+        "timeline": timeline, "timeline_args": args, "candidates": candidates,
+        "asc_answers": {}, "hl_asc_answers": {}, "pair_answers": {(0, 1): "No"},
+    }
+
+
+def slot_rows(hour_slots):
+    return [(s.hl, s.start, s.end, bytes(s.asc_range), bytes(s.sat_range), bytes(s.chi_range), s.alive)
+            for s in hour_slots]
+
+
+def assert_same(restored, state):
+    for key in snapshots.STATE_KEYS:
+        if key not in state:
+            assert key not in restored
+        elif key == "hour_slots":
+            assert slot_rows(restored[key]) == slot_rows(state[key])
+            assert (restored[key].start, restored[key].end) == (state[key].start, state[key].end)
+        elif key == "candidates":
+            np.testing.assert_array_equal(restored[key].slots, state[key].slots)
+        else:
+            assert restored[key] == state[key], key
+
+
+@pytest.mark.parametrize("make", [manual_state, timeline_state])
+def test_round_trip(make):
+    state = make()
+    restored = snapshots.loads(snapshots.dumps(state))
+    assert_same(restored, state)
+    assert "widget_key" not in restored
+
+
+def test_timeline_rebuilt_not_stored():
+    state = timeline_state()
+    blob = snapshots.dumps(state)
+    assert len(blob) < 8000
+    restored = snapshots.loads(blob)
+    for key in ("minute", "asc", "hl", "sat", "chi"):
+        np.testing.assert_array_equal(restored["timeline"][key], state["timeline"][key])
+    # the candidate state sees the rebuilt per-minute ASC again
+    view = restored["candidates"].minute_view()
+    np.testing.assert_array_equal(view["asc"], state["candidates"].minute_view()["asc"])
+
+
+def test_unreadable_blob_starts_fresh():
+    assert snapshots.loads(b"not a snapshot") is None
+    assert snapshots.loads(b'{"hour_slots": {"start": 0}}') is None
+
+
+class Boom:
+    def __reduce__(self):
+        return (pytest.fail, ("pickle payload was executed",))
+
+
+def test_pickle_blob_is_never_unpickled():
+    import pickle
+    assert snapshots.loads(pickle.dumps({"step": Boom()})) is None
+
+
+def test_adaptive_state_round_trip():
+    state = manual_state()
+    state.update(
+        adaptive=True, adaptive_node=17,
+        adaptive_asked=[(("asc", "Leo"), "No"), (("hl_asc", "Venus", "Virgo"), "Yes"), (("pair", "12", "1"), "Maybe")],
+    )
+    blob = snapshots.dumps(state)
+    assert blob.startswith(b"{")
+    assert_same(snapshots.loads(blob), state)
+
+
+def test_resume_after_restart(db):
+    state = manual_state()
+    token = snapshots.new_token()
+    snapshots.save(token, state)
+    # parked, not yet written: still readable from memory
+    assert snapshots.load(token)["step"] == 6
+    snapshots.flush()
+
+    snapshots._pending.clear()
+    snapshots._last.clear()
+    assert_same(snapshots.load(token), state)
+    assert snapshots.load(snapshots.new_token()) is None
+    assert [t for t, _ in snapshots.iter_snapshots()] == [token]
+
+
+def test_unchanged_state_is_not_queued(db):
+    state = manual_state()
+    token = snapshots.new_token()
+    snapshots.save(token, state)
+    snapshots.flush()
+    snapshots.save(token, state)
+    assert token not in snapshots._pending
+    state["step"] = 7
+    snapshots.save(token, state)
+    assert token in snapshots._pending
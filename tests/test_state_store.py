@@ -0,0 +1,169 @@
+import datetime
+import os
+import pickle
+import sqlite3
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import state_store
+from state_store import StateStore, MemoryBackend, SQLiteBackend, VERSION_KEY
+
+# ---------------------------
+# Two workers sharing one backend
+# ---------------------------
+
+TOKEN = "tok-1"
+
+
+class Counting:
+    """Backend proxy counting the calls that move blobs."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.errors = backend.errors
+        self.gets = 0
+
+    def version(self, token):
+        return self.backend.version(token)
+
+    def get(self, token):
+        self.gets += 1
+        return self.backend.get(token)
+
+    def put(self, token, version, blob):
+        return self.backend.put(token, version, blob)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def workers(request, tmp_path):
+    if request.param == "memory":
+        shared = MemoryBackend()
+        backends = [shared, shared]
+    else:
+        # separate connections to one file, as two processes would have
+        path = str(tmp_path / "state.sqlite")
+        backends = [SQLiteBackend(path), SQLiteBackend(path)]
+    return [StateStore(Counting(b)) for b in backends]
+
+
+def wizard_state(step, mars="Leo"):
+    return {"step": step, "mars": mars, "time1": datetime.time(8, 0), "time2": datetime.time(14, 0),
+            "timeline": None}
+
+
+def test_handoff(workers):
+    a, b = workers
+    state_a = wizard_state(3)
+    a.save(TOKEN, state_a)
+    assert state_a[VERSION_KEY] == 1
+
+    state_b = {}
+    assert b.sync(TOKEN, state_b)
+    assert state_b == state_a
+    # nothing newer: only the version is probed
+    assert not b.sync(TOKEN, state_b)
+    assert b.backend.gets == 1
+
+
+def test_version_race_converges_to_the_winner(workers):
+    a, b = workers
+    state_a = wizard_state(3)
+    a.save(TOKEN, state_a)
+    state_b = {}
+    b.sync(TOKEN, state_b)
+
+    # both workers move on from version 1; A writes version 2 first
+    state_a["step"] = 5
+    state_b.update(step=4, mars="Virgo")
+    a.save(TOKEN, state_a)
+    b.save(TOKEN, state_b)
+    assert state_b == state_a and state_b[VERSION_KEY] == 2
+    assert b.backend.backend.get(TOKEN)[0] == 2
+
+    # the loser carries on from the winner's state
+    state_b["step"] = 6
+    b.save(TOKEN, state_b)
+    assert a.sync(TOKEN, state_a)
+    assert state_a["step"] == 6 and state_a[VERSION_KEY] == 3
+
+
+def test_sync_reads_only_on_a_version_change(workers):
+    a, b = workers
+    state = wizard_state(2)
+    a.save(TOKEN, state)
+    for _ in range(3):
+        assert not a.sync(TOKEN, state)
+    # unchanged state is not written again
+    a.save(TOKEN, state)
+    assert state[VERSION_KEY] == 1 and a.backend.gets == 0
+
+    # a new session dict on the writing worker is served from its cache
+    fresh = {}
+    assert a.sync(TOKEN, fresh) and fresh["step"] == 2
+    assert a.backend.gets == 0
+
+
+def test_cache_is_lru():
+    store = StateStore(Counting(MemoryBackend()), cache_size=2)
+    for token in ("t1", "t2", "t3"):
+        store.save(token, wizard_state(1))
+    assert list(store._cache) == ["t2", "t3"]
+    store.sync("t2", {})
+    store.save("t4", wizard_state(1))
+    assert list(store._cache) == ["t2", "t4"]
+    assert store.backend.gets == 0
+    store.sync("t1", {})
+    assert store.backend.gets == 1
+
+
+# ---------------------------
+# Blobs and failures
+# ---------------------------
+class Boom:
+    def __reduce__(self):
+        return (pytest.fail, ("pickle payload was executed",))
+
+
+def test_blobs_are_json(workers):
+    a, _ = workers
+    a.save(TOKEN, wizard_state(3))
+    assert a.backend.backend.get(TOKEN)[1].startswith(b"{")
+
+    a.backend.backend.put("evil", 7, pickle.dumps({"step": Boom()}))
+    state = wizard_state(1)
+    assert not a.sync("evil", state)
+    assert state == wizard_state(1)
+
+
+class Down:
+    errors = (sqlite3.Error,)
+
+    def version(self, token):
+        raise sqlite3.OperationalError("database is locked")
+
+    def get(self, token):
+        raise sqlite3.OperationalError("database is locked")
+
+    def put(self, token, version, blob):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_unreachable_store_keeps_local_state():
+    store = StateStore(Down())
+    state = wizard_state(4)
+    assert not store.sync(TOKEN, state)
+    store.save(TOKEN, state)
+    assert state == wizard_state(4)
+
+
+def test_from_url(tmp_path):
+    assert isinstance(state_store.from_url("memory://"), MemoryBackend)
+    backend = state_store.from_url(f"sqlite://{tmp_path}/a%20b/state.sqlite")
+    assert isinstance(backend, SQLiteBackend) and backend.path == f"{tmp_path}/a b/state.sqlite"
+    assert state_store.from_url("sqlite://").path == state_store.DEFAULT_SQLITE
+    with pytest.raises(ValueError, match="Unknown state backend"):
+        state_store.from_url("mongodb://localhost")
@@ -0,0 +1,94 @@
+import datetime
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine import HOUR_LORDS, ZODIAC
+from timeline import build_timeline, timeline_to_hour_slots, timeline_final_end, build_hour_slots
+
+# ---------------------------
+# Computed timeline vs known dates
+# ---------------------------
+# Published sunrise / sunset: Greenwich 2024-06-21 (a Friday) 03:43 / 20:21
+# UTC; Seoul 2024-01-01 (a Monday) 07:47 / 17:24 KST. The first planetary
+# hour after sunrise belongs to the day's ruler, the rest follow in Chaldean
+# order, and day hours are a twelfth of sunrise–sunset.
+
+CHALDEAN = ["Saturn", "Jupiter", "Mars", "Sun", "Venus", "Mercury", "Moon"]
+
+
+def whole_day(date, lat, lon, tz):
+    timeline = build_timeline(date, lat, lon, datetime.time(0, 0), datetime.time(23, 59), 0.0, 0.0, tz)
+    return timeline, timeline_to_hour_slots(timeline)
+
+
+def near(minute, hhmm, tolerance=2):
+    h, m = map(int, hhmm.split(":"))
+    return abs(minute - (h * 60 + m)) <= tolerance
+
+
+def day_hours(hour_slots, sunrise):
+    i = next(i for i, s in enumerate(hour_slots) if near(s.start, sunrise))
+    return hour_slots[i:i + 13]
+
+
+@pytest.mark.parametrize("date, lat, lon, tz, sunrise, sunset, ruler", [
+    (datetime.date(2024, 6, 21), 51.48, 0.0, 0.0, "03:43", "20:21", "Venus"),
+    (datetime.date(2024, 1, 1), 37.57, 126.98, 9.0, "07:47", "17:24", "Moon"),
+])
+def test_hour_lords(date, lat, lon, tz, sunrise, sunset, ruler):
+    timeline, hour_slots = whole_day(date, lat, lon, tz)
+    hours = day_hours(hour_slots, sunrise)
+    assert near(hours[12].start, sunset)
+
+    first = CHALDEAN.index(ruler)
+    assert [HOUR_LORDS[s.hl] for s in hours] == [CHALDEAN[(first + k) % 7] for k in range(13)]
+    # twelve equal day hours
+    lengths = np.diff([s.start for s in hours])
+    assert lengths.max() - lengths.min() <= 1
+
+    # every minute of a slot has the slot's hour lord
+    for s in hour_slots:
+        assert np.all(timeline["hl"][s.start:s.end] == s.hl)
+
+
+def test_ascendant_at_sunrise_and_sunset():
+    # the Sun (~10° Capricorn) rises with Capricorn and sets as Cancer rises
+    timeline, hour_slots = whole_day(datetime.date(2024, 1, 1), 37.57, 126.98, 9.0)
+    assert ZODIAC[timeline["asc"][7 * 60 + 50]] == "Capricorn"
+    assert ZODIAC[timeline["asc"][17 * 60 + 20]] == "Cancer"
+    # each sign rises once a day, in zodiac order
+    changes = timeline["asc"][np.nonzero(np.diff(timeline["asc"]))[0] + 1]
+    assert len(changes) in (11, 12)
+    assert np.all(np.diff(changes) % 12 == 1)
+
+
+def test_window_crossing_midnight():
+    date = datetime.date(2024, 1, 1)
+    timeline = build_timeline(date, 37.57, 126.98, datetime.time(22, 0), datetime.time(2, 0), 0.0, 0.0, 9.0)
+    assert timeline["minute"][0] == 22 * 60 and timeline["minute"][-1] == 26 * 60
+    # after midnight the hour lords are the next day's table
+    next_day = build_timeline(date + datetime.timedelta(days=1), 37.57, 126.98,
+                              datetime.time(0, 0), datetime.time(2, 0), 0.0, 0.0, 9.0)
+    np.testing.assert_array_equal(timeline["hl"][120:], next_day["hl"])
+    np.testing.assert_array_equal(timeline["asc"][120:], next_day["asc"])
+
+    hour_slots = timeline_to_hour_slots(timeline)
+    assert hour_slots.start == 22 * 60 and hour_slots.end == 26 * 60
+    assert hour_slots[-1].end_label() == "02:00"
+
+
+def test_build_hour_slots_final_end():
+    hour_slots, final_end = build_hour_slots(datetime.date(2024, 1, 1), 37.57, 126.98,
+                                             datetime.time(8, 0), datetime.time(9, 0), 15.0, 100.0, 9.0)
+    # Capricorn rises until ~09:20, then Aquarius
+    assert final_end["asc"] in ("Capricorn", "Aquarius")
+    assert ZODIAC[hour_slots[-1].asc_range[-1]] == final_end["asc"]
+    assert [HOUR_LORDS[s.hl] for s in hour_slots] == ["Moon", "Saturn"]
+    assert timeline_final_end(build_timeline(datetime.date(2024, 1, 1), 37.57, 126.98, datetime.time(8, 0),
+                                             datetime.time(9, 0), 15.0, 100.0, 9.0)) == final_end
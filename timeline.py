@@ -0,0 +1,110 @@
+import datetime
+
+import numpy as np
+
+from astro import ascendant, midheaven, local_minutes_to_jd, time_to_minute
+from asc_grid import window_boundaries, expand, fill_asc_ranges
+from houses import house_codes
+from engine import ZODIAC, HOUSES, Slot, SlotIndex
+from planetary_hours import planetary_hours, hour_lord_codes
+
+# ---------------------------
+# Minute-resolution ASC + hour-lord timeline
+# ---------------------------
+# One NumPy batch per birth window replaces the Step 2/3 manual entry:
+# every minute gets its Ascendant sign, planetary hour lord and the
+# houses of Saturn/Chiron, and slots are cut at hour-lord changes.
+
+# ---------------------------
+# Timeline
+# ---------------------------
+def build_timeline(date, lat, lon, time1, time2, sat_lon, chi_lon, tz_offset=0.0, house_system="whole"):
+    """Per-minute arrays for the birth window ``time1``–``time2`` (inclusive).
+
+    A ``time2`` earlier than ``time1`` means the window crosses midnight;
+    minutes then run past 1440. ``sat_lon`` / ``chi_lon`` are the ecliptic
+    longitudes (deg) of Saturn and Chiron — scalars for the date, one
+    value per minute, or ``None`` to take them from the bundled ephemeris
+    for every minute. Houses are 0-based (0 = house 1) in ``house_system``
+    (see ``engine.HOUSE_SYSTEMS``). ``asc_changes`` holds the ASC as
+    ``asc_grid.window_boundaries`` returns it.
+    """
+    m1 = time_to_minute(time1)
+    m2 = time_to_minute(time2)
+    if m2 < m1:
+        m2 += 1440
+
+    minutes = np.arange(m1, m2 + 1, dtype=np.int32)
+    jd = local_minutes_to_jd(date, minutes, tz_offset)
+
+    # ASC from the precomputed ingress grid: only its ~12 changes a day are
+    # located, the per-minute array is a repeat of the signs between them
+    asc_changes = window_boundaries(date, lat, lon, m1, m2, tz_offset)
+    asc = expand(*asc_changes, m1, m2)
+    # each calendar day uses its own planetary-hour table
+    hl = np.empty(len(minutes), dtype=np.int8)
+    day = minutes // 1440
+    for d in np.unique(day):
+        sel = day == d
+        table = planetary_hours(date + datetime.timedelta(days=int(d)), lat, lon, tz_offset)
+        hl[sel] = hour_lord_codes(table, minutes[sel] - 1440 * d)
+
+    if sat_lon is None or chi_lon is None:
+        from ephemeris import longitude
+        sat_lon = longitude("Saturn", jd) if sat_lon is None else sat_lon
+        chi_lon = longitude("Chiron", jd) if chi_lon is None else chi_lon
+
+    angles = {"asc_sign": asc}
+    if house_system != "whole":
+        # quadrant / equal systems need the ASC degree (and MC), not just its sign
+        angles.update(asc_lon=ascendant(jd, lat, lon), mc_lon=midheaven(jd, lon))
+    sat = house_codes(sat_lon, house_system, **angles)
+    chi = house_codes(chi_lon, house_system, **angles)
+
+    return {"minute": minutes, "asc": asc, "hl": hl, "sat": sat, "chi": chi, "asc_changes": asc_changes}
+
+
+def _sequence(codes):
+    # ordered, consecutive-deduped sequence of codes
+    keep = np.ones(len(codes), dtype=bool)
+    keep[1:] = codes[1:] != codes[:-1]
+    return bytearray(codes[keep].astype(np.uint8))
+
+
+def timeline_to_hour_slots(timeline):
+    """Slots cut at hour-lord changes, as a ``SlotIndex`` over the window."""
+    minutes = timeline["minute"]
+    hl = timeline["hl"]
+
+    starts = np.concatenate([[0], np.nonzero(hl[1:] != hl[:-1])[0] + 1])
+    ends = np.append(starts[1:], len(minutes) - 1)
+
+    hour_slots = []
+    for s, e in zip(starts, ends):
+        seg = slice(s, e + 1)
+        slot = Slot(
+            int(hl[s]), int(minutes[s]),
+            int(timeline["asc"][s]), int(timeline["sat"][s]), int(timeline["chi"][s]),
+            end=int(minutes[e]),
+        )
+        # ✅ range covers everything up to (and including) the next transition
+        slot.sat_range = _sequence(timeline["sat"][seg])
+        slot.chi_range = _sequence(timeline["chi"][seg])
+        hour_slots.append(slot)
+    hour_slots = SlotIndex(int(minutes[0]), int(minutes[-1]), hour_slots)
+    # ASC ranges straight from the change list, not from the minute array
+    return fill_asc_ranges(hour_slots, *timeline["asc_changes"])
+
+
+def timeline_final_end(timeline):
+    return {
+        "asc": ZODIAC[timeline["asc"][-1]],
+        "sat": HOUSES[timeline["sat"][-1]],
+        "chi": HOUSES[timeline["chi"][-1]],
+    }
+
+
+def build_hour_slots(date, lat, lon, time1, time2, sat_lon, chi_lon, tz_offset=0.0, house_system="whole"):
+    """``hour_slots`` (same structure as the Step 3 entries) plus ``final_end``."""
+    timeline = build_timeline(date, lat, lon, time1, time2, sat_lon, chi_lon, tz_offset, house_system)
+    return timeline_to_hour_slots(timeline), timeline_final_end(timeline)